@@ -0,0 +1,50 @@
+"""
+Password security checker as a library
+
+    from backend import PasswordChecker
+    PasswordChecker().check_strength('Tr0ub4dor&3')
+
+Modules stay flat (they import each other by plain name, so this directory
+goes on sys.path) and the names below are imported on first access: using
+PasswordChecker never loads the HTTP client, breach index or web framework
+"""
+import importlib
+import os
+import sys
+
+_here = os.path.dirname(os.path.abspath(__file__))
+if _here not in sys.path:
+    sys.path.append(_here)
+
+# Public name -> module defining it
+_EXPORTS = {
+    'PasswordChecker': 'password_checker',
+    'IncrementalAnalyzer': 'password_checker',
+    'PasswordPolicy': 'policy',
+    'PolicyRegistry': 'policy',
+    'PolicyError': 'policy',
+    'GuessEstimator': 'guess_estimator',
+    'WordlistIndex': 'wordlist_index',
+    'BreachChecker': 'breach_checker',
+    'AsyncBreachClient': 'async_breach_client',
+    'LocalBreachIndex': 'breach_index',
+    'BreachFilter': 'breach_filter',
+    'HashAudit': 'hash_audit',
+    'PasswordAnalyzer': 'password_analyzer',
+    'PasswordGenerator': 'password_generator'
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,23 +1,129 @@
-from flask import Flask, request, jsonify, send_from_directory
+import json
+import time
+from flask import Flask, Response, g, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
+from flask_sock import Sock
+from simple_websocket import ConnectionClosed
 from pathlib import Path
-from password_checker import PasswordChecker
-from breach_checker import BreachChecker
-from password_generator import PasswordGenerator
+from config import (
+    LazyInstance, build_admission_controller, build_breach_checker, build_password_analyzer,
+    build_password_checker, build_password_generator, build_profiler, build_static_assets,
+    register_cache_metrics
+)
+from compression import COMPRESSIBLE_TYPES, compress_body
+from metrics import CONTENT_TYPE, HTTP_REQUEST_SECONDS, REGISTRY
+from rate_limit import LIMITED_PREFIX, REJECTION_MESSAGE, UPSTREAM_ROUTES, retry_after_header
 
 # Serve frontend `index.html` (project layout: backend/ and frontend/ at repo root)
 # static_folder set to ../frontend so Flask can serve files from the frontend folder
 app = Flask(__name__, static_folder=str(Path(__file__).resolve().parents[1] / 'frontend'), static_url_path='')
 CORS(app)  # Enable CORS for frontend requests
+sock = Sock(app)  # WebSocket routes
 
-# Initialize modules
-password_checker = PasswordChecker()
-breach_checker = BreachChecker()
-password_generator = PasswordGenerator()
+# Initialize modules (configured from environment variables, see config.py).
+# Each is built by the first request that uses it, so cold starts only pay
+# for what they serve
+password_checker = LazyInstance(build_password_checker)
+breach_checker = LazyInstance(build_breach_checker)
+password_generator = LazyInstance(build_password_generator)
+password_analyzer = LazyInstance(lambda: build_password_analyzer(password_checker.get(), breach_checker.get()))
+profiler = build_profiler()
+static_assets = build_static_assets()
+admission = build_admission_controller()
+register_cache_metrics(password_checker, breach_checker)
+
+# Upper bound on passwords accepted in a single JSON batch request
+MAX_BATCH_SIZE = 100_000
+
+# Lines of an NDJSON batch body scored together (repeats share a result within one)
+NDJSON_CHUNK_LINES = 1000
+
+@app.before_request
+def start_timer():
+    g.request_started = time.perf_counter()
+
+@app.before_request
+def admit_request():
+    """Rate limits and load shedding for API routes (None when not configured)"""
+    if admission is None or not request.path.startswith(LIMITED_PREFIX):
+        return None
+    client = admission.client_address(request.remote_addr, request.headers.get('X-Forwarded-For'))
+    # A WebSocket stays open for the whole session: only its upgrade is rate limited
+    websocket = request.headers.get('Upgrade', '').lower() == 'websocket'
+    rejection = admission.admit(client, upstream=request.path in UPSTREAM_ROUTES, count_in_flight=not websocket)
+    if rejection is not None:
+        return jsonify({
+            'success': False,
+            'error': REJECTION_MESSAGE
+        }), 429, {'Retry-After': retry_after_header(rejection.retry_after)}
+    g.admitted = not websocket
+    return None
+
+@app.teardown_request
+def release_request(exception):
+    if g.pop('admitted', False):
+        admission.release()
+
+@app.after_request
+def compress_response(response):
+    """Compress JSON and text bodies above MIN_COMPRESS_SIZE for clients that accept it"""
+    if (response.mimetype not in COMPRESSIBLE_TYPES or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers or response.status_code in (204, 304)):
+        return response
+    response.vary.add('Accept-Encoding')
+    body, coding = compress_body(response.get_data(), request.headers.get('Accept-Encoding', ''))
+    if coding is not None:
+        response.set_data(body)
+        response.headers['Content-Encoding'] = coding
+    return response
+
+@app.after_request
+def record_request(response):
+    """Latency histogram per route template and status"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, route, request.method, str(response.status_code))
+    return response
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+@app.route('/debug/profile')
+def debug_profile():
+    """
+    Sample every thread for ?seconds=N (default 5) and return collapsed stacks
+    Only available when PROFILER_ENABLED is set
+    """
+    if profiler is None:
+        return jsonify({'success': False, 'error': 'Profiler is disabled'}), 404
+    try:
+        return Response(profiler.collapsed(float(request.args.get('seconds', 5))), content_type='text/plain')
+    except RuntimeError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+def serve_static(filename):
+    """Static files from the fingerprinted, precompressed build when there is one"""
+    if static_assets is not None:
+        asset = static_assets.respond(filename, request.headers.get('Accept-Encoding', ''),
+                                      request.headers.get('If-None-Match'))
+        if asset is not None:
+            return Response(asset.body, status=asset.status, headers=asset.headers)
+    return app.send_static_file(filename)
+
+# Replace Flask's own static view (same /<path:filename> route)
+app.view_functions['static'] = serve_static
 
 @app.route('/')
 def home():
     """Serve the frontend index.html if present, otherwise return the API home JSON."""
+    if static_assets is not None:
+        return serve_static('index.html')
+    
     # frontend index location (project root/frontend/index.html)
     index_path = Path(app.static_folder) / 'index.html'
     if index_path.exists():
@@ -30,7 +136,10 @@ def home():
         'version': '1.0.0',
         'endpoints': {
             'check_strength': '/api/check-strength',
+            'check_strength_batch': '/api/check-strength/batch',
+            'check_strength_stream': '/api/check-strength/stream (WebSocket)',
             'check_breach': '/api/check-breach',
+            'analyze': '/api/analyze',
             'generate_password': '/api/generate-password',
             'generate_passphrase': '/api/generate-passphrase'
         }
@@ -42,8 +151,10 @@ def check_strength():
     try:
         data = request.get_json()
         password = data.get('password', '')
+        estimator = data.get('estimator')
+        policy = data.get('policy')
         
-        result = password_checker.check_strength(password)
+        result = password_checker.check_strength(password, estimator=estimator, policy=policy)
         
         return jsonify({
             'success': True,
@@ -56,6 +167,128 @@ def check_strength():
             'error': str(e)
         }), 400
 
+@app.route('/api/check-strength/batch', methods=['POST'])
+def check_strength_batch():
+    """
+    Check the strength of many passwords in one request
+    Accepts a JSON array (or {"passwords": [...]}) and returns a JSON list,
+    or a newline-delimited body and streams back one JSON result per line
+    """
+    try:
+        if not request.is_json:
+            body = _ndjson_rows(request.stream)
+            return Response(stream_with_context(body), mimetype='application/x-ndjson')
+        
+        data = request.get_json()
+        passwords = data.get('passwords', []) if isinstance(data, dict) else data
+        
+        if not isinstance(passwords, list):
+            raise ValueError('Expected a JSON array of passwords')
+        if len(passwords) > MAX_BATCH_SIZE:
+            raise ValueError(f'Batch too large (maximum {MAX_BATCH_SIZE:,} passwords)')
+        
+        results = password_checker.check_strength_batch(passwords)
+        
+        return jsonify({
+            'success': True,
+            'count': len(results),
+            'data': results
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+def _ndjson_rows(stream):
+    """
+    Yield one JSON line per non-empty line of a newline-delimited body
+    The response streams after this view has returned, so errors are
+    caught here: a line that can't be decoded or scored gets a
+    {"success": false, "error": ...} row in its place, and a body that
+    fails to read ends the response with one
+    """
+    chunk = []
+    try:
+        for raw_line in stream:
+            chunk.append(raw_line)
+            if len(chunk) >= NDJSON_CHUNK_LINES:
+                yield from _score_lines(chunk)
+                chunk = []
+    except Exception as e:
+        yield from _score_lines(chunk)
+        yield json.dumps({'success': False, 'error': str(e)}) + '\n'
+        return
+    yield from _score_lines(chunk)
+
+def _score_lines(raw_lines):
+    """JSON result lines for a chunk of raw body lines, in order"""
+    rows = []
+    passwords = []
+    for raw_line in raw_lines:
+        try:
+            line = raw_line.decode('utf-8').rstrip('\r\n')
+        except UnicodeDecodeError as e:
+            rows.append({'success': False, 'error': str(e)})
+            continue
+        if line:
+            rows.append(len(passwords))
+            passwords.append(line)
+    
+    try:
+        results = password_checker.check_strength_batch(passwords)
+    except Exception:
+        # Score one at a time so only the failing lines become errors
+        results = []
+        for password in passwords:
+            try:
+                results.append(password_checker.check_strength(password))
+            except Exception as e:
+                results.append({'success': False, 'error': str(e)})
+    
+    for row in rows:
+        yield json.dumps(results[row] if isinstance(row, int) else row) + '\n'
+
+@sock.route('/api/check-strength/stream')
+def check_strength_stream(ws):
+    """
+    As-you-type strength checking over one WebSocket per input field
+    Each message is {"password": "..."} (the full current text) or
+    {"append": "..."} / {"delete": n}; each reply matches /api/check-strength.
+    The connection keeps scan state, so a keystroke only scans what changed
+    """
+    try:
+        analyzer = password_checker.analyzer(request.args.get('estimator'))
+    except ValueError as e:
+        ws.send(json.dumps({'success': False, 'error': str(e)}))
+        return
+    
+    while True:
+        try:
+            message = ws.receive()
+        except ConnectionClosed:
+            return
+        
+        try:
+            data = json.loads(message)
+            if 'password' in data:
+                result = analyzer.update(data['password'])
+            elif 'append' in data:
+                result = analyzer.append(data['append'])
+            elif 'delete' in data:
+                result = analyzer.delete(int(data['delete']))
+            else:
+                raise ValueError('Expected "password", "append" or "delete"')
+            reply = {'success': True, 'data': result}
+        except Exception as e:
+            reply = {'success': False, 'error': str(e)}
+        
+        try:
+            ws.send(json.dumps(reply))
+        except ConnectionClosed:
+            return
+
 @app.route('/api/check-breach', methods=['POST'])
 def check_breach():
     """Check if password has been breached"""
@@ -76,6 +309,35 @@ def check_breach():
             'error': str(e)
         }), 400
 
+@app.route('/api/analyze', methods=['POST'])
+def analyze():
+    """
+    Check strength and breaches in one request
+    Optional 'breach_budget_ms' caps how long to wait for the breach lookup
+    """
+    try:
+        data = request.get_json()
+        password = data.get('password', '')
+        estimator = data.get('estimator')
+        budget_ms = data.get('breach_budget_ms')
+        
+        result = password_analyzer.analyze(
+            password,
+            estimator=estimator,
+            breach_budget=float(budget_ms) / 1000 if budget_ms is not None else None
+        )
+        
+        return jsonify({
+            'success': True,
+            'data': result
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
 @app.route('/api/generate-password', methods=['POST'])
 def generate_password():
     """Generate a random password"""
@@ -88,6 +350,7 @@ def generate_password():
         use_digits = data.get('digits', True)
         use_special = data.get('special', True)
         exclude_ambiguous = data.get('exclude_ambiguous', False)
+        count = data.get('count')
         
         result = password_generator.generate(
             length=length,
@@ -95,7 +358,8 @@ def generate_password():
             use_uppercase=use_uppercase,
             use_digits=use_digits,
             use_special=use_special,
-            exclude_ambiguous=exclude_ambiguous
+            exclude_ambiguous=exclude_ambiguous,
+            count=count
         )
         
         return jsonify(result)
@@ -116,12 +380,16 @@ def generate_passphrase():
         separator = data.get('separator', '-')
         capitalize = data.get('capitalize', True)
         add_number = data.get('add_number', True)
+        count = data.get('count')
+        wordlist = data.get('wordlist', 'default')
         
         result = password_generator.generate_passphrase(
             word_count=word_count,
             separator=separator,
             capitalize=capitalize,
-            add_number=add_number
+            add_number=add_number,
+            count=count,
+            wordlist=wordlist
         )
         
         return jsonify(result)
@@ -0,0 +1,508 @@
+"""
+ASGI variant of app.py serving the same JSON API without blocking
+
+    uvicorn asgi:app            (or: python serve.py --workers 4)
+
+Strength checks and password generation run on an executor so they never
+stall the event loop; breach lookups are awaited on a pooled aiohttp
+client, so one worker can hold thousands of checks in flight. The routes
+match app.py, including /api/check-strength/batch (JSON or streamed
+NDJSON) and the /api/check-strength/stream WebSocket; a WebSocket to any
+other path is closed before it is accepted (a 403 to the client)
+"""
+import asyncio
+import json
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from urllib.parse import parse_qsl
+
+from async_breach_client import AsyncBreachClient
+from compression import compress_body
+from config import (
+    build_admission_controller, build_breach_checker, build_password_analyzer, build_password_checker,
+    build_password_generator, build_profiler, register_cache_metrics
+)
+from metrics import CONTENT_TYPE, HTTP_REQUEST_SECONDS, REGISTRY
+from rate_limit import LIMITED_PREFIX, REJECTION_MESSAGE, UPSTREAM_ROUTES, retry_after_header
+
+# Largest request body accepted (the API only takes small JSON objects)
+MAX_BODY_SIZE = 1024 * 1024
+
+# Largest JSON body for /api/check-strength/batch, and largest number of
+# passwords in it (as app.py); NDJSON bodies are streamed, so only a single
+# line is bounded, by MAX_BODY_SIZE
+MAX_BATCH_BODY_SIZE = 64 * 1024 * 1024
+MAX_BATCH_SIZE = 100_000
+
+STREAM_PATH = '/api/check-strength/stream'
+
+CORS_HEADERS = [
+    (b'access-control-allow-origin', b'*'),
+    (b'access-control-allow-methods', b'GET, POST, OPTIONS'),
+    (b'access-control-allow-headers', b'Content-Type')
+]
+
+# Non-JSON response body returned by a route handler
+TextResponse = namedtuple('TextResponse', ['text', 'content_type'])
+
+# Per-process checker for the process-pool executor, set up by _init_worker
+_worker = {}
+
+
+def _header(scope, name):
+    """A request header's value (name in lower case), or ''"""
+    for key, value in scope.get('headers', ()):
+        if key == name:
+            return value.decode('latin-1')
+    return ''
+
+
+def _is_json(scope):
+    """Whether the request body is declared as JSON (as Flask's request.is_json)"""
+    mimetype = _header(scope, b'content-type').split(';')[0].strip().lower()
+    return mimetype == 'application/json' or (mimetype.startswith('application/') and mimetype.endswith('+json'))
+
+
+def _score_batch(checker, passwords):
+    """Strength results in input order; a password that fails gets an error row"""
+    try:
+        return checker.check_strength_batch(passwords)
+    except Exception:
+        rows = []
+        for password in passwords:
+            try:
+                rows.append(checker.check_strength(password))
+            except Exception as e:
+                rows.append({'success': False, 'error': str(e)})
+        return rows
+
+
+def _init_worker():
+    _worker['checker'] = build_password_checker()
+
+
+def _check_strength_in_worker(password, estimator, policy=None):
+    return _worker['checker'].check_strength(password, estimator=estimator, policy=policy)
+
+
+def _score_batch_in_worker(passwords):
+    return _score_batch(_worker['checker'], passwords)
+
+
+class RequestError(Exception):
+    """Client error answered with {'success': False, 'error': ...}"""
+
+    def __init__(self, message, status=400, headers=()):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers
+
+
+class PasswordAPI:
+    """
+    ASGI application for the password API
+    executor='process' runs strength checks on a process pool (parallel
+    across cores); the default thread pool only keeps the loop responsive.
+    admission (an AdmissionController) defaults to the environment's limits
+    """
+
+    def __init__(self, password_checker=None, breach_client=None, password_generator=None,
+                 executor='thread', workers=None, admission=None):
+        self.password_checker = password_checker or build_password_checker()
+        self.breach_client = breach_client or build_breach_checker(
+            AsyncBreachClient,
+            max_concurrency=int(os.environ.get('BREACH_MAX_CONCURRENCY') or 64),
+            pool_size=int(os.environ.get('BREACH_POOL_SIZE') or 100)
+        )
+        self.password_generator = password_generator or build_password_generator()
+        self.password_analyzer = build_password_analyzer(self.password_checker, self.breach_client)
+        self.profiler = build_profiler()
+        self.admission = admission if admission is not None else build_admission_controller()
+        register_cache_metrics(self.password_checker, self.breach_client)
+
+        if executor == 'process':
+            self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+            self._check_strength = _check_strength_in_worker
+            self._score_batch = _score_batch_in_worker
+        elif executor == 'thread':
+            self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='strength')
+            self._check_strength = self._check_strength_local
+            self._score_batch = partial(_score_batch, self.password_checker)
+        else:
+            raise ValueError(f'Unknown executor: {executor}')
+
+        self.routes = {
+            ('GET', '/'): self.home,
+            ('GET', '/metrics'): self.metrics,
+            ('GET', '/debug/profile'): self.debug_profile,
+            ('POST', '/api/check-strength'): self.check_strength,
+            ('POST', '/api/check-strength/batch'): self.check_strength_batch,
+            ('POST', '/api/check-breach'): self.check_breach,
+            ('POST', '/api/analyze'): self.analyze,
+            ('POST', '/api/generate-password'): self.generate_password,
+            ('POST', '/api/generate-passphrase'): self.generate_passphrase
+        }
+        # Routes whose handler reads a non-JSON body itself and streams the reply
+        self.stream_routes = {
+            ('POST', '/api/check-strength/batch'): self.check_strength_ndjson
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._handle_http(scope, receive, send)
+        elif scope['type'] == 'websocket':
+            await self._handle_websocket(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def close(self):
+        """Close the breach client's connection pool and the executor"""
+        await self.breach_client.close()
+        self.executor.shutdown(wait=False)
+
+    async def _handle_http(self, scope, receive, send):
+        started = time.perf_counter()
+        method = scope['method']
+        route = scope['path'] if any(path == scope['path'] for _, path in self.routes) else 'unmatched'
+        status = await self._dispatch(scope, receive, send, method, route)
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, route, method, str(status))
+
+    async def _dispatch(self, scope, receive, send, method, route):
+        """Run the matching handler and send its response; returns the status code"""
+        if method == 'OPTIONS':
+            await self._send(send, 204, None)
+            return 204
+
+        handler = self.routes.get((method, scope['path']))
+        if handler is None:
+            allowed = route != 'unmatched'
+            status = 405 if allowed else 404
+            await self._send(send, status, {'success': False, 'error': 'Method not allowed' if allowed else 'Not found'})
+            return status
+
+        headers = ()
+        admitted = False
+        try:
+            if self.admission is not None and scope['path'].startswith(LIMITED_PREFIX):
+                self._admit(scope)
+                admitted = True
+            stream = self.stream_routes.get((method, scope['path']))
+            if stream is not None and not _is_json(scope):
+                return await stream(receive, send)
+            if handler == self.check_strength_batch:
+                data = await self._read_json(receive, MAX_BATCH_BODY_SIZE, objects_only=False)
+            elif method == 'POST':
+                data = await self._read_json(receive)
+            else:
+                data = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1')))
+            status, body = 200, await handler(data)
+        except RequestError as e:
+            status, body, headers = e.status, {'success': False, 'error': str(e)}, e.headers
+        except Exception as e:
+            status, body = 400, {'success': False, 'error': str(e)}
+        finally:
+            if admitted:
+                self.admission.release()
+        await self._send(send, status, body, _header(scope, b'accept-encoding'), headers)
+        return status
+
+    def _admit(self, scope, count_in_flight=True):
+        """Count the request in flight, or raise a 429 RequestError"""
+        client = scope.get('client')
+        address = self.admission.client_address(client[0] if client else None,
+                                                _header(scope, b'x-forwarded-for'))
+        rejection = self.admission.admit(address, upstream=scope['path'] in UPSTREAM_ROUTES,
+                                         count_in_flight=count_in_flight)
+        if rejection is not None:
+            raise RequestError(REJECTION_MESSAGE, status=429,
+                               headers=[(b'retry-after', retry_after_header(rejection.retry_after).encode('ascii'))])
+
+    async def _read_json(self, receive, max_size=MAX_BODY_SIZE, objects_only=True):
+        """Read the request body and decode it as a JSON object (or any JSON value)"""
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                raise RequestError('Client disconnected')
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > max_size:
+                raise RequestError('Request body too large', status=413)
+            chunks.append(chunk)
+            if not message.get('more_body'):
+                break
+
+        try:
+            data = json.loads(b''.join(chunks))
+        except ValueError:
+            raise RequestError('Failed to decode JSON object')
+        if objects_only and not isinstance(data, dict):
+            raise RequestError('Expected a JSON object')
+        return data
+
+    async def _handle_websocket(self, scope, receive, send):
+        """
+        The /api/check-strength/stream WebSocket (as app.py); any other path,
+        or a rate-limited client, is closed before the handshake completes
+        """
+        message = await receive()
+        if message['type'] != 'websocket.connect':
+            return
+        if scope['path'] != STREAM_PATH:
+            await send({'type': 'websocket.close', 'code': 1008})
+            return
+        if self.admission is not None:
+            try:
+                # Only the upgrade is rate limited, as in app.py
+                self._admit(scope, count_in_flight=False)
+            except RequestError:
+                await send({'type': 'websocket.close', 'code': 1008})
+                return
+
+        await send({'type': 'websocket.accept'})
+        query = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1')))
+        try:
+            analyzer = self.password_checker.analyzer(query.get('estimator'))
+        except ValueError as e:
+            await send({'type': 'websocket.send', 'text': json.dumps({'success': False, 'error': str(e)})})
+            await send({'type': 'websocket.close', 'code': 1000})
+            return
+
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await receive()
+            if message['type'] == 'websocket.disconnect':
+                return
+            if message['type'] != 'websocket.receive':
+                continue
+            try:
+                data = json.loads(message.get('text') or message.get('bytes') or b'')
+                # The analyzer's scan state lives in this process, so it runs
+                # on the default thread pool rather than self.executor
+                result = await loop.run_in_executor(None, self._stream_update, analyzer, data)
+                reply = {'success': True, 'data': result}
+            except Exception as e:
+                reply = {'success': False, 'error': str(e)}
+            await send({'type': 'websocket.send', 'text': json.dumps(reply)})
+
+    @staticmethod
+    def _stream_update(analyzer, data):
+        """Apply one stream message to its connection's IncrementalAnalyzer"""
+        if 'password' in data:
+            return analyzer.update(data['password'])
+        if 'append' in data:
+            return analyzer.append(data['append'])
+        if 'delete' in data:
+            return analyzer.delete(int(data['delete']))
+        raise ValueError('Expected "password", "append" or "delete"')
+
+    @staticmethod
+    async def _send(send, status, body, accept_encoding='', extra_headers=()):
+        headers = list(CORS_HEADERS) + list(extra_headers)
+        payload = b''
+        if isinstance(body, TextResponse):
+            payload = body.text.encode('utf-8')
+            headers.append((b'content-type', body.content_type.encode('ascii')))
+        elif body is not None:
+            payload = json.dumps(body).encode('utf-8')
+            headers.append((b'content-type', b'application/json'))
+        if body is not None:
+            # JSON and text bodies above MIN_COMPRESS_SIZE, as negotiated
+            payload, coding = compress_body(payload, accept_encoding)
+            headers.append((b'vary', b'Accept-Encoding'))
+            if coding is not None:
+                headers.append((b'content-encoding', coding.encode('ascii')))
+        headers.append((b'content-length', str(len(payload)).encode('ascii')))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': payload})
+
+    def _check_strength_local(self, password, estimator, policy=None):
+        return self.password_checker.check_strength(password, estimator=estimator, policy=policy)
+
+    async def _run_blocking(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(function, *args, **kwargs))
+
+    async def home(self, data):
+        return {
+            'message': 'Password Security Checker API',
+            'version': '1.0.0',
+            'endpoints': {
+                'check_strength': '/api/check-strength',
+                'check_strength_batch': '/api/check-strength/batch',
+                'check_strength_stream': '/api/check-strength/stream (WebSocket)',
+                'check_breach': '/api/check-breach',
+                'analyze': '/api/analyze',
+                'generate_password': '/api/generate-password',
+                'generate_passphrase': '/api/generate-passphrase'
+            }
+        }
+
+    async def metrics(self, data):
+        """Prometheus scrape endpoint"""
+        return TextResponse(REGISTRY.render(), CONTENT_TYPE)
+
+    async def debug_profile(self, data):
+        """Collapsed-stack profile of ?seconds=N (only with PROFILER_ENABLED)"""
+        if self.profiler is None:
+            raise RequestError('Profiler is disabled', status=404)
+        seconds = float(data.get('seconds', 5))
+        loop = asyncio.get_running_loop()
+        try:
+            # Own thread, so the loop being profiled keeps serving requests
+            text = await loop.run_in_executor(None, self.profiler.collapsed, seconds)
+        except RuntimeError as e:
+            raise RequestError(str(e), status=409)
+        return TextResponse(text, 'text/plain; charset=utf-8')
+
+    async def check_strength(self, data):
+        """Check password strength"""
+        password = data.get('password', '')
+        estimator = data.get('estimator')
+        policy = data.get('policy')
+
+        result = await self._run_blocking(self._check_strength, password, estimator, policy)
+
+        return {
+            'success': True,
+            'data': result
+        }
+
+    async def check_strength_batch(self, data):
+        """Check the strength of a JSON array (or {"passwords": [...]}) of passwords"""
+        passwords = data.get('passwords', []) if isinstance(data, dict) else data
+
+        if not isinstance(passwords, list):
+            raise ValueError('Expected a JSON array of passwords')
+        if len(passwords) > MAX_BATCH_SIZE:
+            raise ValueError(f'Batch too large (maximum {MAX_BATCH_SIZE:,} passwords)')
+
+        results = await self._run_blocking(self._score_batch, passwords)
+
+        return {
+            'success': True,
+            'count': len(results),
+            'data': results
+        }
+
+    async def check_strength_ndjson(self, receive, send):
+        """
+        Stream one JSON result per line of a newline-delimited body
+        Each received chunk is scored as it arrives; a line that can't be
+        decoded or scored gets a {"success": false, "error": ...} row in
+        its place. Returns the status code
+        """
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': list(CORS_HEADERS) + [(b'content-type', b'application/x-ndjson')]})
+        pending = b''
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return 200
+            more_body = message.get('more_body', False)
+            *lines, pending = (pending + message.get('body', b'')).split(b'\n')
+            if not more_body:
+                lines.append(pending)
+            elif len(pending) > MAX_BODY_SIZE:
+                lines.append(None)
+                more_body = False
+
+            rows = {}
+            passwords = []
+            for index, line in enumerate(lines):
+                try:
+                    if line is None:
+                        raise ValueError('Line too long')
+                    password = line.decode('utf-8').rstrip('\r')
+                except ValueError as e:
+                    rows[index] = {'success': False, 'error': str(e)}
+                    continue
+                if password:
+                    rows[index] = len(passwords)
+                    passwords.append(password)
+            if not rows:
+                continue
+
+            results = await self._run_blocking(self._score_batch, passwords) if passwords else []
+            body = ''.join(json.dumps(results[row] if isinstance(row, int) else row) + '\n'
+                           for row in rows.values())
+            await send({'type': 'http.response.body', 'body': body.encode('utf-8'), 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+        return 200
+
+    async def check_breach(self, data):
+        """Check if password has been breached"""
+        password = data.get('password', '')
+
+        result = await self.breach_client.check_breach_async(password)
+
+        return {
+            'success': True,
+            'data': result
+        }
+
+    async def analyze(self, data):
+        """Check strength and breaches in one request"""
+        budget_ms = data.get('breach_budget_ms')
+
+        result = await self.password_analyzer.analyze_async(
+            data.get('password', ''),
+            estimator=data.get('estimator'),
+            breach_budget=float(budget_ms) / 1000 if budget_ms is not None else None,
+            check_strength=partial(self._run_blocking, self._check_strength)
+        )
+
+        return {
+            'success': True,
+            'data': result
+        }
+
+    async def generate_password(self, data):
+        """Generate a random password"""
+        return await self._run_blocking(
+            self.password_generator.generate,
+            length=data.get('length', 16),
+            use_lowercase=data.get('lowercase', True),
+            use_uppercase=data.get('uppercase', True),
+            use_digits=data.get('digits', True),
+            use_special=data.get('special', True),
+            exclude_ambiguous=data.get('exclude_ambiguous', False),
+            count=data.get('count')
+        )
+
+    async def generate_passphrase(self, data):
+        """Generate a passphrase"""
+        return await self._run_blocking(
+            self.password_generator.generate_passphrase,
+            word_count=data.get('word_count', 4),
+            separator=data.get('separator', '-'),
+            capitalize=data.get('capitalize', True),
+            add_number=data.get('add_number', True),
+            count=data.get('count'),
+            wordlist=data.get('wordlist', 'default')
+        )
+
+
+def create_app():
+    """PasswordAPI configured from the environment (STRENGTH_EXECUTOR, STRENGTH_WORKERS)"""
+    workers = os.environ.get('STRENGTH_WORKERS')
+    return PasswordAPI(executor=os.environ.get('STRENGTH_EXECUTOR') or 'thread',
+                       workers=int(workers) if workers else None)
+
+
+app = create_app()
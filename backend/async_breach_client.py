@@ -0,0 +1,222 @@
+import asyncio
+import hashlib
+import math
+import random
+import threading
+import time
+
+import aiohttp
+
+from breach_checker import BreachChecker, UpstreamError, USER_AGENT
+from metrics import BREACH_UPSTREAM_ERRORS, BREACH_UPSTREAM_SECONDS
+from range_cache import parse_range
+
+# Upstream statuses worth retrying with backoff
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class AsyncBreachClient(BreachChecker):
+    """
+    asyncio version of BreachChecker
+    Shares one pooled aiohttp session, caps concurrent upstream requests,
+    merges concurrent lookups for the same prefix into one request and
+    retries 429/5xx responses with exponential backoff
+    """
+
+    def __init__(self, max_concurrency=32, pool_size=100, max_retries=3, backoff=0.25, **kwargs):
+        super().__init__(**kwargs)
+        self.max_concurrency = max_concurrency
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self._session = None
+        self._semaphore = None
+        self._inflight = {}  # prefix -> task fetching it
+
+        self.upstream_requests = 0
+        self.coalesced = 0
+        self.retries = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the connection pool"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        """Create the pooled session on first use (it must live on the running loop)"""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'User-Agent': USER_AGENT}
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def fetch_range(self, prefix):
+        """Parsed {suffix: count} for a prefix, from cache or a (shared) upstream request"""
+        if self.range_cache is not None:
+            suffixes = self.range_cache.get(prefix)
+            if suffixes is not None:
+                return suffixes
+
+        task = self._inflight.get(prefix)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_upstream(prefix))
+            self._inflight[prefix] = task
+            task.add_done_callback(lambda _: self._inflight.pop(prefix, None))
+        else:
+            self.coalesced += 1
+
+        # Shield so one cancelled caller doesn't cancel the shared request
+        return await asyncio.shield(task)
+
+    async def _fetch_upstream(self, prefix):
+        """GET one range with retries; raises UpstreamError on a final non-200"""
+        session = self._get_session()
+
+        for attempt in range(self.max_retries + 1):
+            # A slot is held only while a request is out, not while backing off
+            async with self._semaphore:
+                self.upstream_requests += 1
+                started = time.perf_counter()
+                async with session.get(f"{self.api_url}{prefix}") as response:
+                    if response.status == 200:
+                        suffixes = parse_range(await response.text())
+                        BREACH_UPSTREAM_SECONDS.observe(time.perf_counter() - started, '200')
+                        if self.range_cache is not None:
+                            self.range_cache.put(prefix, suffixes)
+                        return suffixes
+
+                    BREACH_UPSTREAM_SECONDS.observe(time.perf_counter() - started, str(response.status))
+                    if response.status not in RETRY_STATUSES or attempt == self.max_retries:
+                        raise UpstreamError(response.status)
+
+                    delay = self._retry_delay(attempt, response.headers.get('Retry-After'))
+
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    def _retry_delay(self, attempt, retry_after):
+        """
+        Honour Retry-After when given (at most the request timeout, so an
+        upstream can't park a lookup indefinitely), otherwise exponential
+        backoff with jitter. A value that isn't a finite number of seconds
+        ('nan', 'inf', an HTTP date) falls back to the backoff
+        """
+        if retry_after:
+            try:
+                seconds = float(retry_after)
+            except ValueError:
+                seconds = math.nan
+            if math.isfinite(seconds):
+                return min(max(seconds, 0.0), self.timeout)
+        return self.backoff * (2 ** attempt) * (0.5 + random.random())
+
+    async def check_breach_async(self, password):
+        """Async check_breach; returns the same dict shape"""
+        if not password:
+            return {
+                'checked': False,
+                'error': 'No password provided'
+            }
+
+        try:
+            sha1_digest = hashlib.sha1(password.encode('utf-8')).digest()
+        except UnicodeEncodeError as e:
+            return {
+                'checked': False,
+                'error': f'Unexpected error: {str(e)}'
+            }
+
+        return await self.check_breach_digest_async(sha1_digest)
+
+    async def check_breach_digest_async(self, sha1_digest):
+        """Async check_breach_digest; returns the same dict shape"""
+        try:
+            offline_result = self._check_offline(sha1_digest)
+            if offline_result is not None:
+                return offline_result
+
+            sha1_hash = sha1_digest.hex().upper()
+            suffixes = await self.fetch_range(sha1_hash[:5])
+            return self._build_result(suffixes.get(sha1_hash[5:]) or 0)
+
+        except UpstreamError as e:
+            return {
+                'checked': False,
+                'error': str(e)
+            }
+        except asyncio.TimeoutError:
+            BREACH_UPSTREAM_ERRORS.inc('timeout')
+            return {
+                'checked': False,
+                'error': 'Request timeout. Please try again.'
+            }
+        except aiohttp.ClientConnectionError:
+            BREACH_UPSTREAM_ERRORS.inc('connection')
+            return {
+                'checked': False,
+                'error': 'Connection error. Check your internet connection.'
+            }
+        except Exception as e:
+            return {
+                'checked': False,
+                'error': f'Unexpected error: {str(e)}'
+            }
+
+    async def check_breaches_async(self, passwords):
+        """Check many passwords concurrently; results are in input order"""
+        return await asyncio.gather(*(self.check_breach_async(password) for password in passwords))
+
+
+class PooledBreachClient:
+    """
+    Blocking wrapper around AsyncBreachClient for synchronous callers
+    Runs the client on a private event-loop thread so the connection pool
+    and in-flight request merging are shared across calls and threads
+    """
+
+    def __init__(self, **kwargs):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='breach-client', daemon=True)
+        self._thread.start()
+        self.client = AsyncBreachClient(**kwargs)
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def check_breach(self, password):
+        """Same contract as BreachChecker.check_breach"""
+        return self._run(self.client.check_breach_async(password))
+
+    def check_breach_digest(self, sha1_digest):
+        """Same contract as BreachChecker.check_breach_digest"""
+        return self._run(self.client.check_breach_digest_async(sha1_digest))
+
+    def check_breaches(self, passwords):
+        """Check many passwords concurrently; results are in input order"""
+        return self._run(self.client.check_breaches_async(list(passwords)))
+
+    def close(self):
+        """Close the pool and stop the loop thread"""
+        if self._loop.is_closed():
+            return
+        self._run(self.client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,175 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from breach_checker import BreachChecker
+from password_checker import PasswordChecker
+
+CSV_FIELDS = ['line', 'password', 'score', 'strength', 'entropy', 'crack_time', 'length', 'breached', 'breach_count']
+
+# Per-process checkers, set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(options):
+    """Create this process's checkers (each worker maps its own index files)"""
+    _worker['checker'] = PasswordChecker(wordlist=options.get('wordlist'), estimator=options['estimator'])
+    _worker['breach'] = None
+    if options.get('breach_index'):
+        _worker['breach'] = BreachChecker(local_index=options['breach_index'],
+                                          breach_filter=options.get('breach_filter'))
+    _worker['include_password'] = options['include_password']
+
+
+def _audit_chunk(chunk):
+    """Score one (first line number, passwords) chunk; returns output rows"""
+    first_line, passwords = chunk
+    checker = _worker['checker']
+    breach = _worker['breach']
+    rows = []
+
+    for offset, result in enumerate(checker.check_strength_batch(passwords, lazy=True)):
+        password = passwords[offset]
+        row = {
+            'line': first_line + offset,
+            'score': result['score'],
+            'strength': result['strength'],
+            'entropy': result['entropy'],
+            'crack_time': result['crack_time'],
+            'length': result.get('length', 0)
+        }
+        if _worker['include_password']:
+            row['password'] = password
+        if breach is not None:
+            breach_result = breach.check_breach(password)
+            row['breached'] = breach_result.get('breached')
+            row['breach_count'] = breach_result.get('count')
+        rows.append(row)
+
+    return rows
+
+
+def read_chunks(stream, chunk_size):
+    """Yield (first line number, [passwords]) from a binary line stream"""
+    chunk = []
+    first_line = 1
+    for line_number, raw_line in enumerate(stream, 1):
+        chunk.append(raw_line.decode('utf-8', 'replace').rstrip('\r\n'))
+        if len(chunk) >= chunk_size:
+            yield first_line, chunk
+            chunk = []
+            first_line = line_number + 1
+    if chunk:
+        yield first_line, chunk
+
+
+def run_audit(chunks, workers, options, ordered=True, max_in_flight=None):
+    """
+    Score chunks across a process pool, yielding lists of output rows
+    At most max_in_flight chunks are queued at once, so memory stays
+    constant however long the input is
+    """
+    max_in_flight = max_in_flight or workers * 4
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(options,)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_audit_chunk, chunk))
+            if len(pending) < max_in_flight:
+                continue
+
+            if ordered:
+                yield pending.popleft().result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield future.result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+class RowWriter:
+    """JSONL or CSV row writer"""
+
+    def __init__(self, stream, output_format, fields):
+        self.stream = stream
+        self.csv_writer = None
+        if output_format == 'csv':
+            self.csv_writer = csv.DictWriter(stream, fieldnames=fields, extrasaction='ignore')
+            self.csv_writer.writeheader()
+
+    def write(self, rows):
+        if self.csv_writer is not None:
+            self.csv_writer.writerows(rows)
+        else:
+            self.stream.writelines(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Audit a newline-delimited password file')
+    parser.add_argument('input', nargs='?', default='-', help='password file (default: stdin)')
+    parser.add_argument('-o', '--output', default='-', help='output file (default: stdout)')
+    parser.add_argument('-f', '--format', choices=['jsonl', 'csv'], default='jsonl')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=2000, help='passwords per work unit')
+    parser.add_argument('--unordered', action='store_true', help='emit chunks as they finish instead of in input order')
+    parser.add_argument('--estimator', choices=['entropy', 'guesses'], default='entropy')
+    parser.add_argument('--wordlist', help='common-password index built by wordlist_index.py')
+    parser.add_argument('--breach-index', help='local breach index built by breach_index.py')
+    parser.add_argument('--breach-filter', help='breach pre-filter built by breach_filter.py')
+    parser.add_argument('--include-password', action='store_true', help='copy the plaintext into the output')
+    parser.add_argument('--quiet', action='store_true', help='no progress on stderr')
+    args = parser.parse_args(argv)
+
+    options = {
+        'estimator': args.estimator,
+        'wordlist': args.wordlist,
+        'breach_index': args.breach_index,
+        'breach_filter': args.breach_filter,
+        'include_password': args.include_password
+    }
+    fields = [field for field in CSV_FIELDS
+              if (field != 'password' or args.include_password)
+              and (field not in ('breached', 'breach_count') or args.breach_index)]
+
+    source = sys.stdin.buffer if args.input == '-' else open(args.input, 'rb')
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+
+    started = time.monotonic()
+    last_report = started
+    processed = 0
+
+    try:
+        writer = RowWriter(sink, args.format, fields)
+        chunks = read_chunks(source, args.chunk_size)
+
+        for rows in run_audit(chunks, args.workers, options, ordered=not args.unordered):
+            writer.write(rows)
+            processed += len(rows)
+
+            now = time.monotonic()
+            if not args.quiet and now - last_report >= 1:
+                last_report = now
+                print(f"\r{processed:,} passwords  {processed / (now - started):,.0f}/s",
+                      end='', file=sys.stderr, flush=True)
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    if not args.quiet:
+        elapsed = time.monotonic() - started
+        print(f"\r✓ Audited {processed:,} passwords in {elapsed:.1f}s "
+              f"({processed / elapsed if elapsed else 0:,.0f}/s)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,118 @@
 import hashlib
-import requests
 import time
+from breach_filter import BreachFilter
+from breach_index import LocalBreachIndex
+from metrics import BREACH_UPSTREAM_ERRORS, BREACH_UPSTREAM_SECONDS
+from range_cache import RangeCache, parse_range
+
+USER_AGENT = 'Password-Checker-Educational-Project'
+DEFAULT_API_URL = 'https://api.pwnedpasswords.com/range/'
+
+# Hash types the range API serves, with their hex length
+HASH_TYPES = {'sha1': 40, 'ntlm': 32}
+
+
+class UpstreamError(Exception):
+    """Range API answered with a non-200 status (after any retries)"""
+
+    def __init__(self, status_code):
+        super().__init__(f'API Error: {status_code}')
+        self.status_code = status_code
+
 
 class BreachChecker:
     """
     Check if password has been compromised in data breaches
-    Uses Have I Been Pwned API with k-anonymity
+    Uses Have I Been Pwned API with k-anonymity, or an offline
+    index file built by breach_index.py when local_index is given.
+    An optional breach_filter (breach_filter.py) answers most negatives
+    without consulting either source. Range responses are cached per
+    prefix (cache_size=0 disables the cache). api_url points range
+    requests at another server, e.g. range_server.py for load tests
     """
     
-    def __init__(self):
-        self.api_url = "https://api.pwnedpasswords.com/range/"
+    def __init__(self, local_index=None, breach_filter=None,
+                 cache_size=4096, cache_ttl=86400, cache_dir=None, cache_disk_entries=65536, api_url=None):
+        self.api_url = api_url or DEFAULT_API_URL  # the hash prefix is appended
         self.timeout = 5  # seconds
+        
+        self._requests_session = None  # created on first API call
+        
+        # Offline mode: a LocalBreachIndex or a path to an index file
+        if local_index is not None and not isinstance(local_index, LocalBreachIndex):
+            local_index = LocalBreachIndex(local_index)
+        self.local_index = local_index
+        
+        # Pre-filter: a BreachFilter or a path to a filter file
+        if breach_filter is not None and not isinstance(breach_filter, BreachFilter):
+            breach_filter = BreachFilter(breach_filter)
+        self.breach_filter = breach_filter
+        
+        # Parsed range responses, keyed by hash prefix
+        self.range_cache = None
+        if cache_size:
+            self.range_cache = RangeCache(max_entries=cache_size, ttl=cache_ttl, cache_dir=cache_dir,
+                                          max_disk_entries=cache_disk_entries)
+    
+    @property
+    def session(self):
+        """Keep-alive connection pool shared by every API call"""
+        if self._requests_session is None:
+            # requests is the slowest import here; offline checks never load it
+            import requests
+            session = requests.Session()
+            session.headers['User-Agent'] = USER_AGENT
+            self._requests_session = session
+        return self._requests_session
+    
+    def _get_range(self, url):
+        """
+        GET one range from the API
+        Raises the builtin TimeoutError / ConnectionError for requests' own,
+        so callers can handle them without importing requests
+        """
+        import requests
+        try:
+            return self.session.get(url, timeout=self.timeout)
+        except requests.exceptions.Timeout as e:
+            raise TimeoutError(str(e)) from e
+        except requests.exceptions.ConnectionError as e:
+            raise ConnectionError(str(e)) from e
+    
+    def lookup_range(self, hash_prefix, hash_type='sha1'):
+        """
+        {suffix: count} for a 5-char hash prefix, from the cache or the API
+        hash_type='ntlm' fetches NTLM ranges instead of SHA-1. Raises
+        UpstreamError on a non-200 status, TimeoutError or ConnectionError
+        """
+        cache_key = hash_prefix if hash_type == 'sha1' else f'{hash_prefix}-{hash_type}'
+        suffixes = self.range_cache.get(cache_key) if self.range_cache is not None else None
+        if suffixes is not None:
+            return suffixes
+        
+        # Query API with prefix only (k-anonymity)
+        url = f"{self.api_url}{hash_prefix}"
+        if hash_type != 'sha1':
+            url += f"?mode={hash_type}"
+        started = time.perf_counter()
+        try:
+            response = self._get_range(url)
+        except TimeoutError:
+            BREACH_UPSTREAM_ERRORS.inc('timeout')
+            raise
+        except ConnectionError:
+            BREACH_UPSTREAM_ERRORS.inc('connection')
+            raise
+        BREACH_UPSTREAM_SECONDS.observe(time.perf_counter() - started, str(response.status_code))
+        
+        if response.status_code != 200:
+            raise UpstreamError(response.status_code)
+        
+        # Parse response once; repeat lookups reuse the dict
+        suffixes = parse_range(response.text)
+        if self.range_cache is not None:
+            self.range_cache.put(cache_key, suffixes)
+        return suffixes
     
     def check_breach(self, password):
         """
@@ -25,59 +127,40 @@ class BreachChecker:
         
         try:
             # Generate SHA-1 hash of password
-            sha1_hash = hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
-            
-            # Split hash: first 5 chars (prefix) and rest (suffix)
-            hash_prefix = sha1_hash[:5]
-            hash_suffix = sha1_hash[5:]
-            
-            # Query API with prefix only (k-anonymity)
-            response = requests.get(
-                f"{self.api_url}{hash_prefix}",
-                timeout=self.timeout,
-                headers={'User-Agent': 'Password-Checker-Educational-Project'}
-            )
-            
-            if response.status_code != 200:
-                return {
-                    'checked': False,
-                    'error': f'API Error: {response.status_code}'
-                }
-            
-            # Parse response
-            hashes = response.text.splitlines()
+            sha1_digest = hashlib.sha1(password.encode('utf-8')).digest()
+        except UnicodeEncodeError as e:
+            return {
+                'checked': False,
+                'error': f'Unexpected error: {str(e)}'
+            }
+        
+        return self.check_breach_digest(sha1_digest)
+    
+    def check_breach_digest(self, sha1_digest):
+        """check_breach for an already computed SHA-1 digest (20 bytes)"""
+        try:
+            sha1_hash = sha1_digest.hex().upper()
             
-            for hash_line in hashes:
-                parts = hash_line.split(':')
-                if len(parts) != 2:
-                    continue
-                
-                returned_suffix, count = parts
-                
-                if returned_suffix == hash_suffix:
-                    return {
-                        'checked': True,
-                        'breached': True,
-                        'count': int(count),
-                        'message': f'⚠️ WARNING: This password has been exposed {int(count):,} times in data breaches!',
-                        'severity': self._get_severity(int(count))
-                    }
+            # Filter and local index answer without the network
+            offline_result = self._check_offline(sha1_digest)
+            if offline_result is not None:
+                return offline_result
             
-            # Password not found in breaches
+            # Split hash: first 5 chars (prefix) and rest (suffix)
+            count = self.lookup_range(sha1_hash[:5]).get(sha1_hash[5:])
+            return self._build_result(count or 0)
+        
+        except UpstreamError as e:
             return {
-                'checked': True,
-                'breached': False,
-                'count': 0,
-                'message': '✓ Good news! This password was not found in known data breaches.',
-                'severity': 'safe'
+                'checked': False,
+                'error': str(e)
             }
-        
-        except requests.exceptions.Timeout:
+        except TimeoutError:
             return {
                 'checked': False,
                 'error': 'Request timeout. Please try again.'
             }
-        except requests.exceptions.ConnectionError:
+        except ConnectionError:
             return {
                 'checked': False,
                 'error': 'Connection error. Check your internet connection.'
@@ -88,6 +171,37 @@ class BreachChecker:
                 'error': f'Unexpected error: {str(e)}'
             }
     
+    def _check_offline(self, sha1_digest):
+        """Result from the pre-filter or local index, or None if the API is needed"""
+        # A filter miss means the hash is definitely not in the corpus
+        if self.breach_filter is not None and not self.breach_filter.might_contain(sha1_digest):
+            return self._build_result(0)
+        
+        # Offline mode never touches the network
+        if self.local_index is not None:
+            return self._build_result(self.local_index.lookup_digest(sha1_digest))
+        
+        return None
+    
+    def _build_result(self, count):
+        """Build the result dict for a breach count (0 = not found)"""
+        if count:
+            return {
+                'checked': True,
+                'breached': True,
+                'count': count,
+                'message': f'⚠️ WARNING: This password has been exposed {count:,} times in data breaches!',
+                'severity': self._get_severity(count)
+            }
+        
+        return {
+            'checked': True,
+            'breached': False,
+            'count': 0,
+            'message': '✓ Good news! This password was not found in known data breaches.',
+            'severity': 'safe'
+        }
+    
     def _get_severity(self, count):
         """Determine severity based on breach count"""
         if count > 100000:
@@ -0,0 +1,129 @@
+import argparse
+import math
+import mmap
+import struct
+
+from breach_index import parse_dump_lines
+
+# File layout: header (MAGIC, version, bit count, hash count, item count)
+# followed by the raw bit array
+MAGIC = b'PWNBLOOM'
+VERSION = 1
+HEADER = struct.Struct('<8sIQIQ')
+
+
+def filter_parameters(expected_items, false_positive_rate):
+    """Optimal (bit count, hash count) for a Bloom filter"""
+    if not 0 < false_positive_rate < 1:
+        raise ValueError('false_positive_rate must be between 0 and 1')
+
+    expected_items = max(1, expected_items)
+    num_bits = math.ceil(-expected_items * math.log(false_positive_rate) / (math.log(2) ** 2))
+    num_bits = max(8, num_bits)
+    num_hashes = max(1, round(num_bits / expected_items * math.log(2)))
+    return num_bits, num_hashes
+
+
+def _bit_positions(digest, num_bits, num_hashes):
+    """
+    Derive bit positions from a SHA-1 digest by double hashing
+    The digest is already uniformly distributed, so no extra hashing is needed
+    """
+    first = int.from_bytes(digest[:8], 'little')
+    second = int.from_bytes(digest[8:16], 'little') | 1
+    return [(first + i * second) % num_bits for i in range(num_hashes)]
+
+
+def build_filter(digests, output_path, expected_items, false_positive_rate=0.001):
+    """
+    Write a Bloom filter over 20-byte SHA-1 digests to output_path
+    The bit array is built directly in a memory-mapped file, so RAM use
+    stays flat even for multi-GB filters. Returns the number of items added
+    """
+    num_bits, num_hashes = filter_parameters(expected_items, false_positive_rate)
+    size = HEADER.size + (num_bits + 7) // 8
+    added = 0
+
+    with open(output_path, 'w+b') as output:
+        output.truncate(size)
+        with mmap.mmap(output.fileno(), size) as bits:
+            for digest in digests:
+                for position in _bit_positions(digest, num_bits, num_hashes):
+                    byte = HEADER.size + (position >> 3)
+                    bits[byte] |= 1 << (position & 7)
+                added += 1
+
+            HEADER.pack_into(bits, 0, MAGIC, VERSION, num_bits, num_hashes, added)
+
+    return added
+
+
+def build_filter_from_dump(dump_path, output_path, false_positive_rate=0.001):
+    """Build a filter from a Pwned Passwords dump (two passes: count, then add)"""
+    with open(dump_path, 'rb') as dump:
+        expected_items = sum(1 for line in dump if line.strip())
+
+    with open(dump_path, 'rb') as dump:
+        digests = (digest for digest, _ in parse_dump_lines(dump))
+        return build_filter(digests, output_path, expected_items, false_positive_rate)
+
+
+class BreachFilter:
+    """
+    Memory-mapped Bloom filter over breached SHA-1 digests
+    A negative answer is definite; a positive one must be confirmed
+    against the exact source (range API or local index)
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f'{self.path} is not a breach filter file')
+
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f'{self.path} is not a breach filter file')
+
+        magic, version, self.num_bits, self.num_hashes, self.item_count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or len(self._map) < HEADER.size + (self.num_bits + 7) // 8:
+            self.close()
+            raise ValueError(f'{self.path} is not a breach filter file')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the memory map and file handle"""
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def might_contain(self, digest):
+        """False if the digest is definitely not breached"""
+        bits = self._map
+        for position in _bit_positions(digest, self.num_bits, self.num_hashes):
+            if not bits[HEADER.size + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build a breach pre-filter from a Pwned Passwords SHA-1 dump')
+    parser.add_argument('dump', help='SHA-1 dump (HASH:COUNT per line)')
+    parser.add_argument('output', help='filter file to write')
+    parser.add_argument('--fp-rate', type=float, default=0.001, help='target false-positive rate (default: 0.001)')
+    args = parser.parse_args(argv)
+
+    total = build_filter_from_dump(args.dump, args.output, args.fp_rate)
+    print(f"✓ Added {total:,} hashes to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+import argparse
+import mmap
+import struct
+import sys
+from array import array
+
+# File layout:
+#   header   MAGIC, version, prefix bits, record count
+#   index    (2**PREFIX_BITS + 1) little-endian uint64 record offsets
+#   records  sorted 20-byte SHA-1 digest + little-endian uint32 count
+MAGIC = b'PWNDIDX1'
+VERSION = 1
+PREFIX_BITS = 20  # 5 hex chars, same bucketing as the range API
+HEADER = struct.Struct('<8sIIQ')
+INDEX_ENTRY = struct.Struct('<Q')
+COUNT = struct.Struct('<I')
+DIGEST_SIZE = 20
+RECORD_SIZE = DIGEST_SIZE + COUNT.size
+MAX_COUNT = 0xFFFFFFFF
+
+BUCKETS = 1 << PREFIX_BITS
+INDEX_OFFSET = HEADER.size
+RECORDS_OFFSET = INDEX_OFFSET + (BUCKETS + 1) * INDEX_ENTRY.size
+
+
+def _bucket(digest):
+    """Prefix bucket of a 20-byte digest (its first 5 hex chars)"""
+    return int.from_bytes(digest[:3], 'big') >> (24 - PREFIX_BITS)
+
+
+def parse_dump_lines(lines):
+    """
+    Parse 'HASH:COUNT' lines from a Pwned Passwords dump
+    Yields (20-byte digest, count), skipping blank lines
+    """
+    for line_number, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            line = line.decode('ascii')
+        line = line.strip()
+        if not line:
+            continue
+
+        hex_hash, _, count = line.partition(':')
+        if len(hex_hash) != DIGEST_SIZE * 2:
+            raise ValueError(f'Line {line_number}: expected a 40-char SHA-1 hash')
+
+        yield bytes.fromhex(hex_hash), int(count or 0)
+
+
+def build_index(records, output_path):
+    """
+    Write sorted (digest, count) records into an index file
+    Records must already be sorted by hash, as in the ordered-by-hash dump
+    Returns the number of records written
+    """
+    bucket_sizes = array('Q', bytes(BUCKETS * 8))
+    total = 0
+    previous = None
+
+    with open(output_path, 'wb') as output:
+        output.write(HEADER.pack(MAGIC, VERSION, PREFIX_BITS, 0))
+        output.write(bytes((BUCKETS + 1) * INDEX_ENTRY.size))
+
+        for digest, count in records:
+            if previous is not None and digest <= previous:
+                raise ValueError('Input must be sorted by hash with no duplicates')
+            previous = digest
+
+            output.write(digest)
+            output.write(COUNT.pack(min(count, MAX_COUNT)))
+            bucket_sizes[_bucket(digest)] += 1
+            total += 1
+
+        # Prefix sums give each bucket's first record
+        offsets = array('Q', bytes((BUCKETS + 1) * 8))
+        running = 0
+        for bucket in range(BUCKETS):
+            offsets[bucket] = running
+            running += bucket_sizes[bucket]
+        offsets[BUCKETS] = running
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+
+        output.seek(0)
+        output.write(HEADER.pack(MAGIC, VERSION, PREFIX_BITS, total))
+        output.write(offsets.tobytes())
+
+    return total
+
+
+def build_index_from_dump(dump_path, output_path):
+    """Import a downloaded Pwned Passwords SHA-1 dump into an index file"""
+    with open(dump_path, 'rb') as dump:
+        return build_index(parse_dump_lines(dump), output_path)
+
+
+class LocalBreachIndex:
+    """
+    Memory-mapped lookups against a prebuilt breach index file
+    Nothing is loaded into RAM; each lookup reads two index entries and
+    binary-searches the records of a single prefix bucket
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._file.close()
+            raise ValueError(f'{self.path} is not a breach index file')
+
+        if len(self._map) < RECORDS_OFFSET:
+            self.close()
+            raise ValueError(f'{self.path} is not a breach index file')
+
+        magic, version, prefix_bits, self.record_count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or prefix_bits != PREFIX_BITS:
+            self.close()
+            raise ValueError(f'{self.path} is not a breach index file')
+
+    def __len__(self):
+        return self.record_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the memory map and file handle"""
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def _bucket_bounds(self, bucket):
+        """First and one-past-last record number for a prefix bucket"""
+        offset = INDEX_OFFSET + bucket * INDEX_ENTRY.size
+        start = INDEX_ENTRY.unpack_from(self._map, offset)[0]
+        end = INDEX_ENTRY.unpack_from(self._map, offset + INDEX_ENTRY.size)[0]
+        return start, end
+
+    def lookup_digest(self, digest):
+        """Breach count for a 20-byte SHA-1 digest (0 if not present)"""
+        records = self._map
+        low, high = self._bucket_bounds(_bucket(digest))
+
+        while low < high:
+            middle = (low + high) // 2
+            position = RECORDS_OFFSET + middle * RECORD_SIZE
+            candidate = records[position:position + DIGEST_SIZE]
+            if candidate < digest:
+                low = middle + 1
+            elif candidate > digest:
+                high = middle
+            else:
+                return COUNT.unpack_from(records, position + DIGEST_SIZE)[0]
+
+        return 0
+
+    def lookup(self, sha1_hex):
+        """Breach count for a hex SHA-1 hash (0 if not present)"""
+        return self.lookup_digest(bytes.fromhex(sha1_hex))
+
+    def lookup_digests(self, digests):
+        """
+        Breach counts for ascending digests that share one prefix bucket
+        A merge-join with the bucket: each binary search starts where the
+        previous digest's stopped, so the bucket is walked once, forwards
+        """
+        if not digests:
+            return []
+        records = self._map
+        low, end = self._bucket_bounds(_bucket(digests[0]))
+        counts = []
+
+        for digest in digests:
+            high = end
+            while low < high:
+                middle = (low + high) // 2
+                position = RECORDS_OFFSET + middle * RECORD_SIZE
+                if records[position:position + DIGEST_SIZE] < digest:
+                    low = middle + 1
+                else:
+                    high = middle
+
+            position = RECORDS_OFFSET + low * RECORD_SIZE
+            if low < end and records[position:position + DIGEST_SIZE] == digest:
+                counts.append(COUNT.unpack_from(records, position + DIGEST_SIZE)[0])
+            else:
+                counts.append(0)
+
+        return counts
+
+    def range_records(self, prefix):
+        """Yield (digest, count) for every record under a 5-char hex prefix"""
+        start, end = self._bucket_bounds(int(prefix, 16))
+        records = self._map
+
+        for number in range(start, end):
+            position = RECORDS_OFFSET + number * RECORD_SIZE
+            yield (records[position:position + DIGEST_SIZE],
+                   COUNT.unpack_from(records, position + DIGEST_SIZE)[0])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build an offline breach index from a Pwned Passwords SHA-1 dump')
+    parser.add_argument('dump', help='ordered-by-hash SHA-1 dump (HASH:COUNT per line)')
+    parser.add_argument('output', help='index file to write')
+    args = parser.parse_args(argv)
+
+    total = build_index_from_dump(args.dump, args.output)
+    print(f"✓ Indexed {total:,} hashes into {args.output}")
+
+
+if __name__ == '__main__':
+    main()
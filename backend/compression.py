@@ -0,0 +1,81 @@
+"""
+Accept-Encoding negotiation and response compression
+
+gzip is always available; brotli is used too when the optional brotli
+package is installed (pip install brotli). Bodies under MIN_COMPRESS_SIZE
+are sent as they are: below ~1 KiB compression saves less than it costs
+"""
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIN_COMPRESS_SIZE = 1024
+
+# API responses negotiated per request (static files are precompressed at build time)
+COMPRESSIBLE_TYPES = frozenset({'application/json', 'text/plain'})
+
+# Fast levels for per-request bodies; builds use the maximum
+DYNAMIC_LEVELS = {'br': 4, 'gzip': 5}
+MAX_LEVELS = {'br': 11, 'gzip': 9}
+
+
+def available_encodings():
+    """Supported codings, most preferred first"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def parse_accept_encoding(header):
+    """{coding: q} from an Accept-Encoding header"""
+    accepted = {}
+    for item in (header or '').split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate(header, available):
+    """
+    The coding from available (in server preference order) that the client
+    rates highest, or None for an uncompressed response
+    """
+    accepted = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for coding in available:
+        q = accepted.get(coding, accepted.get('*', 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(data, coding, level=None):
+    """data compressed with 'gzip' or 'br' (at DYNAMIC_LEVELS unless level is given)"""
+    level = DYNAMIC_LEVELS[coding] if level is None else level
+    if coding == 'gzip':
+        # mtime=0 keeps output identical for identical input (stable ETags)
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if coding == 'br' and brotli is not None:
+        return brotli.compress(data, quality=level)
+    raise ValueError(f'Unsupported content coding: {coding}')
+
+
+def compress_body(body, accept_encoding, min_size=MIN_COMPRESS_SIZE):
+    """(body, coding) for a response; coding is None when it's left uncompressed"""
+    if len(body) < min_size:
+        return body, None
+    coding = negotiate(accept_encoding, available_encodings())
+    if coding is None:
+        return body, None
+    return compress(body, coding), coding
@@ -0,0 +1,173 @@
+import os
+import threading
+from pathlib import Path
+from breach_checker import BreachChecker
+from metrics import BREACH_UPSTREAM_SECONDS, REGISTRY, cache_collector
+from passphrase_wordlist import parse_wordlist_config
+from password_analyzer import PasswordAnalyzer
+from password_checker import PasswordChecker
+from password_generator import PasswordGenerator
+from policy import load_policies
+from profiler import SamplingProfiler
+from rate_limit import (
+    AdmissionController, LatencyWindow, RateLimiter, SharedTokenBuckets, TokenBuckets, parse_limit
+)
+from static_assets import StaticAssets
+
+
+def _env(name, default=None):
+    """Environment variable, treating an empty value as unset"""
+    return os.environ.get(name) or default
+
+
+def build_password_checker():
+    # Set COMMON_PASSWORDS_PATH to a wordlist file built by wordlist_index.py
+    # and STRENGTH_ESTIMATOR to 'guesses' for zxcvbn-style crack time estimates.
+    # STRENGTH_CACHE_SIZE > 0 memoizes results (keyed by HMAC, never plaintext).
+    # STRENGTH_STAGE_SAMPLE times the stages of every Nth check (0 = off).
+    # STRENGTH_GUESS_LENGTH is how many characters of a password the 'guesses'
+    # estimator analyses; clients can pick that estimator per request, so it
+    # defaults to well under the library's 100.
+    # PASSWORD_POLICIES_PATH is a JSON file of per-tenant policies (policy.py)
+    from guess_estimator import REQUEST_ANALYSED_LENGTH  # constants only; matchers build on first use
+    policies_path = _env('PASSWORD_POLICIES_PATH')
+    return PasswordChecker(
+        wordlist=_env('COMMON_PASSWORDS_PATH'),
+        estimator=_env('STRENGTH_ESTIMATOR', 'entropy'),
+        cache_size=int(_env('STRENGTH_CACHE_SIZE', 0)),
+        cache_ttl=int(_env('STRENGTH_CACHE_TTL', 300)),
+        stage_sample_every=int(_env('STRENGTH_STAGE_SAMPLE', 64)),
+        guess_length=int(_env('STRENGTH_GUESS_LENGTH', REQUEST_ANALYSED_LENGTH)),
+        policies=load_policies(policies_path) if policies_path else None
+    )
+
+
+def build_breach_checker(checker_class=BreachChecker, **kwargs):
+    # Set BREACH_INDEX_PATH to check breaches against a local index (no egress)
+    # and BREACH_FILTER_PATH to skip lookups the pre-filter rules out.
+    # BREACH_CACHE_DIR adds an on-disk tier to the range response cache, of
+    # at most BREACH_CACHE_DISK_ENTRIES files (BREACH_CACHE_SIZE=0 turns the
+    # cache off). BREACH_API_URL replaces the public range API, e.g. with
+    # range_server.py for load tests
+    return checker_class(
+        local_index=_env('BREACH_INDEX_PATH'),
+        breach_filter=_env('BREACH_FILTER_PATH'),
+        cache_size=int(_env('BREACH_CACHE_SIZE', 4096)),
+        cache_dir=_env('BREACH_CACHE_DIR'),
+        cache_disk_entries=int(_env('BREACH_CACHE_DISK_ENTRIES', 65536)),
+        api_url=_env('BREACH_API_URL'),
+        **kwargs
+    )
+
+
+def build_password_generator():
+    # PASSPHRASE_WORDLISTS='eff=/path/eff_large.txt,de=/path/de.packed' adds named lists
+    return PasswordGenerator(wordlists=parse_wordlist_config(_env('PASSPHRASE_WORDLISTS')))
+
+
+def build_password_analyzer(password_checker, breach_checker):
+    # ANALYZE_BREACH_BUDGET_MS returns /api/analyze strength results without
+    # waiting longer than this for the breach lookup; ANALYZE_MAX_PENDING
+    # caps the lookups left queued or running behind a slow upstream
+    budget_ms = _env('ANALYZE_BREACH_BUDGET_MS')
+    return PasswordAnalyzer(password_checker, breach_checker,
+                            breach_budget=float(budget_ms) / 1000 if budget_ms else None,
+                            max_pending=int(_env('ANALYZE_MAX_PENDING', 256)))
+
+
+def build_static_assets():
+    # STATIC_DIST_DIR is a build from static_assets.py (default frontend/dist);
+    # without one the frontend is served straight from its source files
+    directory = _env('STATIC_DIST_DIR', str(Path(__file__).resolve().parents[1] / 'frontend' / 'dist'))
+    return StaticAssets.find(directory)
+
+
+def build_admission_controller():
+    # RATE_LIMIT_CLIENT, RATE_LIMIT_TOTAL and RATE_LIMIT_UPSTREAM are
+    # 'RATE[:BURST]' in requests per second: per client address, across all
+    # clients, and across the routes that call the range API (check-breach,
+    # analyze). RATE_LIMIT_STATE is a file (ideally on /dev/shm) holding the
+    # buckets, shared by every worker process; without it each process
+    # limits on its own. RATE_LIMIT_TRUSTED_PROXIES is how many reverse
+    # proxies append to X-Forwarded-For in front of the app.
+    # MAX_IN_FLIGHT sheds requests beyond that many running per process, and
+    # SHED_UPSTREAM_LATENCY_MS sheds upstream routes while range API calls
+    # average more than that (over SHED_LATENCY_WINDOW seconds)
+    limits = {name: parse_limit(_env(f'RATE_LIMIT_{name.upper()}'))
+              for name in ('client', 'total', 'upstream')}
+    max_in_flight = int(_env('MAX_IN_FLIGHT', 0))
+    latency_ms = _env('SHED_UPSTREAM_LATENCY_MS')
+    if not any(limits.values()) and not max_in_flight and not latency_ms:
+        return None
+
+    limiter = None
+    if any(limits.values()):
+        state = _env('RATE_LIMIT_STATE')
+        buckets = SharedTokenBuckets(state) if state else TokenBuckets()
+        limiter = RateLimiter(buckets, per_client=limits['client'], total=limits['total'],
+                              upstream=limits['upstream'])
+    latency_window = None
+    if latency_ms:
+        latency_window = LatencyWindow(BREACH_UPSTREAM_SECONDS, window=float(_env('SHED_LATENCY_WINDOW', 5)))
+    return AdmissionController(
+        limiter,
+        max_in_flight=max_in_flight,
+        upstream_latency=float(latency_ms) / 1000 if latency_ms else None,
+        latency_window=latency_window,
+        trusted_proxies=int(_env('RATE_LIMIT_TRUSTED_PROXIES', 0))
+    )
+
+
+def build_profiler():
+    # PROFILER_ENABLED=1 serves on-demand sampling profiles at /debug/profile
+    if _env('PROFILER_ENABLED', '0') in ('0', 'false', 'no'):
+        return None
+    return SamplingProfiler()
+
+
+class LazyInstance:
+    """
+    Stand-in for a component that is built on first attribute access
+    Construction (loading wordlists, opening index files) then happens on
+    the first request that needs it rather than at import, which keeps
+    cold starts short; after that attributes are forwarded to the instance
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._instance is not None
+
+    def get(self):
+        """The built instance"""
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+                instance = self._instance
+        return instance
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+def register_cache_metrics(password_checker, breach_checker):
+    """
+    Expose the strength result and breach range cache stats on /metrics
+    Either may be a LazyInstance; a scrape doesn't build it, its caches
+    are just reported once something else has
+    """
+    components = [('strength_result', password_checker, 'result_cache'),
+                  ('breach_range', breach_checker, 'range_cache')]
+
+    def collect():
+        caches = {label: getattr(component, attribute) for label, component, attribute in components
+                  if not isinstance(component, LazyInstance) or component.loaded}
+        return cache_collector(caches)()
+
+    REGISTRY.register_collector('caches', collect)
@@ -0,0 +1,637 @@
+import math
+import re
+from functools import lru_cache
+
+# Ranked dictionaries, most common first. Parsed lazily on first use
+_RANKED_LISTS = {
+    'passwords': (
+        '123456 password 12345678 qwerty 123456789 12345 1234 111111 1234567 dragon '
+        '123123 baseball abc123 football monkey letmein 696969 shadow master 666666 '
+        'qwertyuiop 123321 mustang 1234567890 michael 654321 superman 1qaz2wsx 7777777 '
+        'trustno1 iloveyou sunshine ashley bailey passw0rd qazwsx 121212 000000 '
+        'princess admin welcome login starwars solo hello freedom whatever charlie '
+        'donald batman zaq1zaq1 flower hottie loveme ninja azerty access secret '
+        'computer jordan harley ranger buster thomas tigger robert soccer hockey '
+        'killer george andrew pepper daniel hunter joshua maggie summer jennifer '
+        'matrix cheese internet asdfgh 987654321 jessica pass love'
+    ),
+    'english': (
+        'the of and to in is you that it he was for on are as with his they at be this '
+        'have from or one had by word but not what all were we when your can said there '
+        'use an each which she do how their if will up other about out many then them '
+        'these so some her would make like him into time has look two more write go see '
+        'number no way could people my than first water been call who oil its now find '
+        'long down day did get come made may part storm summer winter spring tropical '
+        'blue red green black white sun moon star fire ice rain snow wind sky ocean '
+        'river mountain forest tiger eagle wolf bear lion dog cat horse house home '
+        'family friend money world life happy angel magic power secret rock music '
+        'baby girl boy king queen prince princess dragon knight castle'
+    ),
+    'names': (
+        'michael jennifer james john robert david mary william richard thomas daniel '
+        'jessica ashley christopher matthew joshua andrew charlie sarah emily anna '
+        'maria alex chris mike kevin brian jason justin ryan eric steven nicole '
+        'amanda melissa michelle lisa laura linda susan karen'
+    )
+}
+
+# Longer passwords are estimated from their first this many characters;
+# services analyse fewer (config.py), as the search grows with length
+MAX_ANALYSED_LENGTH = 100
+REQUEST_ANALYSED_LENGTH = 32
+
+L33T_TABLE = {
+    'a': ['4', '@'],
+    'b': ['8'],
+    'c': ['(', '{', '[', '<'],
+    'e': ['3'],
+    'g': ['6', '9'],
+    'i': ['1', '!', '|'],
+    'l': ['1', '|', '7'],
+    'o': ['0'],
+    's': ['$', '5'],
+    't': ['+', '7'],
+    'x': ['%'],
+    'z': ['2']
+}
+MAX_L33T_SUBS = 16
+
+# Keyboard layouts for the spatial matcher: each key lists its unshifted
+# and shifted character. Staggered rows are indented one key from the row above
+QWERTY_ROWS = [
+    ['`~', '1!', '2@', '3#', '4$', '5%', '6^', '7&', '8*', '9(', '0)', '-_', '=+'],
+    [None, 'qQ', 'wW', 'eE', 'rR', 'tT', 'yY', 'uU', 'iI', 'oO', 'pP', '[{', ']}', '\\|'],
+    [None, 'aA', 'sS', 'dD', 'fF', 'gG', 'hH', 'jJ', 'kK', 'lL', ';:', '\'"'],
+    [None, 'zZ', 'xX', 'cC', 'vV', 'bB', 'nN', 'mM', ',<', '.>', '/?']
+]
+KEYPAD_ROWS = [
+    [None, '/', '*', '-'],
+    ['7', '8', '9', '+'],
+    ['4', '5', '6'],
+    ['1', '2', '3'],
+    [None, '0', '.']
+]
+SHIFTED_CHARS = frozenset('~!@#$%^&*()_+QWERTYUIOP{}|ASDFGHJKL:"ZXCVBNM<>?')
+
+REFERENCE_YEAR = 2026
+MIN_YEAR_SPACE = 20
+DATE_MIN_YEAR = 1000
+DATE_MAX_YEAR = 2050
+DATE_SPLITS = {
+    4: [(1, 2), (2, 3)],
+    5: [(1, 3), (2, 3)],
+    6: [(1, 2), (2, 4), (4, 5)],
+    7: [(1, 3), (2, 3), (4, 5), (4, 6)],
+    8: [(2, 4), (4, 6)]
+}
+DATE_WITH_SEPARATOR = re.compile(r'^(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4})$')
+RECENT_YEAR = re.compile(r'19\d\d|20\d\d')
+REPEAT_GREEDY = re.compile(r'(.+)\1+', re.S)
+REPEAT_LAZY = re.compile(r'(.+?)\1+', re.S)
+REPEAT_LAZY_ANCHORED = re.compile(r'^(.+?)\1+$', re.S)
+
+MAX_SEQUENCE_DELTA = 5
+BRUTEFORCE_CARDINALITY = 10
+MIN_GUESSES_BEFORE_GROWING_SEQUENCE = 10000
+MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+# Longest match sequence searched: eight matches already cost over 10000 ** 7
+# (~2^93) guesses, far past 'Millions of years', and the bound keeps the
+# work per match constant. The per-count terms of the cost are tabulated
+MAX_SEQUENCE_MATCHES = 8
+SEQUENCE_FACTORIALS = [math.factorial(count) for count in range(MAX_SEQUENCE_MATCHES + 1)]
+SEQUENCE_GROWTH = [0] + [MIN_GUESSES_BEFORE_GROWING_SEQUENCE ** (count - 1)
+                         for count in range(1, MAX_SEQUENCE_MATCHES + 1)]
+
+
+@lru_cache(maxsize=None)
+def _ranked_dictionary():
+    """{word: (dictionary name, rank)} keeping each word's best rank, built on first use"""
+    merged = {}
+    for name, words in _RANKED_LISTS.items():
+        for rank, word in enumerate(words.split(), 1):
+            if word not in merged or rank < merged[word][1]:
+                merged[word] = (name, rank)
+    return merged
+
+
+@lru_cache(maxsize=None)
+def _dictionary_prefixes():
+    """Every prefix of a ranked dictionary word, so matching stops at dead ends"""
+    return frozenset(word[:end] for word in _ranked_dictionary() for end in range(1, len(word) + 1))
+
+
+def _build_graph(rows, slanted):
+    """Adjacency graph: char -> neighbouring keys in a fixed direction order"""
+    positions = {}
+    for y, row in enumerate(rows):
+        for x, key in enumerate(row):
+            if key is not None:
+                positions[(x, y)] = key
+
+    if slanted:
+        directions = [(-1, 0), (0, -1), (1, -1), (1, 0), (0, 1), (-1, 1)]
+    else:
+        directions = [(-1, 0), (-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1)]
+
+    graph = {}
+    for (x, y), key in positions.items():
+        neighbours = [positions.get((x + dx, y + dy)) for dx, dy in directions]
+        for char in key:
+            graph[char] = neighbours
+    return graph
+
+
+@lru_cache(maxsize=None)
+def _adjacency_graphs():
+    """{name: (graph, starting positions, average degree)}, built on first use"""
+    graphs = {}
+    for name, rows, slanted in (('qwerty', QWERTY_ROWS, True), ('keypad', KEYPAD_ROWS, False)):
+        graph = _build_graph(rows, slanted)
+        keys = {tuple(neighbours) for neighbours in graph.values()}
+        degree = sum(len([n for n in neighbours if n]) for neighbours in graph.values()) / len(graph)
+        graphs[name] = (graph, len(keys), degree)
+    return graphs
+
+
+def _n_choose_k(n, k):
+    if k > n:
+        return 0
+    return math.comb(n, k)
+
+
+class Match:
+    """One candidate pattern covering password[i:j + 1]"""
+
+    __slots__ = ('pattern', 'i', 'j', 'token', 'guesses', 'details')
+
+    def __init__(self, pattern, i, j, token, guesses, **details):
+        self.pattern = pattern
+        self.i = i
+        self.j = j
+        self.token = token
+        self.guesses = guesses
+        self.details = details
+
+    def as_dict(self):
+        return {'pattern': self.pattern, 'token': self.token, 'guesses': round(self.guesses), **self.details}
+
+
+class GuessEstimator:
+    """
+    zxcvbn-style guess estimator
+    Enumerates dictionary, reversed, l33t, spatial, repeat, sequence, date
+    and year matches, then finds the decomposition needing the fewest
+    guesses with a dynamic program over (end position, match count)
+
+    Dictionary matching stops at the first substring no word starts with,
+    repeat runs are searched as one token and sequences hold at most
+    MAX_SEQUENCE_MATCHES matches, so only bruteforce runs make the search
+    quadratic in length: about 0.2 ms for 'Tr0ub4dor&3', 0.75 ms for
+    'correcthorsebatterystaple' and at most ~4 ms at 32 characters (digit
+    strings, which read as a date at every offset). Only the first
+    max_length characters are analysed: MAX_ANALYSED_LENGTH like zxcvbn,
+    or REQUEST_ANALYSED_LENGTH in services, where clients choose this
+    estimator per request
+    """
+
+    def __init__(self, wordlist=None, max_length=MAX_ANALYSED_LENGTH):
+        # Optional WordlistIndex used as an extra ranked dictionary
+        self.wordlist = wordlist
+        self.max_length = max_length
+
+    def estimate(self, password):
+        """Return {'guesses', 'guesses_log2', 'sequence'} for a password"""
+        if not password:
+            return {'guesses': 1, 'guesses_log2': 0.0, 'sequence': []}
+
+        guesses, sequence = self._most_guessable(password[:self.max_length])
+        return {
+            'guesses': guesses,
+            'guesses_log2': math.log2(guesses),
+            'sequence': [match.as_dict() for match in sequence]
+        }
+
+    # ===== MATCHING =====
+
+    def _omnimatch(self, password):
+        matches = []
+        matches.extend(self._dictionary_matches(password))
+        matches.extend(self._reverse_dictionary_matches(password))
+        matches.extend(self._l33t_matches(password))
+        matches.extend(self._spatial_matches(password))
+        matches.extend(self._repeat_matches(password))
+        matches.extend(self._sequence_matches(password))
+        matches.extend(self._year_matches(password))
+        matches.extend(self._date_matches(password))
+        return matches
+
+    def _lookup(self, word):
+        """(dictionary name, rank) of the best-ranked entry for word, or None"""
+        best = _ranked_dictionary().get(word)
+        if self.wordlist is not None and len(word) > 2:
+            rank = self.wordlist.rank(word)
+            if rank is not None and (best is None or rank < best[1]):
+                best = ('wordlist', rank)
+        return best
+
+    def _has_prefix(self, prefix):
+        """Whether any dictionary word starts with prefix"""
+        if prefix in _dictionary_prefixes():
+            return True
+        return self.wordlist is not None and self.wordlist.has_prefix(prefix)
+
+    def _dictionary_matches(self, password, lowered=None):
+        lowered = password.lower() if lowered is None else lowered
+        if len(lowered) != len(password):
+            # Unicode case mapping changed the length; indices would not line up
+            return []
+
+        matches = []
+        length = len(password)
+        for i in range(length):
+            for j in range(i, length):
+                word = lowered[i:j + 1]
+                if not self._has_prefix(word):
+                    break
+                found = self._lookup(word)
+                if found is None:
+                    continue
+                token = password[i:j + 1]
+                guesses = found[1] * self._uppercase_variations(token)
+                matches.append(Match('dictionary', i, j, token, guesses,
+                                     matched_word=word, dictionary=found[0], rank=found[1]))
+        return matches
+
+    def _reverse_dictionary_matches(self, password):
+        reversed_password = password[::-1]
+        matches = []
+        for match in self._dictionary_matches(reversed_password):
+            length = len(password)
+            i, j = length - 1 - match.j, length - 1 - match.i
+            if j - i < 2:
+                continue
+            match.details['reversed'] = True
+            matches.append(Match('dictionary', i, j, password[i:j + 1], match.guesses * 2, **match.details))
+        return matches
+
+    def _l33t_subs(self, password):
+        """Candidate {l33t char: letter} substitutions for chars present in password"""
+        relevant = {}
+        for letter, subs in L33T_TABLE.items():
+            for sub in subs:
+                if sub in password:
+                    relevant.setdefault(sub, []).append(letter)
+
+        substitutions = [{}]
+        for sub, letters in relevant.items():
+            substitutions = [dict(existing, **{sub: letter}) for existing in substitutions for letter in letters]
+            if len(substitutions) > MAX_L33T_SUBS:
+                substitutions = substitutions[:MAX_L33T_SUBS]
+        return [sub for sub in substitutions if sub]
+
+    def _l33t_matches(self, password):
+        matches = []
+        seen = set()
+        for substitution in self._l33t_subs(password):
+            subbed = ''.join(substitution.get(char, char) for char in password)
+            for match in self._dictionary_matches(password, subbed.lower()):
+                used = {char: letter for char, letter in substitution.items() if char in match.token}
+                if not used or len(match.token) <= 1 or (match.i, match.j) in seen:
+                    continue
+                seen.add((match.i, match.j))
+                guesses = match.guesses * self._l33t_variations(match.token, used)
+                matches.append(Match('dictionary', match.i, match.j, match.token, guesses,
+                                     l33t=True, **match.details))
+        return matches
+
+    def _spatial_matches(self, password):
+        matches = []
+        for name, (graph, starts, degree) in _adjacency_graphs().items():
+            i = 0
+            length = len(password)
+            while i < length - 1:
+                j = i + 1
+                last_direction = None
+                turns = 0
+                shifted = 1 if name == 'qwerty' and password[i] in SHIFTED_CHARS else 0
+
+                while True:
+                    found = False
+                    neighbours = graph.get(password[j - 1], ())
+                    if j < length:
+                        for direction, key in enumerate(neighbours):
+                            if key and password[j] in key:
+                                found = True
+                                if key.index(password[j]) == 1:
+                                    shifted += 1
+                                if direction != last_direction:
+                                    turns += 1
+                                    last_direction = direction
+                                break
+                    if found:
+                        j += 1
+                        continue
+                    if j - i > 2:
+                        token = password[i:j]
+                        guesses = self._spatial_guesses(token, starts, degree, turns, shifted)
+                        matches.append(Match('spatial', i, j - 1, token, guesses,
+                                             graph=name, turns=turns))
+                    i = j
+                    break
+        return matches
+
+    def _repeat_matches(self, password):
+        matches = []
+        position = 0
+        while position < len(password):
+            greedy = REPEAT_GREEDY.search(password, position)
+            if greedy is None:
+                break
+            lazy = REPEAT_LAZY.search(password, position)
+
+            if len(greedy.group(0)) > len(lazy.group(0)):
+                match = greedy
+                base = REPEAT_LAZY_ANCHORED.match(match.group(0)).group(1)
+            else:
+                match = lazy
+                base = match.group(1)
+
+            base_guesses, _ = self._most_guessable(base)
+            repeat_count = len(match.group(0)) // len(base)
+            matches.append(Match('repeat', match.start(), match.end() - 1, match.group(0),
+                                 base_guesses * repeat_count, base_token=base, repeat_count=repeat_count))
+            position = match.end()
+        return matches
+
+    def _sequence_matches(self, password):
+        if len(password) == 1:
+            return []
+
+        matches = []
+
+        def update(i, j, delta):
+            if (j - i > 1 or abs(delta) == 1) and 0 < abs(delta) <= MAX_SEQUENCE_DELTA:
+                token = password[i:j + 1]
+                matches.append(Match('sequence', i, j, token, self._sequence_guesses(token, delta > 0),
+                                     ascending=delta > 0))
+
+        i = 0
+        last_delta = None
+        for k in range(1, len(password)):
+            delta = ord(password[k]) - ord(password[k - 1])
+            if last_delta is None:
+                last_delta = delta
+            if delta == last_delta:
+                continue
+            update(i, k - 1, last_delta)
+            i = k - 1
+            last_delta = delta
+        update(i, len(password) - 1, last_delta)
+        return matches
+
+    def _year_matches(self, password):
+        return [
+            Match('regex', found.start(), found.end() - 1, found.group(0),
+                  max(abs(int(found.group(0)) - REFERENCE_YEAR), MIN_YEAR_SPACE), regex_name='recent_year')
+            for found in RECENT_YEAR.finditer(password)
+        ]
+
+    def _date_matches(self, password):
+        matches = []
+        length = len(password)
+
+        # Digits only: try every day/month/year split (once per distinct
+        # token, so runs like '1' * 100 parse a handful of windows)
+        parsed = {}
+        for i in range(length - 3):
+            for j in range(i + 3, min(i + 8, length)):
+                token = password[i:j + 1]
+                if token not in parsed:
+                    parsed[token] = self._digit_date(token)
+                if parsed[token] is None:
+                    continue
+                year, month, day = parsed[token]
+                matches.append(Match('date', i, j, token, self._date_guesses(year, False),
+                                     year=year, month=month, day=day, separator=''))
+
+        # With separators: 1/1/91, 2024-05-17, ...
+        for i in range(length - 5):
+            for j in range(i + 5, min(i + 10, length)):
+                token = password[i:j + 1]
+                found = DATE_WITH_SEPARATOR.match(token)
+                if found is None or not token.isascii():
+                    continue
+                dmy = self._map_ints_to_dmy([int(found.group(1)), int(found.group(3)), int(found.group(4))])
+                if dmy is None:
+                    continue
+                year, month, day = dmy
+                matches.append(Match('date', i, j, token, self._date_guesses(year, True),
+                                     year=year, month=month, day=day, separator=found.group(2)))
+        return matches
+
+    def _digit_date(self, token):
+        """Closest-year (year, month, day) reading of a digit-only token, or None"""
+        if not token.isdigit() or not token.isascii():
+            return None
+        candidates = []
+        for k, l in DATE_SPLITS[len(token)]:
+            dmy = self._map_ints_to_dmy([int(token[:k]), int(token[k:l]), int(token[l:])])
+            if dmy is not None:
+                candidates.append(dmy)
+        if not candidates:
+            return None
+        return min(candidates, key=lambda dmy: abs(dmy[0] - REFERENCE_YEAR))
+
+    @staticmethod
+    def _map_ints_to_dm(ints):
+        for day, month in (ints, ints[::-1]):
+            if 1 <= day <= 31 and 1 <= month <= 12:
+                return day, month
+        return None
+
+    def _map_ints_to_dmy(self, ints):
+        if ints[1] > 31 or ints[1] <= 0:
+            return None
+
+        over_12 = over_31 = under_1 = 0
+        for value in ints:
+            if 99 < value < DATE_MIN_YEAR or value > DATE_MAX_YEAR:
+                return None
+            if value > 31:
+                over_31 += 1
+            if value > 12:
+                over_12 += 1
+            if value <= 0:
+                under_1 += 1
+        if over_31 >= 2 or over_12 == 3 or under_1 >= 2:
+            return None
+
+        splits = ((ints[2], ints[0:2]), (ints[0], ints[1:3]))
+        for year, rest in splits:
+            if DATE_MIN_YEAR <= year <= DATE_MAX_YEAR:
+                day_month = self._map_ints_to_dm(rest)
+                return (year, day_month[1], day_month[0]) if day_month else None
+
+        for year, rest in splits:
+            day_month = self._map_ints_to_dm(rest)
+            if day_month:
+                if year <= 99:
+                    year += 1900 if year > 50 else 2000
+                return year, day_month[1], day_month[0]
+        return None
+
+    # ===== GUESS ESTIMATES =====
+
+    @staticmethod
+    def _uppercase_variations(token):
+        if token.lower() == token:
+            return 1
+        upper = sum(1 for char in token if char.isupper())
+        lower = sum(1 for char in token if char.islower())
+        if lower == 0 or (upper == 1 and (token[0].isupper() or token[-1].isupper())):
+            return 2
+        return sum(_n_choose_k(upper + lower, k) for k in range(1, min(upper, lower) + 1))
+
+    @staticmethod
+    def _l33t_variations(token, substitution):
+        variations = 1
+        lowered = token.lower()
+        for subbed, unsubbed in substitution.items():
+            s = lowered.count(subbed)
+            u = lowered.count(unsubbed)
+            if s == 0 or u == 0:
+                variations *= 2
+            else:
+                variations *= sum(_n_choose_k(s + u, k) for k in range(1, min(s, u) + 1))
+        return variations
+
+    @staticmethod
+    def _spatial_guesses(token, starts, degree, turns, shifted):
+        guesses = 0
+        length = len(token)
+        for i in range(2, length + 1):
+            for j in range(1, min(turns, i - 1) + 1):
+                guesses += _n_choose_k(i - 1, j - 1) * starts * degree ** j
+
+        if shifted:
+            unshifted = length - shifted
+            if unshifted == 0:
+                guesses *= 2
+            else:
+                guesses *= sum(_n_choose_k(shifted + unshifted, k) for k in range(1, min(shifted, unshifted) + 1))
+        return guesses
+
+    @staticmethod
+    def _sequence_guesses(token, ascending):
+        first = token[0]
+        if first in 'aAzZ019':
+            base = 4
+        elif first.isdigit():
+            base = 10
+        else:
+            base = 26
+        if not ascending:
+            base *= 2
+        return base * len(token)
+
+    @staticmethod
+    def _date_guesses(year, has_separator):
+        guesses = max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE) * 365
+        return guesses * 4 if has_separator else guesses
+
+    # ===== SEARCH =====
+
+    def _most_guessable(self, password):
+        """Minimum-guesses match sequence via DP over (end index, sequence length)"""
+        length = len(password)
+        matches_by_end = [[] for _ in range(length)]
+        for match in self._omnimatch(password):
+            matches_by_end[match.j].append(match)
+
+        # best[k][l]: (guesses, product of guesses, start, last match) for
+        # sequences of l matches covering password[:k + 1]; a last match of
+        # None is a bruteforce run from start, built only when unwound
+        best = [{} for _ in range(length)]
+        # Match counts at each position a bruteforce run may follow (the
+        # sequence ends in a real match), filled in once the position is done
+        followable = [()] * length
+
+        def bounded(i, j, guesses):
+            """Single-match guesses, floored so submatches can't be near-free"""
+            if j - i + 1 == length:
+                floor = 1
+            elif i == j:
+                floor = MIN_SUBMATCH_GUESSES_SINGLE_CHAR
+            else:
+                floor = MIN_SUBMATCH_GUESSES_MULTI_CHAR
+            return max(guesses, floor)
+
+        def update(i, k, bound, count, match):
+            """Offer password[i:k + 1] (bounded guesses) as the count-th match of a sequence"""
+            if count > MAX_SEQUENCE_MATCHES:
+                return
+            product = bound
+            if count > 1:
+                product *= best[i - 1][count - 1][1]
+            guesses = SEQUENCE_FACTORIALS[count] * product + SEQUENCE_GROWTH[count]
+
+            for other_count, (other_guesses, _, _, _) in best[k].items():
+                if other_count <= count and other_guesses <= guesses:
+                    return
+            best[k][count] = (guesses, product, i, match)
+
+        # Repeat runs are collapsed: sequences only split a run where a match
+        # crosses its edge, so it is otherwise priced whole (as the repeat
+        # match) and 'ab' * 50 costs about as much to search as 'ab'
+        run_of = [None] * length
+        for matches in matches_by_end:
+            for match in matches:
+                if match.pattern == 'repeat':
+                    run_of[match.i:match.j] = [match] * (match.j - match.i)
+        collapsed = [run is not None for run in run_of]
+        for matches in matches_by_end:
+            for match in matches:
+                run = run_of[match.j]
+                if run is not None and match.i < run.i:
+                    collapsed[match.j] = False
+                run = run_of[match.i - 1] if match.i > 0 else None
+                if run is not None and match.j > run.j:
+                    collapsed[match.i - 1] = False
+
+        for k in range(length):
+            if collapsed[k]:
+                continue
+            for match in matches_by_end[k]:
+                bound = bounded(match.i, k, match.guesses)
+                if match.i > 0:
+                    for count in list(best[match.i - 1]):
+                        update(match.i, k, bound, count + 1, match)
+                else:
+                    update(0, k, bound, 1, match)
+
+            # Bruteforce runs start the password or follow a real match
+            update(0, k, bounded(0, k, BRUTEFORCE_CARDINALITY ** (k + 1)), 1, None)
+            for i in range(1, k + 1):
+                if followable[i - 1]:
+                    bound = bounded(i, k, BRUTEFORCE_CARDINALITY ** (k - i + 1))
+                    for count in followable[i - 1]:
+                        update(i, k, bound, count + 1, None)
+
+            followable[k] = [count for count, (_, _, _, last) in best[k].items() if last is not None]
+
+        # Unwind the cheapest sequence ending at the last character
+        count, (guesses, _, _, _) = min(best[length - 1].items(), key=lambda item: item[1][0])
+        sequence = []
+        k = length - 1
+        while k >= 0:
+            _, _, i, match = best[k][count]
+            if match is None:
+                token = password[i:k + 1]
+                match = Match('bruteforce', i, k, token, BRUTEFORCE_CARDINALITY ** len(token))
+            sequence.append(match)
+            k = i - 1
+            count -= 1
+        sequence.reverse()
+
+        return guesses, sequence
@@ -0,0 +1,274 @@
+"""
+Breach audit for files of password hashes (directory exports, hash dumps)
+
+    python hash_audit.py hashes.txt --breach-index pwned.idx -o findings.jsonl
+    python hash_audit.py ntds.txt --hash-type ntlm --only-breached -f csv
+    python hash_audit.py ntds.txt --hash-type ntlm --api-url http://127.0.0.1:8900/range/
+
+Lines are a bare hex hash, 'label:hash', or pwdump/secretsdump
+'user:rid:lmhash:nthash:::' (the NT hash is audited). Hashes are grouped
+by 5-char prefix so every range is read or fetched once for the whole
+input, then joined against it in sorted order. Input up to one window is
+grouped in memory; anything longer is spilled to temporary files bucketed
+by the first two hex digits, each bucket audited in turn and the results
+merged back into input order. Memory is bounded by the window (or one
+bucket) and the ranges in flight, never by the input size. No plaintexts
+are involved
+"""
+import argparse
+import heapq
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+from string import hexdigits
+
+from audit import RowWriter
+from breach_checker import HASH_TYPES, BreachChecker, UpstreamError
+from breach_index import LocalBreachIndex
+
+CSV_FIELDS = ['line', 'label', 'hash', 'breached', 'count', 'error']
+
+HASH_NAMES = {'sha1': 'SHA-1', 'ntlm': 'NTLM'}
+
+# Inputs longer than a window are spilled to one file per leading byte of
+# the hash (each holding whole prefixes), plus one for malformed lines
+SPILL_BUCKETS = 256
+
+
+def parse_hash_line(line, hash_type='sha1'):
+    """(label, upper-case hex hash or None if malformed), or None for blank and comment lines"""
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+
+    fields = line.split(':')
+    if hash_type == 'ntlm' and len(fields) >= 4 and len(fields[3]) == HASH_TYPES['ntlm']:
+        # pwdump: user:rid:lmhash:nthash:::
+        label, value = fields[0], fields[3]
+    else:
+        label, value = ':'.join(fields[:-1]) or None, fields[-1]
+
+    value = value.strip().upper()
+    if len(value) != HASH_TYPES[hash_type] or value.strip(hexdigits):
+        return label, None
+    return label, value
+
+
+def read_hash_records(stream, hash_type='sha1'):
+    """Yield (line number, label, hash or None) from a binary line stream"""
+    for line_number, raw_line in enumerate(stream, 1):
+        parsed = parse_hash_line(raw_line.decode('utf-8', 'replace'), hash_type)
+        if parsed is not None:
+            yield (line_number,) + parsed
+
+
+def index_lookup(index):
+    """Lookup against a LocalBreachIndex (SHA-1): a merge-join per prefix"""
+    def lookup(prefix, suffixes):
+        return index.lookup_digests([bytes.fromhex(prefix + suffix) for suffix in suffixes])
+
+    return lookup
+
+
+def range_lookup(breach_checker, hash_type='sha1'):
+    """Lookup through BreachChecker.lookup_range (cached ranges, then the API)"""
+    def lookup(prefix, suffixes):
+        counts = breach_checker.lookup_range(prefix, hash_type)
+        return [counts.get(suffix, 0) for suffix in suffixes]
+
+    return lookup
+
+
+class HashAudit:
+    """
+    Breach counts for a stream of (line, label, hash) records
+    lookup(prefix, ascending suffixes) returns their counts. Records are
+    grouped by prefix, so each prefix is looked up once: in memory for up
+    to window records, otherwise through SPILL_BUCKETS files in spill_dir
+    (default: the system temp directory). Up to max_in_flight lookups run
+    concurrently (worth raising for network lookups, not for a local index)
+    """
+
+    def __init__(self, lookup, hash_type='sha1', window=50000, max_in_flight=1, spill_dir=None):
+        self.lookup = lookup
+        self.hash_type = hash_type
+        self.window = window
+        self.max_in_flight = max_in_flight
+        self.spill_dir = spill_dir
+
+        self.hashes = 0
+        self.breached = 0
+        self.errors = 0
+        self.ranges = 0
+
+    def run(self, records):
+        """Yield one output row per record, in input order"""
+        pool = ThreadPoolExecutor(self.max_in_flight) if self.max_in_flight > 1 else None
+        try:
+            records = iter(records)
+            batch = list(islice(records, self.window + 1))
+            if len(batch) <= self.window:
+                yield from self._audit_window(batch, pool)
+            else:
+                yield from self._audit_spilled(chain(batch, records), pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def _audit_spilled(self, records, pool):
+        """Rows for any number of records, bucketed on disk by leading byte"""
+        with tempfile.TemporaryDirectory(prefix='hash-audit-', dir=self.spill_dir) as directory:
+            buckets = [open(os.path.join(directory, f'bucket-{number}.jsonl'), 'w+', encoding='utf-8')
+                       for number in range(SPILL_BUCKETS + 1)]
+            results = []
+            try:
+                for record in records:
+                    value = record[2]
+                    number = SPILL_BUCKETS if value is None else int(value[:2], 16)
+                    buckets[number].write(json.dumps(record) + '\n')
+
+                # Buckets hold records in input order, so each one's rows come
+                # out sorted by line and merge back into input order
+                for number, bucket in enumerate(buckets):
+                    bucket.seek(0)
+                    batch = [tuple(json.loads(line)) for line in bucket]
+                    bucket.close()
+                    result = open(os.path.join(directory, f'rows-{number}.jsonl'), 'w+', encoding='utf-8')
+                    results.append(result)
+                    result.writelines(json.dumps(row) + '\n' for row in self._audit_window(batch, pool))
+                    result.seek(0)
+
+                yield from heapq.merge(*(map(json.loads, result) for result in results),
+                                       key=lambda row: row['line'])
+            finally:
+                for spilled in buckets + results:
+                    spilled.close()
+
+    def _audit_window(self, batch, pool):
+        by_prefix = {}
+        for position, (_, _, value) in enumerate(batch):
+            if value is not None:
+                by_prefix.setdefault(value[:5], []).append((value[5:], position))
+
+        counts = [None] * len(batch)
+        for wanted, result in self._lookup_all(by_prefix, pool):
+            self.ranges += 1
+            if isinstance(result, Exception):
+                result = [result] * len(wanted)
+            for (_, position), count in zip(wanted, result):
+                counts[position] = count
+
+        rows = []
+        for (line, label, value), count in zip(batch, counts):
+            row = {'line': line}
+            if label is not None:
+                row['label'] = label
+            if value is None:
+                row['error'] = f'Not a {HASH_NAMES[self.hash_type]} hash'
+                self.errors += 1
+            elif isinstance(count, Exception):
+                row['hash'] = value
+                row['error'] = _describe_error(count)
+                self.errors += 1
+            else:
+                row['hash'] = value
+                row['breached'] = count > 0
+                row['count'] = count
+                self.hashes += 1
+                self.breached += count > 0
+            rows.append(row)
+        return rows
+
+    def _lookup_all(self, by_prefix, pool):
+        """Yield (sorted [(suffix, position)], counts or the exception) for each prefix"""
+        jobs = ((prefix, sorted(wanted)) for prefix, wanted in by_prefix.items())
+        if pool is None:
+            for prefix, wanted in jobs:
+                yield wanted, self._lookup(prefix, wanted)
+            return
+
+        pending = deque()
+        for prefix, wanted in jobs:
+            pending.append((wanted, pool.submit(self._lookup, prefix, wanted)))
+            if len(pending) >= self.max_in_flight:
+                wanted, future = pending.popleft()
+                yield wanted, future.result()
+        while pending:
+            wanted, future = pending.popleft()
+            yield wanted, future.result()
+
+    def _lookup(self, prefix, wanted):
+        try:
+            return self.lookup(prefix, [suffix for suffix, _ in wanted])
+        except (UpstreamError, OSError) as e:
+            return e
+
+
+def _describe_error(error):
+    if isinstance(error, TimeoutError):
+        return 'Request timeout'
+    if isinstance(error, ConnectionError):
+        return 'Connection error'
+    return str(error)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Audit a file of SHA-1 or NTLM password hashes for breaches')
+    parser.add_argument('input', nargs='?', default='-', help='hash file (default: stdin)')
+    parser.add_argument('-o', '--output', default='-', help='output file (default: stdout)')
+    parser.add_argument('-f', '--format', choices=['jsonl', 'csv'], default='jsonl')
+    parser.add_argument('--hash-type', choices=sorted(HASH_TYPES), default='sha1')
+    parser.add_argument('--breach-index', help='local breach index built by breach_index.py (SHA-1)')
+    parser.add_argument('--api-url', help='range API base URL (default: the public service)')
+    parser.add_argument('--cache-size', type=int, default=4096, help='range responses kept in memory')
+    parser.add_argument('--cache-dir', help='on-disk range cache, reused across runs')
+    parser.add_argument('--window', type=int, default=50000,
+                        help='hashes grouped in memory; longer inputs are bucketed in temporary files')
+    parser.add_argument('--temp-dir', help='where longer inputs are bucketed (default: system temp)')
+    parser.add_argument('--concurrency', type=int, default=16, help='parallel range API requests')
+    parser.add_argument('--only-breached', action='store_true', help='only output breached hashes and errors')
+    parser.add_argument('--quiet', action='store_true', help='no summary on stderr')
+    args = parser.parse_args(argv)
+
+    if args.breach_index and args.hash_type != 'sha1':
+        parser.error('breach indexes hold SHA-1 hashes; audit NTLM hashes against the range API')
+
+    if args.breach_index:
+        index = LocalBreachIndex(args.breach_index)
+        audit = HashAudit(index_lookup(index), args.hash_type, args.window, spill_dir=args.temp_dir)
+    else:
+        index = None
+        checker = BreachChecker(cache_size=args.cache_size, cache_dir=args.cache_dir, api_url=args.api_url)
+        audit = HashAudit(range_lookup(checker, args.hash_type), args.hash_type, args.window, args.concurrency,
+                          spill_dir=args.temp_dir)
+
+    source = sys.stdin.buffer if args.input == '-' else open(args.input, 'rb')
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    started = time.monotonic()
+
+    try:
+        writer = RowWriter(sink, args.format, CSV_FIELDS)
+        for row in audit.run(read_hash_records(source, args.hash_type)):
+            if not args.only_breached or row.get('breached') or 'error' in row:
+                writer.write([row])
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+        if index is not None:
+            index.close()
+
+    if not args.quiet:
+        elapsed = time.monotonic() - started
+        print(f"✓ Audited {audit.hashes:,} hashes in {elapsed:.1f}s: {audit.breached:,} breached, "
+              f"{audit.errors:,} errors, {audit.ranges:,} range lookups", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""
+Minimal Prometheus-style metrics (text exposition format 0.0.4)
+
+Counters and histograms are plain locked arrays, cheap enough to update
+on every request; cache stats are read only when /metrics is scraped
+"""
+import bisect
+import threading
+import time
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Latency buckets in seconds (from sub-microsecond detector stages up to slow upstream calls)
+LATENCY_BUCKETS = (0.000001, 0.000005, 0.00001, 0.00005, 0.0001, 0.0005, 0.001,
+                   0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.exposed_name = f'{name}_total'
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        (REGISTRY if registry is None else registry).register(self)
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues):
+        return self._values.get(labelvalues, 0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for labelvalues, value in items:
+            yield self.exposed_name, _format_labels(self.labelnames, labelvalues), value
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS, registry=None):
+        self.name = self.exposed_name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # labelvalues -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+        (REGISTRY if registry is None else registry).register(self)
+
+    def observe(self, value, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def time(self, *labelvalues):
+        """Context manager observing the duration of a block"""
+        return _Timer(self, labelvalues)
+
+    def count(self, *labelvalues):
+        series = self._series.get(labelvalues)
+        return sum(series[:-1]) if series else 0
+
+    def totals(self):
+        """(observations, sum of values) across every label set"""
+        with self._lock:
+            return (sum(sum(series[:-1]) for series in self._series.values()),
+                    sum(series[-1] for series in self._series.values()))
+
+    def samples(self):
+        with self._lock:
+            items = [(labelvalues, list(series)) for labelvalues, series in self._series.items()]
+        for labelvalues, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series):
+                cumulative += count
+                labels = _format_labels(self.labelnames, labelvalues, [('le', _format_value(bound))])
+                yield f'{self.name}_bucket', labels, cumulative
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f'{self.name}_sum', labels, series[-1]
+            yield f'{self.name}_count', labels, cumulative
+
+
+class _Timer:
+    __slots__ = ('histogram', 'labelvalues', 'started')
+
+    def __init__(self, histogram, labelvalues):
+        self.histogram = histogram
+        self.labelvalues = labelvalues
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labelvalues)
+
+
+class StageTimer:
+    """Records the time between successive mark() calls as stages of one operation"""
+
+    __slots__ = ('histogram', 'last')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.last = time.perf_counter()
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.histogram.observe(now - self.last, stage)
+        self.last = now
+
+
+class _NullTimer:
+    """StageTimer stand-in for calls that aren't sampled"""
+
+    __slots__ = ()
+
+    def mark(self, stage):
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+class Registry:
+    """Metrics plus collector callbacks rendered together on scrape"""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+
+    def register_collector(self, key, collector):
+        """
+        collector() yields (name, kind, documentation, [(labels dict, value)]) tuples
+        Registering again under the same key replaces the earlier collector
+        """
+        with self._lock:
+            self._collectors[key] = collector
+
+    def render(self):
+        """Everything in Prometheus text format"""
+        lines = []
+        for metric in list(self._metrics):
+            lines.append(f'# HELP {metric.exposed_name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.exposed_name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {_format_value(value)}')
+
+        for collector in list(self._collectors.values()):
+            for name, kind, documentation, samples in collector():
+                lines.append(f'# HELP {name} {documentation}')
+                lines.append(f'# TYPE {name} {kind}')
+                for labels, value in samples:
+                    label_text = _format_labels(list(labels), list(labels.values()))
+                    lines.append(f'{name}{label_text} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+def cache_collector(caches):
+    """
+    Collector for objects with a stats() dict (RangeCache, ResultCache)
+    caches maps a label to the cache, or to None when that cache is off
+    """
+    fields = [
+        ('cache_entries', 'gauge', 'Entries currently cached', 'entries'),
+        ('cache_hits_total', 'counter', 'Lookups answered from memory', 'hits'),
+        ('cache_disk_hits_total', 'counter', 'Lookups answered from the disk tier', 'disk_hits'),
+        ('cache_misses_total', 'counter', 'Lookups that missed', 'misses'),
+        ('cache_evictions_total', 'counter', 'Entries evicted to stay within size', 'evictions'),
+        ('cache_disk_evictions_total', 'counter', 'Disk tier files deleted (expired or over size)', 'disk_evictions'),
+        ('cache_hit_ratio', 'gauge', 'Hits (memory and disk) per lookup', 'hit_rate')
+    ]
+
+    def collect():
+        stats = {name: cache.stats() for name, cache in caches.items() if cache is not None}
+        for metric, kind, documentation, field in fields:
+            samples = [({'cache': name}, values[field]) for name, values in stats.items() if field in values]
+            if samples:
+                yield metric, kind, documentation, samples
+
+    return collect
+
+
+# Process-wide registry and the metrics the API records into
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route', ['route', 'method', 'status'])
+STRENGTH_STAGE_SECONDS = Histogram(
+    'strength_stage_duration_seconds', 'Sampled check_strength time per stage', ['stage'])
+BREACH_UPSTREAM_SECONDS = Histogram(
+    'breach_upstream_duration_seconds', 'Range API request latency by status code', ['status'])
+BREACH_UPSTREAM_ERRORS = Counter(
+    'breach_upstream_errors', 'Range API requests that failed without a response', ['kind'])
+HTTP_REQUESTS_REJECTED = Counter(
+    'http_requests_rejected', 'Requests answered 429 by admission control', ['reason'])
@@ -0,0 +1,184 @@
+import argparse
+import mmap
+import struct
+import sys
+import threading
+from array import array
+
+# Packed file layout:
+#   header   MAGIC, version, word count, data size
+#   offsets  (count + 1) little-endian uint32 offsets into data
+#   data     UTF-8 words, concatenated in list order
+MAGIC = b'PWDICE01'
+VERSION = 1
+HEADER = struct.Struct('<8sIII')
+OFFSET = struct.Struct('<I')
+
+# Built-in list used when no other list is configured
+DEFAULT_WORDS = [
+    'rainbow', 'mountain', 'sunset', 'ocean', 'forest', 'thunder',
+    'crystal', 'shadow', 'phoenix', 'dragon', 'wizard', 'castle',
+    'knight', 'legend', 'mystic', 'storm', 'silver', 'golden',
+    'tiger', 'eagle', 'wolf', 'bear', 'lion', 'hawk',
+    'river', 'valley', 'meadow', 'glacier', 'volcano', 'canyon',
+    'anchor', 'compass', 'journey', 'voyage', 'atlas', 'cosmos',
+    'nebula', 'quantum', 'prism', 'eclipse', 'zenith', 'aurora'
+]
+
+
+def read_words(lines):
+    """
+    Words from a wordlist file, one per line
+    EFF/diceware lines ('11111<TAB>abacus') keep only the word; duplicates are dropped
+    """
+    seen = set()
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        parts = line.split()
+        if not parts:
+            continue
+        word = parts[-1]
+        if word not in seen:
+            seen.add(word)
+            yield word
+
+
+def pack_words(words):
+    """(offsets array, data bytes) for a list of words"""
+    offsets = array('I', [0])
+    data = bytearray()
+    for word in words:
+        data += word.encode('utf-8')
+        offsets.append(len(data))
+    return offsets, bytes(data)
+
+
+def write_packed(words, output_path):
+    """Write words to a packed, mmap-able wordlist file; returns the word count"""
+    offsets, data = pack_words(words)
+    count = len(offsets) - 1
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+
+    with open(output_path, 'wb') as output:
+        output.write(HEADER.pack(MAGIC, VERSION, count, len(data)))
+        output.write(offsets.tobytes())
+        output.write(data)
+    return count
+
+
+class PassphraseWordlist:
+    """
+    Indexed word array for passphrase generation
+    Words are stored as one UTF-8 blob plus an offset array, either in
+    memory (text lists) or memory-mapped (packed files), so even large
+    lists cost a few bytes per word and no per-word Python objects
+    """
+
+    def __init__(self, offsets, data):
+        self._offsets = offsets
+        self._data = data
+        self._count = len(offsets) - 1
+
+    @classmethod
+    def from_words(cls, words):
+        return cls(*pack_words(words))
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a text list (one word per line, EFF format accepted) or a packed file"""
+        with open(path, 'rb') as source:
+            if source.read(len(MAGIC)) == MAGIC:
+                return cls._from_packed(source)
+            source.seek(0)
+            return cls.from_words(list(read_words(source)))
+
+    @classmethod
+    def _from_packed(cls, source):
+        mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) < HEADER.size:
+            raise ValueError('Truncated passphrase wordlist file')
+        _, version, count, data_size = HEADER.unpack_from(mapped, 0)
+        data_at = HEADER.size + (count + 1) * OFFSET.size
+        if version != VERSION or len(mapped) < data_at + data_size:
+            raise ValueError('Unsupported or truncated passphrase wordlist file')
+
+        offsets = memoryview(mapped)[HEADER.size:data_at]
+        offsets = offsets.cast('I') if sys.byteorder == 'little' else array('I', bytes(offsets))
+        return cls(offsets, memoryview(mapped)[data_at:data_at + data_size])
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self._count:
+            raise IndexError('wordlist index out of range')
+        return bytes(self._data[self._offsets[index]:self._offsets[index + 1]]).decode('utf-8')
+
+
+class WordlistRegistry:
+    """
+    Named passphrase wordlists, each loaded on first use and then shared
+    Register a path (text or packed) or a ready PassphraseWordlist
+    """
+
+    def __init__(self, sources=None):
+        self._sources = {'default': DEFAULT_WORDS}
+        self._loaded = {}
+        self._lock = threading.Lock()
+        for name, source in (sources or {}).items():
+            self.register(name, source)
+
+    def register(self, name, source):
+        with self._lock:
+            self._sources[name] = source
+            self._loaded.pop(name, None)
+
+    def names(self):
+        return sorted(self._sources)
+
+    def get(self, name='default'):
+        """The named wordlist, loading it if needed; raises KeyError if unknown"""
+        wordlist = self._loaded.get(name)
+        if wordlist is not None:
+            return wordlist
+
+        with self._lock:
+            if name not in self._loaded:
+                if name not in self._sources:
+                    raise KeyError(f'Unknown wordlist: {name}')
+                source = self._sources[name]
+                if isinstance(source, PassphraseWordlist):
+                    wordlist = source
+                elif isinstance(source, (list, tuple)):
+                    wordlist = PassphraseWordlist.from_words(source)
+                else:
+                    wordlist = PassphraseWordlist.from_file(source)
+                self._loaded[name] = wordlist
+            return self._loaded[name]
+
+
+def parse_wordlist_config(value):
+    """Parse 'name=path,name2=path2' (e.g. from an environment variable)"""
+    sources = {}
+    for item in (value or '').split(','):
+        name, separator, path = item.partition('=')
+        if separator and name.strip() and path.strip():
+            sources[name.strip()] = path.strip()
+    return sources
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pack a passphrase wordlist (e.g. the EFF large list) for mmap loading')
+    parser.add_argument('wordlist', help='text wordlist, one word per line (EFF dice-number format accepted)')
+    parser.add_argument('output', help='packed file to write')
+    args = parser.parse_args(argv)
+
+    with open(args.wordlist, 'rb') as source:
+        count = write_packed(list(read_words(source)), args.output)
+    print(f"✓ Packed {count:,} words into {args.output}")
+
+
+if __name__ == '__main__':
+    main()
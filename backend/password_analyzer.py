@@ -0,0 +1,176 @@
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+
+def _pending_breach_result():
+    return {
+        'checked': False,
+        'pending': True,
+        'error': 'Breach check is taking longer than usual. Please try again.'
+    }
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+class PasswordAnalyzer:
+    """
+    Strength and breach checks for one password in a single call
+    Hashes the password once and runs the breach lookup while the strength
+    check runs. With breach_budget (seconds) set, a slow breach lookup is
+    left running in the background and the strength result is returned
+    on time, marked 'complete': False. At most max_pending sync lookups
+    are queued or running at once (a password already being looked up
+    shares that lookup); past that, analyze doesn't queue another and,
+    with a budget, answers the breach stage as pending straight away
+    """
+
+    def __init__(self, password_checker, breach_checker, breach_budget=None, max_workers=32, max_pending=256):
+        self.password_checker = password_checker
+        self.breach_checker = breach_checker
+        self.breach_budget = breach_budget
+        self.max_pending = max_pending
+        self._executor = None  # created on first sync call
+        self._max_workers = max_workers
+        self._pending = {}  # digest (or password) -> Future of a queued or running lookup
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='analyze-breach')
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    @staticmethod
+    def _hash(password):
+        """SHA-1 digest shared by every stage (None when there is nothing to look up)"""
+        if not password:
+            return None
+        try:
+            return hashlib.sha1(password.encode('utf-8')).digest()
+        except UnicodeEncodeError:
+            return None
+
+    def _timed_breach(self, password, sha1_digest):
+        started = time.perf_counter()
+        if sha1_digest is None:
+            result = self.breach_checker.check_breach(password)
+        else:
+            result = self.breach_checker.check_breach_digest(sha1_digest)
+        return result, _elapsed_ms(started)
+
+    def _submit_breach(self, password, sha1_digest):
+        """
+        Future of the breach lookup, shared with one already pending for the
+        same password; None when max_pending lookups are already pending
+        """
+        key = password if sha1_digest is None else sha1_digest
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            if len(self._pending) >= self.max_pending:
+                return None
+            future = self._get_executor().submit(self._timed_breach, password, sha1_digest)
+            self._pending[key] = future
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def analyze(self, password, estimator=None, breach_budget=None):
+        """
+        Merged {'strength', 'breach', 'complete', 'timings_ms'} result
+        Timings are per stage in milliseconds; 'breach' is None in the
+        timings when the lookup missed its budget
+        """
+        budget = self.breach_budget if breach_budget is None else breach_budget
+        started = time.perf_counter()
+
+        sha1_digest = self._hash(password)
+        hash_ms = _elapsed_ms(started)
+
+        breach_future = self._submit_breach(password, sha1_digest)
+
+        strength_started = time.perf_counter()
+        strength = self.password_checker.check_strength(password, estimator=estimator)
+        strength_ms = _elapsed_ms(strength_started)
+
+        remaining = None if budget is None else max(0.0, budget - (time.perf_counter() - started))
+        if breach_future is None:
+            # Queue full: without a budget the caller waits anyway, so look up inline
+            if budget is None:
+                breach, breach_ms = self._timed_breach(password, sha1_digest)
+            else:
+                breach, breach_ms = _pending_breach_result(), None
+        else:
+            try:
+                breach, breach_ms = breach_future.result(timeout=remaining)
+            except FutureTimeoutError:
+                breach, breach_ms = _pending_breach_result(), None
+
+        return self._merge(strength, breach, hash_ms, strength_ms, breach_ms, started)
+
+    async def analyze_async(self, password, estimator=None, breach_budget=None, check_strength=None):
+        """
+        analyze for asyncio callers; breach_checker must be an AsyncBreachClient
+        check_strength is an optional coroutine function (password, estimator)
+        used to run the strength check off the event loop
+        """
+        import asyncio  # already loaded under an event loop; sync callers never pay for it
+        budget = self.breach_budget if breach_budget is None else breach_budget
+        started = time.perf_counter()
+
+        sha1_digest = self._hash(password)
+        hash_ms = _elapsed_ms(started)
+
+        async def timed_breach():
+            breach_started = time.perf_counter()
+            if sha1_digest is None:
+                result = await self.breach_checker.check_breach_async(password)
+            else:
+                result = await self.breach_checker.check_breach_digest_async(sha1_digest)
+            return result, _elapsed_ms(breach_started)
+
+        breach_task = asyncio.ensure_future(timed_breach())
+
+        strength_started = time.perf_counter()
+        if check_strength is None:
+            loop = asyncio.get_running_loop()
+            strength = await loop.run_in_executor(None, self.password_checker.check_strength, password, estimator)
+        else:
+            strength = await check_strength(password, estimator)
+        strength_ms = _elapsed_ms(strength_started)
+
+        remaining = None if budget is None else max(0.0, budget - (time.perf_counter() - started))
+        try:
+            # Shield so a missed budget leaves the lookup running (it warms the range cache)
+            breach, breach_ms = await asyncio.wait_for(asyncio.shield(breach_task), remaining)
+        except asyncio.TimeoutError:
+            breach, breach_ms = _pending_breach_result(), None
+
+        return self._merge(strength, breach, hash_ms, strength_ms, breach_ms, started)
+
+    @staticmethod
+    def _merge(strength, breach, hash_ms, strength_ms, breach_ms, started):
+        return {
+            'strength': strength,
+            'breach': breach,
+            'complete': breach_ms is not None,
+            'timings_ms': {
+                'hash': hash_ms,
+                'strength': strength_ms,
+                'breach': breach_ms,
+                'total': _elapsed_ms(started)
+            }
+        }
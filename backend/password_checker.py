@@ -1,93 +1,233 @@
 import re
-import math
 from collections import Counter
+from pattern_scanner import (
+    LOWER, UPPER, DIGIT, SPECIAL, NON_ALNUM,
+    COMMON_PATTERN, KEYBOARD_PATTERN, BANNED_WORD
+)
+from policy import PasswordPolicy, PolicyRegistry
+from result_cache import ResultCache, copy_result, redact_result, restore_result
+from metrics import NULL_TIMER, STRENGTH_STAGE_SECONDS, StageTimer
+from strength_rules import (
+    CLASS_DESCRIPTIONS, COMMON_PASSWORDS, COMMON_PATTERNS, CRACK_TIME_UNITS, EXCELLENT_SCORE, FEEDBACK,
+    GOOD_SCORE, GUESSES_PER_SECOND, KEYBOARD_PATTERNS, MAX_YEARS, POOL_BITS, POOL_SIZES, SEQUENCES,
+    STRENGTH_LEVELS, YEAR_SECONDS
+)
+
+LOWER_RE = re.compile(r'[a-z]')
+UPPER_RE = re.compile(r'[A-Z]')
+DIGIT_RE = re.compile(r'\d')
+SPECIAL_RE = re.compile(r'[!@#$%^&*()_+\-=\[\]{};:\'",.<>?/\\|`~]')
+NON_ALNUM_RE = re.compile(r'[^a-zA-Z0-9]')
+REPETITION_RE = re.compile(r'(.)\1{2,}')
+
+# 'entropy': length x log2(character pool); 'guesses': zxcvbn-style match search
+ESTIMATORS = ('entropy', 'guesses')
 
 class PasswordChecker:
     """
     A comprehensive password strength checker
+    Pass wordlist (a WordlistIndex or path built by wordlist_index.py) to
+    check against a full common-password list; results then include the
+    matched word's 'common_rank' and 'common_source' ('wordlist', or
+    'builtin' for a password only on the built-in list). estimator='guesses' rates crack time by
+    the cheapest decomposition into dictionary, keyboard, date, repeat and
+    sequence matches instead of raw character-pool entropy.
+    cache_size > 0 turns on a result cache keyed by per-process HMAC.
+    stage_sample_every=N times the stages of every Nth check into
+    metrics.STRENGTH_STAGE_SECONDS. policies ({id: settings}, see policy.py)
+    registers per-tenant scoring policies for check_strength(policy=id).
+    guess_length caps how many characters the 'guesses' estimator analyses
+    (default guess_estimator.MAX_ANALYSED_LENGTH)
     """
     
-    def __init__(self):
-        # Common weak passwords
-        self.common_passwords = [
-            'password', '123456', '12345678', 'qwerty', 'abc123',
-            'monkey', '1234567', 'letmein', 'trustno1', 'dragon',
-            'baseball', 'iloveyou', 'master', 'sunshine', 'ashley',
-            'bailey', 'passw0rd', 'shadow', '123123', '654321',
-            'superman', 'qazwsx', 'michael', 'football'
-        ]
+    def __init__(self, wordlist=None, estimator='entropy', cache_size=0, cache_ttl=300,
+                 stage_sample_every=0, policies=None, guess_length=None):
+        # Common weak passwords (the rule table in strength_rules.py is
+        # shared with the frontend's local scoring)
+        self.common_passwords = list(COMMON_PASSWORDS)
+        self._common_ranks = {word: rank for rank, word in enumerate(self.common_passwords, 1)}
+        
+        # Optional large common-password list (mmapped, sorted)
+        if wordlist is not None:
+            from wordlist_index import WordlistIndex
+            if not isinstance(wordlist, WordlistIndex):
+                wordlist = WordlistIndex(wordlist)
+        self.wordlist = wordlist
+        
+        if estimator not in ESTIMATORS:
+            raise ValueError(f'Unknown estimator: {estimator}')
+        self.estimator = estimator
+        self.guess_length = guess_length
+        self._guess_estimator = None  # built on first use
+        
+        # Opt-in memoization of results (no plaintexts are stored)
+        self.result_cache = ResultCache(max_entries=cache_size, ttl=cache_ttl) if cache_size else None
+        
+        # Per-stage timing of a sample of checks (0 = off)
+        self.stage_sample_every = stage_sample_every
+        self._checks = 0
+        
+        # Distinct passwords remembered per batch (credential dumps repeat a lot)
+        self.batch_memo_size = 65536
         
         # Common patterns
-        self.common_patterns = [
-            r'123', r'abc', r'qwerty', r'asdf', r'zxcv',
-            r'password', r'pass', r'admin', r'user', r'login'
-        ]
+        self.common_patterns = list(COMMON_PATTERNS)
         
         # Keyboard patterns
-        self.keyboard_patterns = [
-            'qwertyuiop', 'asdfghjkl', 'zxcvbnm',
-            '1qaz2wsx', 'qweasd', 'zaqwsx'
-        ]
+        self.keyboard_patterns = list(KEYBOARD_PATTERNS)
+        
+        # Built-in scoring is the default policy; its precompiled
+        # scanner covers the pattern lists above
+        self._default_policy = PasswordPolicy('default').compile(self.common_patterns, self.keyboard_patterns)
+        self._scanner = self._default_policy.scanner
+        
+        # Per-tenant policies ({policy id: PasswordPolicy or settings dict})
+        self.policies = PolicyRegistry(self.common_patterns, self.keyboard_patterns, policies)
     
-    def check_strength(self, password):
+    def check_strength(self, password, estimator=None, policy=None):
         """
         Main method to check password strength
         Returns a dictionary with score, strength level, and feedback
+        estimator overrides the instance default ('entropy' or 'guesses').
+        policy (an ID registered in self.policies) scores under that policy
+        and adds 'policy', 'compliant' and 'violations' to the result
         """
+        estimator = estimator or self.estimator
+        if estimator not in ESTIMATORS:
+            raise ValueError(f'Unknown estimator: {estimator}')
+        
+        compiled = None
+        if policy is not None:
+            try:
+                compiled = self.policies.get(policy)
+            except KeyError as e:
+                raise ValueError(e.args[0])
+        
+        if self.result_cache is None or not password:
+            return self._compute_strength(password, estimator, compiled)
+        
+        key = self.result_cache.make_key(password, estimator if policy is None else f'{estimator}\0{policy}')
+        result = self.result_cache.get(key)
+        if result is None:
+            result = self._compute_strength(password, estimator, compiled)
+            # The cache gets its own copy, without any slice of the password
+            self.result_cache.put(key, redact_result(result))
+            return result
+        
+        # Hand out copies so callers can't mutate the cached result
+        return restore_result(result, password)
+    
+    def _compute_strength(self, password, estimator, policy=None):
+        """Score a password from scratch (policy is a CompiledPolicy or None)"""
         if not password:
-            return {
+            result = {
                 'score': 0,
                 'strength': 'Empty',
                 'percentage': 0,
-                'feedback': ['Please enter a password'],
+                'feedback': [FEEDBACK['empty']],
                 'entropy': 0,
                 'crack_time': 'Instant'
             }
+            if policy is not None:
+                result.update(policy=policy.id, compliant=False, violations=[FEEDBACK['empty']])
+            return result
+        
+        timer = self._stage_timer()
         
+        # Every detector below reads from one precompiled scan
+        scan = (policy or self._default_policy).scanner.scan(password)
+        timer.mark('scan')
+        
+        return self._score_scan(password, scan, estimator, timer, policy)
+    
+    def _stage_timer(self):
+        """StageTimer for a sampled check, otherwise a no-op timer"""
+        if self.stage_sample_every:
+            self._checks += 1
+            if self._checks % self.stage_sample_every == 0:
+                return StageTimer(STRENGTH_STAGE_SECONDS)
+        return NULL_TIMER
+    
+    def _score_scan(self, password, scan, estimator, timer=NULL_TIMER, policy=None):
+        """Build the strength result for a non-empty password from its scan"""
+        rules = policy or self._default_policy
+        penalties = rules.penalties
         score = 0
-        max_score = 7  # Changed from 10 to actual maximum (3+4)
+        max_score = rules.max_score
         feedback = []
+        violations = []
         
         # 1. Length Check (0-3 points)
-        length_score, length_feedback = self._check_length(password)
+        length_score, length_feedback = rules.score_length(len(password))
         score += length_score
         feedback.extend(length_feedback)
+        if len(password) < rules.min_length:
+            violations.append(f'Must be at least {rules.min_length} characters')
+        elif rules.max_length is not None and len(password) > rules.max_length:
+            violations.append(f'Must be at most {rules.max_length} characters')
         
-        # 2. Character Diversity (0-4 points)
-        diversity_score, diversity_feedback = self._check_diversity(password)
-        score += diversity_score
-        feedback.extend(diversity_feedback)
+        # 2. Character Diversity (0-4 points; NIST mode doesn't score composition)
+        if rules.nist:
+            score += 4
+        else:
+            diversity_score, diversity_feedback = self._score_diversity(scan.char_classes)
+            score += diversity_score
+            feedback.extend(diversity_feedback)
+            for description in rules.missing_classes(scan.char_classes):
+                violations.append(f'Must contain {description}')
         
         # 3. Common Password Check (-2 points if found)
-        if self._is_common_password(password):
-            score -= 2
-            feedback.append('❌ This is a commonly used password')
+        timer.mark('length_diversity')
+        common_rank, common_source = self.common_password_match(password)
+        if common_rank is not None:
+            score -= penalties['common']
+            feedback.append(FEEDBACK['common'])
+            if rules.nist:
+                violations.append('Must not be a commonly used password')
+        timer.mark('common_password')
         
         # 4. Pattern Check (-1 point if found)
-        if self._has_common_patterns(password):
-            score -= 1
-            feedback.append('⚠️ Contains common patterns (123, abc, etc.)')
+        if scan.token_flags & COMMON_PATTERN:
+            score -= penalties['pattern']
+            feedback.append(FEEDBACK['pattern'])
         
         # 5. Keyboard Pattern Check (-1 point if found)
-        if self._has_keyboard_patterns(password):
-            score -= 1
-            feedback.append('⚠️ Contains keyboard patterns (qwerty, asdf, etc.)')
+        if scan.token_flags & KEYBOARD_PATTERN:
+            score -= penalties['keyboard']
+            feedback.append(FEEDBACK['keyboard'])
         
         # 6. Repetition Check (-1 point if found)
-        if self._has_repetitions(password):
-            score -= 1
-            feedback.append('⚠️ Contains repetitive characters')
+        if scan.has_repetition:
+            score -= penalties['repetition']
+            feedback.append(FEEDBACK['repetition'])
         
         # 7. Sequential Characters (-1 point if found)
-        if self._has_sequential_chars(password):
-            score -= 1
-            feedback.append('⚠️ Contains sequential characters')
+        if scan.has_sequence:
+            score -= penalties['sequence']
+            feedback.append(FEEDBACK['sequence'])
+        
+        # 8. Policy banned words and custom rules
+        if policy is not None:
+            if policy.is_banned(password.lower(), scan.token_flags, BANNED_WORD):
+                score -= penalties['banned']
+                feedback.append('❌ Contains a word banned by this policy')
+                violations.append('Must not contain banned words')
+            for message, penalty, reject in policy.matching_rules(password):
+                score -= penalty
+                feedback.append(f'⚠️ {message}')
+                if reject:
+                    violations.append(message)
         
         # Ensure score is within bounds
         score = max(0, min(score, max_score))
         
         # Calculate entropy
-        entropy = self._calculate_entropy(password)
+        if estimator == 'guesses':
+            estimate = self.get_guess_estimator().estimate(password)
+            entropy = estimate['guesses_log2']
+        else:
+            entropy = self._entropy_from_classes(len(password), scan.char_classes)
+        timer.mark(estimator)
         
         # Estimate crack time
         crack_time = self._estimate_crack_time(entropy)
@@ -96,12 +236,12 @@ class PasswordChecker:
         strength, percentage = self._get_strength_level(score, max_score)
         
         # Add positive feedback if strong
-        if score >= 6:
-            feedback.insert(0, '✓ Excellent password strength!')
-        elif score >= 4:
-            feedback.insert(0, '✓ Good password strength')
+        if score >= EXCELLENT_SCORE:
+            feedback.insert(0, FEEDBACK['excellent'])
+        elif score >= GOOD_SCORE:
+            feedback.insert(0, FEEDBACK['good'])
         
-        return {
+        result = {
             'score': score,
             'max_score': max_score,
             'strength': strength,
@@ -111,60 +251,148 @@ class PasswordChecker:
             'crack_time': crack_time,
             'length': len(password)
         }
+        
+        if self.wordlist is not None:
+            result['common_rank'] = common_rank
+            result['common_source'] = common_source
+        
+        if estimator == 'guesses':
+            result['guesses'] = estimate['guesses']
+            result['match_sequence'] = [
+                {'pattern': match['pattern'], 'token': match['token']}
+                for match in estimate['sequence']
+            ]
+        
+        if policy is not None:
+            result['policy'] = policy.id
+            result['compliant'] = not violations
+            result['violations'] = violations
+        
+        timer.mark('result')
+        return result
+    
+    def analyzer(self, estimator=None):
+        """Return an IncrementalAnalyzer for as-you-type checking"""
+        return IncrementalAnalyzer(self, estimator)
+    
+    def get_guess_estimator(self):
+        """Shared GuessEstimator, created on first use"""
+        if self._guess_estimator is None:
+            # Imported here: the dictionaries and graphs only matter in 'guesses' mode
+            from guess_estimator import MAX_ANALYSED_LENGTH, GuessEstimator
+            self._guess_estimator = GuessEstimator(wordlist=self.wordlist,
+                                                   max_length=self.guess_length or MAX_ANALYSED_LENGTH)
+        return self._guess_estimator
+    
+    def check_strength_batch(self, passwords, lazy=False):
+        """
+        Check the strength of many passwords in one call
+        Results come back in input order; pass lazy=True to get a generator
+        """
+        results = self._iter_strength(passwords)
+        if lazy:
+            return results
+        return list(results)
+    
+    def _iter_strength(self, passwords):
+        """
+        Yield strength results, scoring repeated passwords only once
+        Setup is done once per batch, and the result cache is bypassed: the
+        memo covers repeats within a batch, and a bulk dump would only evict
+        interactive entries. Under the entropy estimator a result depends
+        on nothing but its password's scan features (and common-password
+        rank), so passwords sharing those share one scored result and the
+        per-password work is mostly the scan
+        """
+        seen = {}
+        by_features = {}
+        estimator = self.estimator
+        scan = self._scanner.scan
+        common_password_match = self.common_password_match
+        
+        for password in passwords:
+            result = seen.get(password)
+            if result is None:
+                if estimator != 'entropy' or not password:
+                    result = self._compute_strength(password, estimator)
+                else:
+                    timer = self._stage_timer()
+                    features = scan(password)
+                    timer.mark('scan')
+                    key = (len(password),) + common_password_match(password) + features
+                    result = by_features.get(key)
+                    if result is None:
+                        result = self._score_scan(password, features, estimator, timer)
+                        if len(by_features) < self.batch_memo_size:
+                            by_features[key] = result
+                if len(seen) < self.batch_memo_size:
+                    seen[password] = result
+            # Hand out copies so callers can't mutate the memoized result
+            yield copy_result(result)
     
     def _check_length(self, password):
         """Check password length"""
-        length = len(password)
-        feedback = []
-        
-        if length < 8:
-            feedback.append('❌ Too short (minimum 8 characters)')
-            return 0, feedback
-        elif length < 12:
-            feedback.append('⚠️ Consider using 12+ characters')
-            return 1, feedback
-        elif length < 16:
-            feedback.append('✓ Good length')
-            return 2, feedback
-        else:
-            feedback.append('✓ Excellent length')
-            return 3, feedback
+        return self._default_policy.score_length(len(password))
     
     def _check_diversity(self, password):
         """Check character type diversity"""
+        has_lower = bool(LOWER_RE.search(password))
+        has_upper = bool(UPPER_RE.search(password))
+        has_digit = bool(DIGIT_RE.search(password))
+        has_special = bool(SPECIAL_RE.search(password))
+        
+        return self._diversity_feedback(has_lower, has_upper, has_digit, has_special)
+    
+    def _score_diversity(self, char_classes):
+        """Character type diversity from precomputed class bits"""
+        return self._diversity_feedback(
+            bool(char_classes & LOWER),
+            bool(char_classes & UPPER),
+            bool(char_classes & DIGIT),
+            bool(char_classes & SPECIAL)
+        )
+    
+    def _diversity_feedback(self, has_lower, has_upper, has_digit, has_special):
+        """Score and feedback for the character types present"""
         score = 0
         feedback = []
         
-        has_lower = bool(re.search(r'[a-z]', password))
-        has_upper = bool(re.search(r'[A-Z]', password))
-        has_digit = bool(re.search(r'\d', password))
-        has_special = bool(re.search(r'[!@#$%^&*()_+\-=\[\]{};:\'",.<>?/\\|`~]', password))
-        
-        if has_lower:
-            score += 1
-        else:
-            feedback.append('➕ Add lowercase letters (a-z)')
-        
-        if has_upper:
-            score += 1
-        else:
-            feedback.append('➕ Add uppercase letters (A-Z)')
-        
-        if has_digit:
-            score += 1
-        else:
-            feedback.append('➕ Add numbers (0-9)')
-        
-        if has_special:
-            score += 1
-        else:
-            feedback.append('➕ Add special characters (!@#$%...)')
+        present = {'lower': has_lower, 'upper': has_upper, 'digit': has_digit, 'special': has_special}
+        for name, description in CLASS_DESCRIPTIONS.items():
+            if present[name]:
+                score += 1
+            else:
+                feedback.append(FEEDBACK['add_class'].format(description=description))
         
         return score, feedback
     
     def _is_common_password(self, password):
         """Check if password is in common passwords list"""
-        return password.lower() in self.common_passwords
+        return self.common_password_rank(password) is not None
+    
+    def common_password_rank(self, password):
+        """
+        Rank of the password in the common-password list (1 = most common)
+        The wordlist's rank when it has the password, else the built-in
+        list's (the two scales differ; see common_password_match); None if not found
+        """
+        return self.common_password_match(password)[0]
+    
+    def common_password_match(self, password):
+        """
+        (rank, source) of the password: source is 'wordlist' for the
+        configured wordlist, checked first, or 'builtin' for the built-in
+        list; (None, None) if not found
+        """
+        password_lower = password.lower()
+        
+        if self.wordlist is not None:
+            rank = self.wordlist.rank(password_lower)
+            if rank is not None:
+                return rank, 'wordlist'
+        
+        rank = self._common_ranks.get(password_lower)
+        return (rank, 'builtin') if rank is not None else (None, None)
     
     def _has_common_patterns(self, password):
         """Check for common patterns"""
@@ -178,14 +406,13 @@ class PasswordChecker:
     
     def _has_repetitions(self, password):
         """Check for repetitive characters (e.g., 'aaa', '111')"""
-        return bool(re.search(r'(.)\1{2,}', password))
+        return bool(REPETITION_RE.search(password))
     
     def _has_sequential_chars(self, password):
         """Check for sequential characters (e.g., 'abc', '123')"""
-        sequences = ['0123456789', 'abcdefghijklmnopqrstuvwxyz']
         password_lower = password.lower()
         
-        for sequence in sequences:
+        for sequence in SEQUENCES:
             for i in range(len(sequence) - 2):
                 if sequence[i:i+3] in password_lower or sequence[i:i+3][::-1] in password_lower:
                     return True
@@ -195,56 +422,113 @@ class PasswordChecker:
         """Calculate password entropy in bits"""
         pool_size = 0
         
-        if re.search(r'[a-z]', password):
-            pool_size += 26
-        if re.search(r'[A-Z]', password):
-            pool_size += 26
-        if re.search(r'\d', password):
-            pool_size += 10
-        if re.search(r'[^a-zA-Z0-9]', password):
-            pool_size += 32
+        if LOWER_RE.search(password):
+            pool_size += POOL_SIZES['lower']
+        if UPPER_RE.search(password):
+            pool_size += POOL_SIZES['upper']
+        if DIGIT_RE.search(password):
+            pool_size += POOL_SIZES['digit']
+        if NON_ALNUM_RE.search(password):
+            pool_size += POOL_SIZES['non_alnum']
         
         if pool_size == 0:
             return 0
         
-        entropy = len(password) * math.log2(pool_size)
+        entropy = len(password) * POOL_BITS[pool_size]
         return entropy
     
+    def _entropy_from_classes(self, length, char_classes):
+        """Entropy in bits from precomputed class bits"""
+        pool_size = 0
+        
+        if char_classes & LOWER:
+            pool_size += POOL_SIZES['lower']
+        if char_classes & UPPER:
+            pool_size += POOL_SIZES['upper']
+        if char_classes & DIGIT:
+            pool_size += POOL_SIZES['digit']
+        if char_classes & NON_ALNUM:
+            pool_size += POOL_SIZES['non_alnum']
+        
+        if pool_size == 0:
+            return 0
+        
+        return length * POOL_BITS[pool_size]
+    
     def _estimate_crack_time(self, entropy):
         """Estimate time to crack password"""
-        # Assuming 10 billion guesses per second
-        guesses_per_second = 10_000_000_000
-        
-        total_combinations = 2 ** entropy
-        seconds = total_combinations / (2 * guesses_per_second)  # Average case
+        try:
+            total_combinations = 2 ** entropy
+        except OverflowError:  # over ~1024 bits
+            total_combinations = float('inf')
+        seconds = total_combinations / (2 * GUESSES_PER_SECOND)  # Average case
         
         if seconds < 1:
             return "Instant"
-        elif seconds < 60:
-            return f"{int(seconds)} seconds"
-        elif seconds < 3600:
-            return f"{int(seconds/60)} minutes"
-        elif seconds < 86400:
-            return f"{int(seconds/3600)} hours"
-        elif seconds < 2592000:
-            return f"{int(seconds/86400)} days"
-        elif seconds < 31536000:
-            return f"{int(seconds/2592000)} months"
-        else:
-            years = int(seconds/31536000)
-            if years > 1000000:
-                return "Millions of years"
-            return f"{years} years"
+        for below, unit_seconds, unit in CRACK_TIME_UNITS:
+            if seconds < below:
+                return f"{int(seconds / unit_seconds)} {unit}"
+        
+        years = seconds / YEAR_SECONDS
+        if years >= MAX_YEARS + 1:
+            return "Millions of years"
+        return f"{int(years)} years"
     
     def _get_strength_level(self, score, max_score):
         """Determine strength level based on score (4-tier system)"""
         percentage = int((score / max_score) * 100)
         
-        if percentage < 30:
-            return 'Very Weak', percentage
-        elif percentage < 55:
-            return 'Weak', percentage
-        elif percentage < 80:
-            return 'Medium', percentage
+        for below, level in STRENGTH_LEVELS:
+            if below is None or percentage < below:
+                return level, percentage
+
+
+class IncrementalAnalyzer:
+    """
+    As-you-type strength checking for one input field
+    Keeps the scan state of the current text, so each update only scans
+    the characters after the common prefix with the previous text (one
+    character per keystroke). Results match check_strength; the guesses
+    estimator and common-password lookup still look at the whole text
+    """
+    
+    def __init__(self, checker, estimator=None):
+        estimator = estimator or checker.estimator
+        if estimator not in ESTIMATORS:
+            raise ValueError(f'Unknown estimator: {estimator}')
+        self.checker = checker
+        self.estimator = estimator
+        self.password = ''
+        self._scan = checker._scanner.incremental()
+    
+    def update(self, password):
+        """Set the current text and return its strength result"""
+        if len(password) > self._scan.max_length:
+            raise ValueError(f'Password is too long (at most {self._scan.max_length} characters)')
+        current = self.password
+        if password.startswith(current):
+            prefix = len(current)
         else:
-            return 'Strong', percentage  # 80-100% = Strong
\ No newline at end of file
+            prefix = 0
+            for old, new in zip(current, password):
+                if old != new:
+                    break
+                prefix += 1
+        
+        self._scan.truncate(prefix)
+        self._scan.extend(password[prefix:])
+        self.password = password
+        return self.result()
+    
+    def append(self, chars):
+        """Add typed characters to the end of the text"""
+        return self.update(self.password + chars)
+    
+    def delete(self, count=1):
+        """Remove count characters from the end of the text (backspace)"""
+        return self.update(self.password[:max(0, len(self.password) - count)])
+    
+    def result(self):
+        if not self.password:
+            return self.checker._compute_strength('', self.estimator)
+        return self.checker._score_scan(self.password, self._scan.result(), self.estimator)
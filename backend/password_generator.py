@@ -1,56 +1,92 @@
-import random
+import math
 import string
+from passphrase_wordlist import WordlistRegistry
+from secure_random import system_random
+
+# Password length bounds
+MIN_LENGTH = 4
+MAX_LENGTH = 1024
+
+# Upper bound on passwords/passphrases generated per call
+MAX_COUNT = 10000
+
+# Upper bound on characters drawn per call (length x count)
+MAX_TOTAL_LENGTH = 1_000_000
+
+# Upper bound on words per passphrase, whatever the wordlist's size
+MAX_WORD_COUNT = 20
+
+
+def _is_int(value):
+    # JSON gives ints; reject strings, floats and booleans (bool is an int subclass)
+    return isinstance(value, int) and not isinstance(value, bool)
+
 
 class PasswordGenerator:
     """
     Generate secure random passwords
+    Randomness comes from a buffered os.urandom CSPRNG (secure_random.py)
+    Passphrase wordlists ({name: path}) are loaded on first use
     """
     
-    def __init__(self):
+    def __init__(self, rng=None, wordlists=None):
         self.lowercase = string.ascii_lowercase
         self.uppercase = string.ascii_uppercase
         self.digits = string.digits
         self.special = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+        self.rng = rng or system_random
+        self.wordlists = wordlists if isinstance(wordlists, WordlistRegistry) else WordlistRegistry(wordlists)
     
-    def generate(self, length=16, use_lowercase=True, use_uppercase=True, 
-                 use_digits=True, use_special=True, exclude_ambiguous=False):
+    def generate(self, length=16, use_lowercase=True, use_uppercase=True,
+                 use_digits=True, use_special=True, exclude_ambiguous=False, count=None):
         """
         Generate a random password based on specified criteria
+        With count set, returns 'passwords' (a list of count passwords)
         """
-        if length < 4:
+        if not _is_int(length) or not MIN_LENGTH <= length <= MAX_LENGTH:
             return {
                 'success': False,
-                'error': 'Password length must be at least 4 characters'
+                'error': f'Password length must be between {MIN_LENGTH} and {MAX_LENGTH:,} characters'
             }
         
-        # Build character pool
+        count_error = self._check_count(count)
+        if count_error:
+            return count_error
+        
+        if length * (count or 1) > MAX_TOTAL_LENGTH:
+            return {
+                'success': False,
+                'error': f'length x count must be at most {MAX_TOTAL_LENGTH:,} characters'
+            }
+        
+        # Build character pool, one required class per selected type
         char_pool = ""
-        required_chars = []
+        required_pools = []
         
         if use_lowercase:
             chars = self.lowercase
             if exclude_ambiguous:
                 chars = chars.replace('l', '').replace('o', '')
             char_pool += chars
-            required_chars.append(random.choice(chars))
+            required_pools.append(chars)
         
         if use_uppercase:
             chars = self.uppercase
             if exclude_ambiguous:
                 chars = chars.replace('I', '').replace('O', '')
             char_pool += chars
-            required_chars.append(random.choice(chars))
+            required_pools.append(chars)
         
         if use_digits:
             chars = self.digits
             if exclude_ambiguous:
                 chars = chars.replace('0', '').replace('1', '')
             char_pool += chars
-            required_chars.append(random.choice(chars))
+            required_pools.append(chars)
         
         if use_special:
             char_pool += self.special
-            required_chars.append(random.choice(self.special))
+            required_pools.append(self.special)
         
         if not char_pool:
             return {
@@ -58,45 +94,103 @@ class PasswordGenerator:
                 'error': 'At least one character type must be selected'
             }
         
-        # Generate password
-        remaining_length = length - len(required_chars)
-        password_chars = required_chars + [random.choice(char_pool) for _ in range(remaining_length)]
+        passwords = self._generate_batch(length, char_pool, required_pools, count or 1)
         
-        # Shuffle to avoid predictable patterns
-        random.shuffle(password_chars)
-        password = ''.join(password_chars)
+        if count is None:
+            return {
+                'success': True,
+                'password': passwords[0]
+            }
         
         return {
             'success': True,
-            'password': password
+            'passwords': passwords
         }
     
-    def generate_passphrase(self, word_count=4, separator='-', capitalize=True, add_number=True):
+    def _generate_batch(self, length, char_pool, required_pools, count):
+        """
+        Draw every character for count passwords in a few bulk CSPRNG reads
+        Each password gets one character from each required pool, placed
+        at random positions among the rest
+        """
+        rng = self.rng
+        remaining_length = length - len(required_pools)
+        
+        required = [rng.choice_string(pool, count) for pool in required_pools]
+        rest = rng.choice_string(char_pool, count * remaining_length)
+        
+        passwords = []
+        for i in range(count):
+            password_chars = list(rest[i * remaining_length:(i + 1) * remaining_length])
+            rng.insert_randomly(password_chars, [chars[i] for chars in required])
+            passwords.append(''.join(password_chars))
+        
+        return passwords
+    
+    def _check_count(self, count):
+        """Error dict for an invalid count, or None"""
+        if count is None:
+            return None
+        if not _is_int(count) or not 1 <= count <= MAX_COUNT:
+            return {
+                'success': False,
+                'error': f'count must be between 1 and {MAX_COUNT:,}'
+            }
+        return None
+    
+    def generate_passphrase(self, word_count=4, separator='-', capitalize=True, add_number=True,
+                            count=None, wordlist='default'):
         """
         Generate a memorable passphrase using random words
+        With count set, returns 'passphrases' (a list of count passphrases)
         """
-        # Common word list (in practice, use a larger dictionary)
-        words = [
-            'rainbow', 'mountain', 'sunset', 'ocean', 'forest', 'thunder',
-            'crystal', 'shadow', 'phoenix', 'dragon', 'wizard', 'castle',
-            'knight', 'legend', 'mystic', 'storm', 'silver', 'golden',
-            'tiger', 'eagle', 'wolf', 'bear', 'lion', 'hawk',
-            'river', 'valley', 'meadow', 'glacier', 'volcano', 'canyon',
-            'anchor', 'compass', 'journey', 'voyage', 'atlas', 'cosmos',
-            'nebula', 'quantum', 'prism', 'eclipse', 'zenith', 'aurora'
-        ]
+        count_error = self._check_count(count)
+        if count_error:
+            return count_error
         
-        selected_words = random.sample(words, word_count)
+        try:
+            words = self.wordlists.get(wordlist)
+        except KeyError as e:
+            return {
+                'success': False,
+                'error': str(e.args[0])
+            }
         
-        if capitalize:
-            selected_words = [word.capitalize() for word in selected_words]
+        max_words = min(len(words), MAX_WORD_COUNT)
+        if not _is_int(word_count) or not 1 <= word_count <= max_words:
+            return {
+                'success': False,
+                'error': f'word_count must be between 1 and {max_words:,} for this wordlist'
+            }
         
-        passphrase = separator.join(selected_words)
+        passphrases = []
+        for _ in range(count or 1):
+            selected_words = [words[index] for index in self.rng.sample_indices(len(words), word_count)]
+            
+            if capitalize:
+                selected_words = [word.capitalize() for word in selected_words]
+            
+            passphrase = separator.join(selected_words)
+            
+            if add_number:
+                passphrase += separator + str(100 + self.rng.randbelow(900))
+            
+            passphrases.append(passphrase)
         
+        # Distinct words: log2(N * (N-1) * ... * (N-k+1)), plus 900 possible numbers
+        entropy = sum(math.log2(len(words) - i) for i in range(word_count))
         if add_number:
-            passphrase += separator + str(random.randint(100, 999))
+            entropy += math.log2(900)
         
-        return {
+        result = {
             'success': True,
-            'passphrase': passphrase
-        }
\ No newline at end of file
+            'entropy': round(entropy, 2),
+            'wordlist': wordlist
+        }
+        
+        if count is None:
+            result['passphrase'] = passphrases[0]
+        else:
+            result['passphrases'] = passphrases
+        
+        return result
\ No newline at end of file
@@ -0,0 +1,317 @@
+import re
+from collections import deque, namedtuple
+from functools import lru_cache
+
+import strength_rules
+
+# Character class bits
+LOWER = 1
+UPPER = 2
+DIGIT = 4
+SPECIAL = 8
+NON_ALNUM = 16
+
+# Token category bits
+COMMON_PATTERN = 1
+KEYBOARD_PATTERN = 2
+BANNED_WORD = 4
+
+SPECIAL_CHARS = frozenset(strength_rules.SPECIAL_CHARS)
+
+ScanResult = namedtuple('ScanResult', [
+    'char_classes',   # OR of the character class bits above
+    'token_flags',    # OR of the token category bits above
+    'has_repetition', # same character 3+ times in a row
+    'has_sequence'    # 3-char run of abc.../012... forwards or backwards
+])
+
+
+def _classify(char):
+    """Return (class bits, lowercased text) for a single character"""
+    bits = 0
+    if 'a' <= char <= 'z':
+        bits |= LOWER
+    elif 'A' <= char <= 'Z':
+        bits |= UPPER
+    elif '0' <= char <= '9':
+        bits |= DIGIT
+    else:
+        bits |= NON_ALNUM
+        if char.isdecimal():
+            bits |= DIGIT
+    if char in SPECIAL_CHARS:
+        bits |= SPECIAL
+    return bits, char.lower()
+
+
+# Precomputed lookups for ASCII; anything else is classified on the fly
+_ASCII_INFO = {chr(code): _classify(chr(code)) for code in range(128)}
+
+# Characters that take part in abc.../012... sequences, tagged with the
+# sequence they belong to
+_SEQUENCE_CLASS = {char: index for index, sequence in enumerate(strength_rules.SEQUENCES) for char in sequence}
+
+# The same features computed by C-level passes over the whole string
+# (see PatternScanner._scan_passes)
+_CLASS_BYTES = bytes(_ASCII_INFO[chr(code)][0] for code in range(128)) + bytes(128)
+_CLASS_VALUES = sorted(set(_CLASS_BYTES) - {0})
+_REPETITION_RE = re.compile(r'(.)\1\1')
+_DECIMAL_RE = re.compile(r'\d')  # Unicode category Nd, like str.isdecimal
+
+
+def _step_table(step):
+    # byte -> the byte after it (step 1) or before it (-1) in its sequence;
+    # 0x80, which no ASCII byte equals, for bytes outside the sequences
+    table = bytearray(b'\x80' * 256)
+    for sequence in strength_rules.SEQUENCES:
+        for char, neighbour in zip(sequence[::step], sequence[::step][1:]):
+            table[ord(char)] = ord(neighbour)
+    return bytes(table)
+
+
+_SEQUENCE_STEPS = (_step_table(1), _step_table(-1))
+
+# Longest text an IncrementalScan keeps per-character state for
+MAX_INCREMENTAL_LENGTH = 256
+
+# Scanners with more tokens than this (e.g. a long banned-word list) always
+# walk the automaton: one regex alternation per category would be slower
+MAX_REGEX_TOKENS = 64
+
+
+def _has_sequence(lowered):
+    """True if lowered (ASCII bytes) holds 3 consecutive characters of one sequence, either way"""
+    if len(lowered) < 3:
+        return False
+    following = int.from_bytes(lowered[1:], 'big')
+    for table in _SEQUENCE_STEPS:
+        # Zero bytes of the XOR mark characters that follow their predecessor
+        # in the sequence; two in a row make a run of three
+        expected = int.from_bytes(lowered[:-1].translate(table), 'big')
+        if b'\0\0' in (following ^ expected).to_bytes(len(lowered) - 1, 'big'):
+            return True
+    return False
+
+
+# Walk state after each character: (char_classes, token_flags, automaton
+# state, previous char, run length, has_repetition, previous lowered char,
+# sequence step, has_sequence)
+_START = (0, 0, 0, None, 0, False, None, 0, False)
+
+
+def _step(walk, char, transitions, outputs):
+    """Walk state after char, for the automaton transitions/outputs"""
+    (char_classes, token_flags, state, previous, run_length,
+     has_repetition, previous_low, step, has_sequence) = walk
+
+    info = _ASCII_INFO.get(char)
+    if info is None:
+        info = _classify(char)
+    bits, lowered = info
+    char_classes |= bits
+
+    # Repetition (regex '.' never matches a newline)
+    if char == previous and char != '\n':
+        run_length += 1
+        if run_length >= 3:
+            has_repetition = True
+    else:
+        previous = char
+        run_length = 1
+
+    for low in lowered:
+        state = transitions[state].get(low, 0)
+        token_flags |= outputs[state]
+
+        # Sequences: consecutive ordinals within a-z or 0-9
+        kind = _SEQUENCE_CLASS.get(low)
+        if kind is not None and previous_low is not None and _SEQUENCE_CLASS.get(previous_low) == kind:
+            delta = ord(low) - ord(previous_low)
+            if delta in (1, -1):
+                if delta == step:
+                    has_sequence = True
+                step = delta
+            else:
+                step = 0
+        else:
+            step = 0
+        previous_low = low
+
+    return (char_classes, token_flags, state, previous, run_length,
+            has_repetition, previous_low, step, has_sequence)
+
+
+def _walk_result(walk):
+    char_classes, token_flags, _, _, _, has_repetition, _, _, has_sequence = walk
+    return ScanResult(char_classes, token_flags, has_repetition, has_sequence)
+
+
+class PatternScanner:
+    """
+    Password feature scanner with two engines that return identical results
+    (tests/test_password_checker.py compares them on a mixed corpus):
+
+    walk    an Aho-Corasick automaton over the pattern, keyboard and
+            banned-word tokens, advanced one character at a time
+            (_step) while tracking classes, repeats and sequences. Used
+            by IncrementalScan, and by scan() for long token lists
+            (over MAX_REGEX_TOKENS), empty passwords and 'Σ'
+    passes  a few regex searches and bytes.translate calls over the
+            whole string (_scan_passes), for every other scan()
+
+    The passes run in C: 3.8-4.0 µs against 6.1-8.1 µs for the walk at
+    12-16 characters, 4.7 against 14.9 µs at 32. That is about a quarter
+    of check_strength (10.4 against 14.1 µs per call, 5.4 against 7.3 µs
+    per password in check_strength_batch). A regex alternation of a long
+    banned-word list would be slower than the automaton, and appending
+    a character needs the walk's saved state, so both are kept
+    """
+
+    def __init__(self, common_patterns, keyboard_patterns, banned_words=()):
+        tokens = {}
+        for token in common_patterns:
+            tokens[token] = tokens.get(token, 0) | COMMON_PATTERN
+        for token in keyboard_patterns:
+            tokens[token] = tokens.get(token, 0) | KEYBOARD_PATTERN
+        for token in banned_words:
+            tokens[token] = tokens.get(token, 0) | BANNED_WORD
+
+        self._transitions, self._outputs = self._build_automaton(tokens)
+
+        self._token_res = None
+        if len(tokens) <= MAX_REGEX_TOKENS:
+            self._token_res = []
+            for flag in (COMMON_PATTERN, KEYBOARD_PATTERN, BANNED_WORD):
+                matching = sorted(token for token, flags in tokens.items() if flags & flag)
+                if matching:
+                    self._token_res.append((flag, re.compile('|'.join(map(re.escape, matching)))))
+
+    @staticmethod
+    def _build_automaton(tokens):
+        """Compile tokens into a DFA: per-state transition dicts and output bits"""
+        goto = [{}]
+        outputs = [0]
+
+        for token, flags in tokens.items():
+            state = 0
+            for char in token:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append(0)
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state] |= flags
+
+        # Breadth-first pass to resolve failure links into full transitions
+        alphabet = {char for token in tokens for char in token}
+        fail = [0] * len(goto)
+        transitions = [dict() for _ in goto]
+        queue = deque()
+
+        for char in alphabet:
+            child = goto[0].get(char)
+            if child is None:
+                continue
+            transitions[0][char] = child
+            queue.append(child)
+
+        while queue:
+            state = queue.popleft()
+            outputs[state] |= outputs[fail[state]]
+            for char in alphabet:
+                child = goto[state].get(char)
+                if child is None:
+                    target = transitions[fail[state]].get(char, 0)
+                    if target:
+                        transitions[state][char] = target
+                    continue
+                fail[child] = transitions[fail[state]].get(char, 0)
+                transitions[state][char] = child
+                queue.append(child)
+
+        return transitions, outputs
+
+    def scan(self, password):
+        """Compute every detector feature of the password (ScanResult)"""
+        # str.lower() lowers character by character, like the walk, except
+        # for the context-dependent final sigma
+        if self._token_res is not None and password and 'Σ' not in password:
+            return self._scan_passes(password)
+        return self._scan_walk(password)
+
+    def _scan_walk(self, password):
+        """scan() as one automaton walk: the steps IncrementalScan takes"""
+        transitions = self._transitions
+        outputs = self._outputs
+        walk = _START
+        for char in password:
+            walk = _step(walk, char, transitions, outputs)
+        return _walk_result(walk)
+
+    def _scan_passes(self, password):
+        """scan() for a non-empty password, without a Python loop per character"""
+        if password.isascii():
+            char_classes = 0
+        else:
+            # Non-ASCII characters are never special; some are decimal digits
+            char_classes = NON_ALNUM | (DIGIT if _DECIMAL_RE.search(password) else 0)
+        classes = password.encode('ascii', 'ignore').translate(_CLASS_BYTES)
+        for bits in _CLASS_VALUES:
+            if bits in classes:
+                char_classes |= bits
+
+        lowered = password.lower()
+        token_flags = 0
+        for flag, token_re in self._token_res:
+            if token_re.search(lowered) is not None:
+                token_flags |= flag
+
+        # One '?' per non-ASCII character keeps positions, and breaks sequences
+        return ScanResult(char_classes, token_flags, _REPETITION_RE.search(password) is not None,
+                          _has_sequence(lowered.encode('ascii', 'replace')))
+
+    def incremental(self, max_length=MAX_INCREMENTAL_LENGTH):
+        """Return an IncrementalScan for as-you-type scanning"""
+        return IncrementalScan(self, max_length)
+
+
+class IncrementalScan:
+    """
+    Scan state that is updated one character at a time
+    Keeps the walk state of PatternScanner.scan after every character, so
+    appending costs O(1) and deleting from the end just pops saved states.
+    At most max_length characters are tracked (ValueError past that)
+    """
+
+    def __init__(self, scanner, max_length=MAX_INCREMENTAL_LENGTH):
+        self.max_length = max_length
+        self._transitions = scanner._transitions
+        self._outputs = scanner._outputs
+        self._states = [_START]
+
+    def __len__(self):
+        return len(self._states) - 1
+
+    def append(self, char):
+        """Advance the scan by one character"""
+        if len(self._states) > self.max_length:
+            raise ValueError(f'Password is too long (at most {self.max_length} characters)')
+        self._states.append(_step(self._states[-1], char, self._transitions, self._outputs))
+
+    def extend(self, chars):
+        for char in chars:
+            self.append(char)
+
+    def truncate(self, length):
+        """Drop characters from the end until length remain"""
+        del self._states[length + 1:]
+
+    def result(self):
+        """ScanResult for the characters seen so far"""
+        return _walk_result(self._states[-1])
+
+
+@lru_cache(maxsize=256)
+def get_scanner(common_patterns, keyboard_patterns, banned_words=()):
+    """Return a shared scanner for the given token tuples"""
+    return PatternScanner(common_patterns, keyboard_patterns, banned_words)
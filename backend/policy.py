@@ -0,0 +1,294 @@
+import os
+import re
+import threading
+
+from pattern_scanner import DIGIT, LOWER, SPECIAL, UPPER, get_scanner
+from strength_rules import (
+    CLASS_DESCRIPTIONS, EXCELLENT_LENGTH, FEEDBACK, GOOD_LENGTH, MAX_SCORE, MIN_LENGTH, PENALTIES
+)
+
+MODES = ('default', 'nist')
+
+CLASS_BITS = {
+    name: (bit, CLASS_DESCRIPTIONS[name])
+    for name, bit in (('lower', LOWER), ('upper', UPPER), ('digit', DIGIT), ('special', SPECIAL))
+}
+
+DEFAULT_PENALTIES = PENALTIES
+
+# Shortest banned word matched inside longer passwords; shorter ones only match exactly
+MIN_BANNED_SUBSTRING = 4
+
+
+class PolicyError(ValueError):
+    """Invalid policy configuration"""
+
+
+class PasswordPolicy:
+    """
+    Scoring and compliance settings for one tenant
+    Built from a plain dict (e.g. one entry of a JSON policy file):
+
+        min_length, good_length, excellent_length   length score thresholds (8/12/16)
+        max_length                                  longest compliant password
+        required_classes                            subset of lower/upper/digit/special
+        banned_words, banned_words_file             context-specific words to reject
+        rules                                       [{pattern, message, penalty, reject}]
+        penalties                                   overrides for DEFAULT_PENALTIES
+        common_patterns, keyboard_patterns          replace the built-in token lists
+        mode                                        'default' or 'nist' (SP 800-63B)
+
+    mode='nist' drops composition scoring and rules (800-63B advises against
+    them), and rejects common and banned passwords outright. Settings of
+    the wrong type or shape raise PolicyError here
+    """
+
+    def __init__(self, policy_id, min_length=MIN_LENGTH, good_length=None, excellent_length=None, max_length=None,
+                 required_classes=(), banned_words=(), banned_words_file=None, rules=(),
+                 penalties=None, common_patterns=None, keyboard_patterns=None, mode='default'):
+        if mode not in MODES:
+            raise PolicyError(f'Unknown policy mode: {mode}')
+        for name, value in (('min_length', min_length), ('good_length', good_length),
+                            ('excellent_length', excellent_length), ('max_length', max_length)):
+            if value is not None and not _is_int(value):
+                raise PolicyError(f'{name} must be an integer')
+        # Unset thresholds keep the built-in 12/16 unless min_length is above them
+        if good_length is None:
+            good_length = max(GOOD_LENGTH, min_length)
+        if excellent_length is None:
+            excellent_length = max(EXCELLENT_LENGTH, good_length)
+        if not 0 < min_length <= good_length <= excellent_length:
+            raise PolicyError('Length thresholds must satisfy 0 < min_length <= good_length <= excellent_length')
+        if max_length is not None and max_length < min_length:
+            raise PolicyError('max_length must be at least min_length')
+
+        # A bare string would be taken a character at a time ('acme' -> a, c, m, e)
+        for name, value in (('required_classes', required_classes), ('banned_words', banned_words),
+                            ('common_patterns', common_patterns), ('keyboard_patterns', keyboard_patterns)):
+            if value is not None and not _is_string_list(value):
+                raise PolicyError(f'{name} must be a list of strings')
+        if banned_words_file is not None and not isinstance(banned_words_file, (str, os.PathLike)):
+            raise PolicyError('banned_words_file must be a path')
+        unknown = set(required_classes) - set(CLASS_BITS)
+        if unknown:
+            raise PolicyError(f'Unknown character classes: {", ".join(sorted(unknown))}')
+
+        if penalties is not None and not isinstance(penalties, dict):
+            raise PolicyError('penalties must be an object of {name: points}')
+        unknown = set(penalties or {}) - set(DEFAULT_PENALTIES)
+        if unknown:
+            raise PolicyError(f'Unknown penalties: {", ".join(sorted(unknown))}')
+        if not all(_is_int(points) for points in (penalties or {}).values()):
+            raise PolicyError('penalties must be integers')
+
+        if not isinstance(rules, (list, tuple)):
+            raise PolicyError('rules must be a list of {pattern, message, penalty, reject}')
+        for rule in rules:
+            _check_rule(rule)
+
+        self.id = policy_id
+        self.mode = mode
+        self.min_length = min_length
+        self.good_length = good_length
+        self.excellent_length = excellent_length
+        self.max_length = max_length
+        self.required_classes = () if mode == 'nist' else tuple(required_classes)
+        self.banned_words = tuple(banned_words)
+        self.banned_words_file = banned_words_file
+        self.rules = tuple(rules)
+        self.penalties = {**DEFAULT_PENALTIES, **(penalties or {})}
+        self.common_patterns = common_patterns
+        self.keyboard_patterns = keyboard_patterns
+
+    @classmethod
+    def from_dict(cls, policy_id, config):
+        if not isinstance(config, dict):
+            raise PolicyError(f'Invalid policy {policy_id!r}: settings must be an object')
+        try:
+            return cls(policy_id, **config)
+        except (TypeError, PolicyError) as e:
+            raise PolicyError(f'Invalid policy {policy_id!r}: {e}')
+
+    def compile(self, common_patterns, keyboard_patterns):
+        """CompiledPolicy, falling back to the given token lists where this policy has none"""
+        return CompiledPolicy(self, common_patterns, keyboard_patterns)
+
+
+class CompiledPolicy:
+    """
+    A policy reduced to the structures check_strength evaluates
+    Banned words join the pattern tokens in one Aho-Corasick scanner, short
+    ones sit in a set for exact matches, and custom rules without groups
+    share one merged regex that rules them out with a single search (rules
+    with groups are searched on their own: merging renumbers the groups
+    their backreferences point at)
+    """
+
+    def __init__(self, policy, common_patterns, keyboard_patterns):
+        self.id = policy.id
+        self.nist = policy.mode == 'nist'
+        self.min_length = policy.min_length
+        self.good_length = policy.good_length
+        self.excellent_length = policy.excellent_length
+        self.max_length = policy.max_length
+        self.penalties = policy.penalties
+
+        # Length (0-3) + diversity (0-4) points, as in the built-in scoring
+        self.max_score = MAX_SCORE
+
+        self.required = [CLASS_BITS[name] for name in policy.required_classes]
+
+        banned = {word.lower() for word in policy.banned_words if word}
+        if policy.banned_words_file:
+            try:
+                banned.update(_read_banned_words(policy.banned_words_file))
+            except (OSError, UnicodeDecodeError) as e:
+                raise PolicyError(f'Cannot read banned words for policy {policy.id!r}: {e}')
+        self.banned_exact = frozenset(banned)
+        substrings = tuple(sorted(word for word in banned if len(word) >= MIN_BANNED_SUBSTRING))
+
+        self.scanner = get_scanner(
+            tuple(policy.common_patterns if policy.common_patterns is not None else common_patterns),
+            tuple(policy.keyboard_patterns if policy.keyboard_patterns is not None else keyboard_patterns),
+            substrings
+        )
+
+        # Rules were validated by PasswordPolicy
+        self.rules = []
+        for rule in () if self.nist else policy.rules:
+            self.rules.append((re.compile(rule['pattern']), rule.get('message', f"Matches {rule['pattern']}"),
+                               rule.get('penalty', 1), rule.get('reject', False)))
+        mergeable = [rule.pattern for rule, _, _, _ in self.rules if not rule.groups]
+        self._any_rule = _merge_patterns(mergeable) if mergeable else None
+
+    def score_length(self, length):
+        """Length points (0-3) and feedback"""
+        if length < self.min_length:
+            return 0, [FEEDBACK['too_short'].format(min_length=self.min_length)]
+        elif length < self.good_length:
+            return 1, [FEEDBACK['consider_length'].format(good_length=self.good_length)]
+        elif length < self.excellent_length:
+            return 2, [FEEDBACK['good_length']]
+        return 3, [FEEDBACK['excellent_length']]
+
+    def missing_classes(self, char_classes):
+        """Descriptions of required character classes the password lacks"""
+        return [description for bit, description in self.required if not char_classes & bit]
+
+    def is_banned(self, password_lower, token_flags, banned_flag):
+        return bool(token_flags & banned_flag) or password_lower in self.banned_exact
+
+    def matching_rules(self, password):
+        """(message, penalty, reject) of every custom rule the password matches"""
+        if not self.rules:
+            return []
+        # A miss on the merged regex rules out every rule without groups
+        skip_merged = self._any_rule is not None and self._any_rule.search(password) is None
+        return [(message, penalty, reject) for rule, message, penalty, reject in self.rules
+                if not (skip_merged and not rule.groups) and rule.search(password)]
+
+
+RULE_KEYS = {'pattern', 'message', 'penalty', 'reject'}
+
+
+def _is_int(value):
+    # bool is an int subclass, but never a sensible length or penalty
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_string_list(value):
+    return isinstance(value, (list, tuple)) and all(isinstance(item, str) for item in value)
+
+
+def _check_rule(rule):
+    """Raise PolicyError unless rule is a valid {pattern, message, penalty, reject} dict"""
+    if not isinstance(rule, dict):
+        raise PolicyError(f'Rules must be objects, not {rule!r}')
+    unknown = set(rule) - RULE_KEYS
+    if unknown:
+        raise PolicyError(f'Unknown rule settings: {", ".join(sorted(unknown))}')
+    if not isinstance(rule.get('pattern'), str):
+        raise PolicyError('Every rule needs a pattern string')
+    if not isinstance(rule.get('message', ''), str):
+        raise PolicyError('Rule messages must be strings')
+    if not _is_int(rule.get('penalty', 1)):
+        raise PolicyError('Rule penalties must be integers')
+    if not isinstance(rule.get('reject', False), bool):
+        raise PolicyError('Rule reject must be true or false')
+    try:
+        re.compile(rule['pattern'])
+    except re.error as e:
+        raise PolicyError(f'Invalid rule pattern {rule["pattern"]!r}: {e}')
+
+
+# Leading global flags, e.g. '(?i)'; rewritten as a scoped group when merging
+GLOBAL_FLAGS_RE = re.compile(r'\(\?([aiLmsux]+)\)')
+
+
+def _merge_patterns(patterns):
+    """
+    One regex matching wherever any of patterns matches, or None if they
+    can't be combined (then every rule is searched on its own)
+    Patterns must have no groups: wrapping renumbers them
+    """
+    alternatives = []
+    for pattern in patterns:
+        flags = GLOBAL_FLAGS_RE.match(pattern)
+        if flags is None:
+            alternatives.append(f'(?:{pattern})')
+        elif set(flags.group(1)) <= set('imsx'):
+            alternatives.append(f'(?{flags.group(1)}:{pattern[flags.end():]})')
+        else:
+            return None
+    try:
+        return re.compile('|'.join(alternatives))
+    except re.error:
+        return None
+
+
+def _read_banned_words(path):
+    with open(path, encoding='utf-8') as source:
+        return {line.strip().lower() for line in source if line.strip()}
+
+
+def load_policies(path):
+    """{policy id: PasswordPolicy} from a JSON file ({"tenant-a": {...}, ...}); raises PolicyError"""
+    import json
+    with open(path, encoding='utf-8') as source:
+        policies = json.load(source)
+    if not isinstance(policies, dict):
+        raise PolicyError('Policy file must be a JSON object of {policy id: settings}')
+    return {policy_id: PasswordPolicy.from_dict(policy_id, config) for policy_id, config in policies.items()}
+
+
+class PolicyRegistry:
+    """
+    Policies by ID, compiled when registered and then shared, so a bad
+    policy fails there rather than on every check that names it
+    Sources are PasswordPolicy objects or config dicts
+    """
+
+    def __init__(self, common_patterns, keyboard_patterns, sources=None):
+        self._common_patterns = common_patterns
+        self._keyboard_patterns = keyboard_patterns
+        self._compiled = {}
+        self._lock = threading.Lock()
+        for policy_id, source in (sources or {}).items():
+            self.register(policy_id, source)
+
+    def register(self, policy_id, source):
+        if not isinstance(source, PasswordPolicy):
+            source = PasswordPolicy.from_dict(policy_id, source)
+        compiled = source.compile(self._common_patterns, self._keyboard_patterns)
+        with self._lock:
+            self._compiled[policy_id] = compiled
+
+    def ids(self):
+        return sorted(self._compiled)
+
+    def get(self, policy_id):
+        """The compiled policy; raises KeyError if unknown"""
+        compiled = self._compiled.get(policy_id)
+        if compiled is None:
+            raise KeyError(f'Unknown policy: {policy_id}')
+        return compiled
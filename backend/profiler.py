@@ -0,0 +1,57 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class SamplingProfiler:
+    """
+    Low-overhead wall-clock sampler for on-demand profiles
+    A background thread snapshots every thread's stack at a fixed interval
+    and counts identical stacks; nothing is recorded between runs, so it
+    costs nothing while idle. Output is collapsed-stack text, ready for
+    flamegraph.pl or speedscope
+    """
+
+    def __init__(self, interval=0.005, max_seconds=60):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._lock.locked()
+
+    def profile(self, seconds):
+        """Sample for seconds and return {stack tuple: sample count}; raises RuntimeError if busy"""
+        seconds = min(float(seconds), self.max_seconds)
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError('A profile is already running')
+        try:
+            own_thread = threading.get_ident()
+            counts = Counter()
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id != own_thread:
+                        counts[self._stack(frame)] += 1
+                time.sleep(self.interval)
+            return counts
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def _stack(frame):
+        """Frames from outermost to innermost as 'file:function' strings"""
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+            frame = frame.f_back
+        return tuple(reversed(stack))
+
+    def collapsed(self, seconds):
+        """Profile for seconds and format as collapsed stacks, hottest first"""
+        counts = self.profile(seconds)
+        return ''.join(f"{';'.join(stack)} {count}\n" for stack, count in counts.most_common())
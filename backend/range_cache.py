@@ -0,0 +1,189 @@
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+# Share of max_disk_entries a prune brings the disk tier down to, so
+# pruning (a directory scan) runs once per many writes, not on each one
+DISK_PRUNE_TO = 0.9
+
+
+class RangeCache:
+    """
+    Bounded cache of parsed range responses, keyed by 5-char hash prefix
+    In-memory LRU tier with an optional on-disk tier; entries expire after ttl seconds.
+    Expired files are deleted when read, and past max_disk_entries files
+    the expired, then least recently written, ones are deleted
+    """
+
+    def __init__(self, max_entries=4096, ttl=86400, cache_dir=None, max_disk_entries=65536, clock=time.time):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self.max_disk_entries = max_disk_entries
+        self._clock = clock
+        self._entries = OrderedDict()  # prefix -> (expires_at, {suffix: count})
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+        self._disk_entries = 0  # approximate when processes share cache_dir
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._disk_entries = len(self._disk_files())
+
+    def get(self, prefix):
+        """Return the {suffix: count} dict for a prefix, or None on a miss"""
+        now = self._clock()
+
+        with self._lock:
+            entry = self._entries.get(prefix)
+            if entry is not None:
+                expires_at, suffixes = entry
+                if expires_at > now:
+                    self._entries.move_to_end(prefix)
+                    self.hits += 1
+                    return suffixes
+                del self._entries[prefix]
+
+        suffixes = self._read_disk(prefix, now)
+
+        with self._lock:
+            if suffixes is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(prefix, suffixes, now)
+            return suffixes
+
+    def put(self, prefix, suffixes):
+        """Cache the parsed suffixes for a prefix"""
+        now = self._clock()
+        with self._lock:
+            self._store(prefix, suffixes, now)
+        self._write_disk(prefix, suffixes)
+
+    def clear(self):
+        """Drop every in-memory entry (the disk tier is left alone)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters and the current hit rate"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'disk_evictions': self.disk_evictions,
+                'hit_rate': round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _store(self, prefix, suffixes, now):
+        """Insert into the memory tier, evicting least recently used entries"""
+        self._entries[prefix] = (now + self.ttl, suffixes)
+        self._entries.move_to_end(prefix)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_path(self, prefix):
+        return os.path.join(self.cache_dir, f'{prefix}.txt')
+
+    def _disk_files(self):
+        """(mtime, path) of every entry file in the disk tier"""
+        files = []
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.txt'):
+                    try:
+                        files.append((entry.stat().st_mtime, entry.path))
+                    except OSError:  # removed meanwhile
+                        pass
+        return files
+
+    def _remove_disk(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self._disk_entries -= 1
+            self.disk_evictions += 1
+
+    def _read_disk(self, prefix, now):
+        """Load a fresh entry from the disk tier, or None (an expired one is deleted)"""
+        if not self.cache_dir:
+            return None
+
+        path = self._disk_path(prefix)
+        try:
+            if os.path.getmtime(path) + self.ttl <= now:
+                self._remove_disk(path)
+                return None
+            with open(path, encoding='ascii') as cached:
+                return parse_range(cached.read())
+        except OSError:
+            return None
+
+    def _write_disk(self, prefix, suffixes):
+        """Atomically write an entry to the disk tier"""
+        if not self.cache_dir:
+            return
+
+        path = self._disk_path(prefix)
+        existed = os.path.exists(path)
+        body = ''.join(f'{suffix}:{count}\n' for suffix, count in suffixes.items())
+        descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w', encoding='ascii') as temp_file:
+                temp_file.write(body)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        with self._lock:
+            if not existed:
+                self._disk_entries += 1
+            prune = self._disk_entries > self.max_disk_entries
+        if prune:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """Delete expired files, then the oldest, down to DISK_PRUNE_TO of max_disk_entries"""
+        files = sorted(self._disk_files())
+        expired_before = self._clock() - self.ttl
+        keep = int(self.max_disk_entries * DISK_PRUNE_TO)
+        with self._lock:
+            self._disk_entries = len(files)  # recount: other processes may share the directory
+        for position, (mtime, path) in enumerate(files):
+            if mtime > expired_before and len(files) - position <= keep:
+                break
+            self._remove_disk(path)
+
+
+def parse_range(text):
+    """Parse a range response ('SUFFIX:COUNT' per line) into {suffix: count}"""
+    suffixes = {}
+    for line in text.splitlines():
+        parts = line.split(':')
+        if len(parts) != 2:
+            continue
+        suffix, count = parts
+        suffixes[suffix] = int(count)
+    return suffixes
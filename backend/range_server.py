@@ -0,0 +1,217 @@
+"""
+Local stand-in for the Pwned Passwords range API, for load tests and
+offline development
+
+    python range_server.py --synthetic 800 --latency 40 --jitter 20 --port 8900
+    python range_server.py --index pwned.idx --error-rate 0.01 --padding
+    python range_server.py --synthetic 800 --ntlm-dump pwned-ntlm.txt
+    BREACH_API_URL=http://127.0.0.1:8900/range/ python app.py
+
+GET /range/<5 hex chars> answers with 'SUFFIX:COUNT' lines like the real
+service, from a breach index file, a plaintext password list or seeded
+synthetic hashes; ?mode=ntlm ranges come from a separate NTLM dataset.
+Latency, padding and error responses can be injected
+"""
+import argparse
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from breach_index import LocalBreachIndex
+
+# Padded responses have this many rows, like the real service's Add-Padding
+PADDED_ROWS = (800, 1000)
+
+
+def dataset_from_index(index):
+    """Dataset serving every record of a LocalBreachIndex (or index path)"""
+    if not isinstance(index, LocalBreachIndex):
+        index = LocalBreachIndex(index)
+
+    def dataset(prefix):
+        return [(digest.hex().upper()[5:], count) for digest, count in index.range_records(prefix)]
+
+    return dataset
+
+
+def dataset_from_hashes(records):
+    """Dataset of (hex hash, count) pairs, SHA-1 or NTLM"""
+    ranges = {}
+    for hex_hash, count in records:
+        hex_hash = hex_hash.upper()
+        ranges.setdefault(hex_hash[:5], []).append((hex_hash[5:], count))
+    for suffixes in ranges.values():
+        suffixes.sort()
+    return lambda prefix: ranges.get(prefix, [])
+
+
+def dataset_from_passwords(passwords, seed=0):
+    """Dataset of the given plaintext passwords with seeded breach counts"""
+    rng = random.Random(seed)
+    return dataset_from_hashes((hashlib.sha1(password.encode('utf-8')).hexdigest(), rng.randint(1, 100000))
+                               for password in dict.fromkeys(passwords))
+
+
+def synthetic_dataset(records_per_prefix=800, seed=0):
+    """
+    Seeded random suffixes, about records_per_prefix per prefix (the real
+    corpus averages ~850); generated per request, so any size costs no memory
+    """
+    def dataset(prefix):
+        rng = random.Random(f'{seed}:{prefix}')
+        count = rng.randint(records_per_prefix * 3 // 4, records_per_prefix * 5 // 4)
+        return sorted((f'{rng.getrandbits(140):035X}', rng.randint(1, 100000)) for _ in range(count))
+
+    return dataset
+
+
+class RangeServer:
+    """
+    Threaded HTTP server for a range dataset (a callable prefix -> sorted
+    [(suffix, count)]). Each response is delayed by latency plus up to
+    jitter seconds; error_rate of them fail with error_status instead.
+    padding=True fills every response with zero-count rows.
+    ntlm_dataset answers ?mode=ntlm requests (404 without one)
+    """
+
+    def __init__(self, dataset, host='127.0.0.1', port=0, latency=0, jitter=0,
+                 error_rate=0, error_status=503, padding=False, seed=None, ntlm_dataset=None):
+        self.datasets = {'sha1': dataset, 'ntlm': ntlm_dataset}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.padding = padding
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.errors = 0
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                status, body = server.respond(self.path)
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/plain')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            request_queue_size = 1024
+            daemon_threads = True
+
+        self.server = Server((host, port), Handler)
+        self.url = f'http://{host}:{self.server.server_port}/range/'
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(self):
+        """Serve from a background thread"""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def close(self):
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread.join()
+        self.server.server_close()
+
+    def respond(self, path):
+        """(status, body) for a request path, after the injected delay"""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._rng.random() * self.jitter
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+            padding_rows = self._rng.randint(*PADDED_ROWS) if self.padding else 0
+            padding_seed = self._rng.getrandbits(32)
+        if delay:
+            time.sleep(delay)
+
+        url = urlsplit(path)
+        directory, _, prefix = url.path.rpartition('/')
+        prefix = prefix.upper()
+        dataset = self.datasets.get(parse_qs(url.query).get('mode', ['sha1'])[0])
+        if directory != '/range' or len(prefix) != 5 or prefix.strip('0123456789ABCDEF') or dataset is None:
+            return 404, b'Not found'
+        if failed:
+            return self.error_status, b'Injected error'
+
+        records = dataset(prefix)
+        lines = [f'{suffix}:{count}' for suffix, count in records]
+        if len(lines) < padding_rows:
+            rng = random.Random(padding_seed)
+            # Pad with suffixes as long as the real ones (35 hex chars for SHA-1, 27 for NTLM)
+            bits = 108 if dataset is self.datasets['ntlm'] else 140
+            lines.extend(f'{rng.getrandbits(bits):0{bits // 4}X}:0' for _ in range(padding_rows - len(lines)))
+            lines.sort()
+        return 200, '\r\n'.join(lines).encode('ascii')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve a local Pwned Passwords range API for load testing')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--index', help='breach index file built by breach_index.py')
+    source.add_argument('--passwords', help='plaintext passwords, one per line, served as breached')
+    source.add_argument('--synthetic', type=int, metavar='N', help='N seeded random hashes per prefix')
+    parser.add_argument('--ntlm-dump', help='NTLM HASH:COUNT lines served for ?mode=ntlm')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency', type=float, default=0, help='added delay per response in ms')
+    parser.add_argument('--jitter', type=float, default=0, help='extra random delay of up to this many ms')
+    parser.add_argument('--error-rate', type=float, default=0, help='fraction of requests that fail')
+    parser.add_argument('--error-status', type=int, default=503, help='status of failed requests')
+    parser.add_argument('--padding', action='store_true', help='pad responses to 800-1000 rows')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.index:
+        dataset = dataset_from_index(args.index)
+    elif args.passwords:
+        with open(args.passwords, encoding='utf-8') as source:
+            dataset = dataset_from_passwords((line.rstrip('\r\n') for line in source if line.strip()), args.seed)
+    else:
+        dataset = synthetic_dataset(args.synthetic, args.seed)
+
+    ntlm_dataset = None
+    if args.ntlm_dump:
+        with open(args.ntlm_dump, encoding='ascii') as source:
+            ntlm_dataset = dataset_from_hashes((hex_hash, int(count or 0)) for hex_hash, _, count
+                                               in (line.strip().partition(':') for line in source) if hex_hash)
+
+    server = RangeServer(dataset, host=args.host, port=args.port, latency=args.latency / 1000,
+                         jitter=args.jitter / 1000, error_rate=args.error_rate, error_status=args.error_status,
+                         padding=args.padding, seed=args.seed, ntlm_dataset=ntlm_dataset)
+    print(f"✓ Serving range API on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,367 @@
+"""
+Rate limiting and admission control for the API
+
+Token buckets limit each client address, all clients together and the
+routes that call the upstream range API (so a burst can't get our egress
+address throttled). Buckets live either in this process (TokenBuckets) or
+in a small mmapped file every worker process opens (SharedTokenBuckets),
+so limits hold across uvicorn/gunicorn workers on one host.
+
+AdmissionController also sheds load before any work is done: a process
+with too many requests in flight, or whose recent upstream range calls
+have been slow, answers 429 with a Retry-After instead of queueing more
+"""
+import hashlib
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from metrics import HTTP_REQUESTS_REJECTED
+
+try:
+    import fcntl
+except ImportError:  # Windows: only in-process buckets
+    fcntl = None
+
+# rate: tokens (requests) added per second; burst: bucket capacity
+Limit = namedtuple('Limit', ['rate', 'burst'])
+
+# Why a request was turned away and how long the client should wait
+Rejection = namedtuple('Rejection', ['reason', 'retry_after'])
+
+# Only API routes are limited; these can call the range API
+LIMITED_PREFIX = '/api/'
+UPSTREAM_ROUTES = frozenset({'/api/check-breach', '/api/analyze'})
+
+REJECTION_MESSAGE = 'Too many requests, try again later'
+
+# Shared file layout:
+#   header  MAGIC, slot count
+#   slots   (key hash, tokens, updated) per slot, in sets of WAYS slots;
+#           a key lives in one set and evicts that set's stalest slot
+MAGIC = b'PWRLIM01'
+HEADER = struct.Struct('<8sQ')
+SLOT = struct.Struct('<Qdd')
+WAYS = 8
+LOCK_STRIPES = 64
+
+
+def parse_limit(text):
+    """Limit from 'RATE' or 'RATE:BURST' (burst defaults to rate); None for '', '0' or None"""
+    if not text:
+        return None
+    rate, _, burst = str(text).partition(':')
+    rate = float(rate)
+    burst = float(burst) if burst else max(rate, 1.0)
+    if rate < 0 or burst < 1:
+        raise ValueError(f'Invalid rate limit: {text!r} (expected RATE or RATE:BURST, burst >= 1)')
+    return Limit(rate, burst) if rate > 0 else None
+
+
+def _key_hash(key):
+    # 0 marks an empty slot
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little') or 1
+
+
+def _refill(tokens, updated, now, limit):
+    """Bucket level at now; a clock that went backwards (reboot) counts as a full refill"""
+    if now < updated:
+        return limit.burst
+    return min(limit.burst, tokens + (now - updated) * limit.rate)
+
+
+def _take(tokens, limit, cost):
+    """(tokens left, seconds to wait): wait is 0.0 when the cost was taken"""
+    if tokens >= cost:
+        return tokens - cost, 0.0
+    return tokens, (cost - tokens) / limit.rate
+
+
+class TokenBuckets:
+    """
+    Token buckets in this process, for a single worker
+    The least recently used keys are dropped beyond max_keys (a dropped
+    key comes back with a full bucket)
+    """
+
+    def __init__(self, max_keys=65536, clock=time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets = OrderedDict()  # key -> [tokens, updated]
+        self._lock = threading.Lock()
+
+    def take(self, key, limit, cost=1):
+        """Take cost tokens from key's bucket; returns 0.0, or the seconds until they'd be available"""
+        with self._lock:
+            # Read under the lock, so no bucket is ever updated later than now
+            now = self._clock()
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [limit.burst, now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = _refill(bucket[0], bucket[1], now, limit)
+                bucket[1] = now
+            bucket[0], wait = _take(bucket[0], limit, cost)
+        return wait
+
+    def refund(self, key, limit, cost=1):
+        """Give back tokens taken for a request that was then rejected by another limit"""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket[0] = min(limit.burst, bucket[0] + cost)
+
+    def close(self):
+        pass
+
+
+class SharedTokenBuckets:
+    """
+    Token buckets in a file mapped by every worker process
+    Put path on a tmpfs (/dev/shm) to keep it in memory. Each set of slots
+    is guarded by a byte-range lock on the file (between processes) and a
+    thread lock (fcntl locks don't exclude threads of one process).
+    time.monotonic is system-wide on Linux, so processes agree on refills
+    """
+
+    def __init__(self, path, slots=65536, clock=time.monotonic):
+        if fcntl is None:
+            raise RuntimeError('Shared rate limit state needs fcntl (POSIX); use TokenBuckets instead')
+        self.path = path
+        self._clock = clock
+        self._sets = max(1, slots // WAYS)
+        size = HEADER.size + self._sets * WAYS * SLOT.size
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            # The first process to get here lays out the file; the rest check it
+            fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            try:
+                header = os.pread(self._fd, HEADER.size, 0)
+                if len(header) < HEADER.size or HEADER.unpack(header) != (MAGIC, self._sets * WAYS):
+                    os.ftruncate(self._fd, 0)
+                    os.ftruncate(self._fd, size)
+                    os.pwrite(self._fd, HEADER.pack(MAGIC, self._sets * WAYS), 0)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+            self._map = mmap.mmap(self._fd, size)
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    def _locate(self, key):
+        key_hash = _key_hash(key)
+        set_index = key_hash % self._sets
+        return key_hash, set_index, HEADER.size + set_index * WAYS * SLOT.size
+
+    def _update(self, key, apply):
+        """Run apply(slot tokens, slot updated) -> (tokens, updated, result) on key's slot under both locks"""
+        key_hash, set_index, offset = self._locate(key)
+        length = WAYS * SLOT.size
+        with self._locks[set_index % LOCK_STRIPES]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, length, offset)
+            try:
+                found = free = stalest = None
+                for way in range(WAYS):
+                    slot_offset = offset + way * SLOT.size
+                    slot_hash, tokens, updated = SLOT.unpack_from(self._map, slot_offset)
+                    if slot_hash == key_hash:
+                        found = (slot_offset, tokens, updated)
+                        break
+                    if slot_hash == 0:
+                        free = slot_offset if free is None else free
+                    elif stalest is None or updated < stalest[1]:
+                        stalest = (slot_offset, updated)
+
+                if found is None:
+                    slot_offset = free if free is not None else stalest[0]
+                    found = (slot_offset, None, None)
+                slot_offset, tokens, updated = found
+                tokens, updated, result = apply(tokens, updated)
+                if tokens is not None:
+                    SLOT.pack_into(self._map, slot_offset, key_hash, tokens, updated)
+                return result
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, length, offset)
+
+    def take(self, key, limit, cost=1):
+        """Take cost tokens from key's bucket; returns 0.0, or the seconds until they'd be available"""
+        def apply(tokens, updated):
+            # Read under the locks: a time from before another process's
+            # update would look like the clock going backwards
+            now = self._clock()
+            tokens = limit.burst if tokens is None else _refill(tokens, updated, now, limit)
+            tokens, wait = _take(tokens, limit, cost)
+            return tokens, now, wait
+
+        return self._update(key, apply)
+
+    def refund(self, key, limit, cost=1):
+        """Give back tokens taken for a request that was then rejected by another limit"""
+        def apply(tokens, updated):
+            if tokens is None:
+                return None, None, None
+            return min(limit.burst, tokens + cost), updated, None
+
+        self._update(key, apply)
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+
+class RateLimiter:
+    """
+    The configured limits over one set of buckets
+    per_client applies to each client address, total to all requests and
+    upstream to requests that may call the range API. A request must get a
+    token from every limit that applies; when one refuses, the tokens
+    already taken are given back
+    """
+
+    def __init__(self, buckets, per_client=None, total=None, upstream=None):
+        self.buckets = buckets
+        self.per_client = per_client
+        self.total = total
+        self.upstream = upstream
+
+    def check(self, client, upstream=False):
+        """None if the request may go ahead, else a Rejection"""
+        limits = []
+        if self.per_client is not None:
+            limits.append(('client', f'client:{client}', self.per_client))
+        if self.total is not None:
+            limits.append(('total', 'total', self.total))
+        if upstream and self.upstream is not None:
+            limits.append(('upstream', 'upstream', self.upstream))
+
+        for position, (reason, key, limit) in enumerate(limits):
+            wait = self.buckets.take(key, limit)
+            if wait:
+                for _, taken_key, taken_limit in limits[:position]:
+                    self.buckets.refund(taken_key, taken_limit)
+                return Rejection(reason, wait)
+        return None
+
+
+class LatencyWindow:
+    """
+    Mean of a latency Histogram over the last complete window
+    Reads the histogram's running totals, so whatever already records
+    upstream latency feeds it without knowing about it. A window with
+    fewer than min_samples observations has no mean (None), which lets
+    traffic through again to probe an upstream that was shed
+    """
+
+    def __init__(self, histogram, window=5.0, min_samples=5, clock=time.monotonic):
+        self.histogram = histogram
+        self.window = window
+        self.min_samples = min_samples
+        self._clock = clock
+        self._started = clock()
+        self._count, self._sum = histogram.totals()
+        self._mean = None
+        self._lock = threading.Lock()
+
+    def mean(self):
+        """(mean seconds or None, seconds left in the current window)"""
+        now = self._clock()
+        with self._lock:
+            if now - self._started >= self.window:
+                count, total = self.histogram.totals()
+                observed = count - self._count
+                self._mean = (total - self._sum) / observed if observed >= self.min_samples else None
+                self._started, self._count, self._sum = now, count, total
+            return self._mean, self.window - (now - self._started)
+
+
+class AdmissionController:
+    """
+    Decides per request whether to serve it or answer 429
+    In order, cheapest first: more than max_in_flight requests already
+    running in this process, upstream range calls averaging over
+    upstream_latency seconds (upstream routes only), then the token
+    buckets. admit() counts an admitted request in flight until release().
+    Clients are told apart by address (see client_address for trusted_proxies)
+    """
+
+    def __init__(self, limiter=None, max_in_flight=0, upstream_latency=None, latency_window=None,
+                 trusted_proxies=0):
+        self.limiter = limiter
+        self.max_in_flight = max_in_flight
+        self.upstream_latency = upstream_latency
+        self.latency_window = latency_window
+        self.trusted_proxies = trusted_proxies
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def admit(self, client, upstream=False, count_in_flight=True):
+        """
+        None (and the request counts as in flight until release()) or a
+        Rejection. Long-lived connections such as WebSockets pass
+        count_in_flight=False: they are rate limited, but neither count
+        towards max_in_flight nor need a release()
+        """
+        if count_in_flight:
+            # Checked and taken in one step, so concurrent requests can't all pass
+            with self._lock:
+                if self.max_in_flight and self.in_flight >= self.max_in_flight:
+                    return self._reject(Rejection('in_flight', 1.0))
+                self.in_flight += 1
+
+        rejection = self._check(client, upstream)
+        if rejection is not None:
+            if count_in_flight:
+                self.release()
+            return self._reject(rejection)
+        return None
+
+    def _check(self, client, upstream):
+        if upstream and self.upstream_latency is not None and self.latency_window is not None:
+            mean, window_left = self.latency_window.mean()
+            if mean is not None and mean > self.upstream_latency:
+                return Rejection('upstream_latency', window_left)
+
+        if self.limiter is not None:
+            return self.limiter.check(client, upstream)
+        return None
+
+    @staticmethod
+    def _reject(rejection):
+        HTTP_REQUESTS_REJECTED.inc(rejection.reason)
+        return rejection
+
+    def release(self):
+        """An admitted request finished"""
+        with self._lock:
+            self.in_flight -= 1
+
+    def client_address(self, remote_addr, forwarded_for=None):
+        return client_address(remote_addr, forwarded_for, self.trusted_proxies)
+
+
+def retry_after_header(seconds):
+    """Retry-After value (whole seconds, at least 1)"""
+    return str(max(1, math.ceil(seconds)))
+
+
+def client_address(remote_addr, forwarded_for=None, trusted_proxies=0):
+    """
+    The address to rate limit a request by
+    Behind trusted_proxies reverse proxies the client is the entry that
+    many hops from the right of X-Forwarded-For (entries further left are
+    whatever the client sent); otherwise it's the connection's address
+    """
+    if trusted_proxies and forwarded_for:
+        hops = [hop.strip() for hop in forwarded_for.split(',') if hop.strip()]
+        if len(hops) >= trusted_proxies:
+            return hops[-trusted_proxies]
+    return remote_addr or 'unknown'
@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+
+
+def copy_result(result):
+    """Copy a strength result deep enough that callers can't mutate a cached one"""
+    copied = dict(result)
+    copied['feedback'] = list(result['feedback'])
+    if 'match_sequence' in result:
+        copied['match_sequence'] = [dict(match) for match in result['match_sequence']]
+    return copied
+
+
+def redact_result(result):
+    """
+    Copy of a strength result to cache: match tokens (slices of the
+    password) are replaced by their lengths
+    """
+    redacted = copy_result(result)
+    if 'match_sequence' in result:
+        redacted['match_sequence'] = [
+            {'pattern': match['pattern'], 'length': len(match['token'])}
+            for match in result['match_sequence']
+        ]
+    return redacted
+
+
+def restore_result(result, password):
+    """Copy of a cached result with its match tokens sliced back out of the password"""
+    restored = copy_result(result)
+    if 'match_sequence' in result:
+        # The match sequence covers the password left to right
+        restored['match_sequence'] = []
+        start = 0
+        for match in result['match_sequence']:
+            end = start + match['length']
+            restored['match_sequence'].append({'pattern': match['pattern'], 'token': password[start:end]})
+            start = end
+    return restored
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of strength results with a TTL
+    Keys are HMAC-SHA256 digests under a random per-process key, so the
+    cache never holds plaintext passwords and keys are useless outside
+    this process; store results through redact_result so values don't
+    either
+    """
+
+    def __init__(self, max_entries=10000, ttl=300, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        # hmac (and the OpenSSL hashes behind it) loads with the first cache, not on import
+        import hmac
+        self._digest = partial(hmac.digest, os.urandom(32), digest='sha256')
+        self._entries = OrderedDict()  # key -> (expires_at, result)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, password, variant=''):
+        """Keyed digest for a password (variant separates e.g. estimator modes)"""
+        message = f'{variant}\0{password}'.encode('utf-8', 'surrogatepass')
+        return self._digest(message)
+
+    def get(self, key):
+        """Cached result for a key, or None"""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, result):
+        now = self._clock()
+        with self._lock:
+            self._entries[key] = (now + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters and the current hit rate"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,146 @@
+import os
+import struct
+import threading
+import weakref
+from functools import lru_cache
+
+# Live generators; a forked child empties their buffers (see _after_fork)
+_instances = weakref.WeakSet()
+
+
+@lru_cache(maxsize=64)
+def _byte_table(pool):
+    """
+    Translation table and rejected bytes for mapping random bytes onto an ASCII pool
+    Bytes >= the largest multiple of len(pool) are dropped, so every pool
+    character is equally likely (rejection sampling, no modulo bias)
+    """
+    size = len(pool)
+    limit = 256 - 256 % size
+    table = bytes(ord(pool[byte % size]) if byte < limit else 0 for byte in range(256))
+    return table, bytes(range(limit, 256)), limit
+
+
+class SecureRandom:
+    """
+    Buffered CSPRNG for bulk generation
+    Reads os.urandom in large blocks and maps bytes onto character pools
+    with bytes.translate, so sampling runs in C rather than per character.
+    A forked child starts with an empty buffer, so it never hands out the
+    bytes its parent (or a sibling worker) will
+    """
+
+    def __init__(self, buffer_size=65536):
+        self.buffer_size = buffer_size
+        self._reset()
+        _instances.add(self)
+
+    def _reset(self):
+        self._buffer = b''
+        self._position = 0
+        # The parent's lock may have been held by another thread at fork time
+        self._lock = threading.Lock()
+
+    def read(self, size):
+        """Return size random bytes from the buffer, refilling as needed"""
+        with self._lock:
+            if size > len(self._buffer) - self._position:
+                if size > self.buffer_size:
+                    return os.urandom(size)
+                self._buffer = os.urandom(self.buffer_size)
+                self._position = 0
+            start = self._position
+            self._position += size
+            return self._buffer[start:self._position]
+
+    def randbelow(self, n):
+        """Uniform integer in [0, n)"""
+        if n <= 0:
+            raise ValueError('n must be positive')
+        bits = n.bit_length()
+        size = (bits + 7) // 8
+        mask = (1 << bits) - 1
+        while True:
+            value = int.from_bytes(self.read(size), 'little') & mask
+            if value < n:
+                return value
+
+    def randbelow_many(self, bounds):
+        """One uniform integer in [0, n) for each n in bounds, from a single read"""
+        values = struct.unpack(f'<{len(bounds)}I', self.read(4 * len(bounds)))
+        results = []
+        for value, n in zip(values, bounds):
+            # Reject the top partial range so value % n is unbiased
+            if value >= (1 << 32) - (1 << 32) % n:
+                results.append(self.randbelow(n))
+            else:
+                results.append(value % n)
+        return results
+
+    def choice(self, sequence):
+        """Uniformly chosen element of a non-empty sequence"""
+        return sequence[self.randbelow(len(sequence))]
+
+    def choice_string(self, pool, k):
+        """k characters drawn uniformly (with replacement) from pool"""
+        if not pool:
+            raise ValueError('Cannot choose from an empty pool')
+        if len(pool) > 256 or not pool.isascii():
+            return ''.join(self.choice(pool) for _ in range(k))
+
+        table, rejected, limit = _byte_table(pool)
+        chunks = []
+        remaining = k
+        while remaining > 0:
+            # Over-read by the expected rejection rate so one pass usually suffices
+            sampled = self.read(remaining * 256 // limit + 16).translate(table, rejected)
+            chunks.append(sampled[:remaining])
+            remaining -= len(chunks[-1])
+        return b''.join(chunks).decode('ascii')
+
+    def sample(self, population, k):
+        """k distinct elements in random order (partial Fisher-Yates)"""
+        if not 0 <= k <= len(population):
+            raise ValueError('Sample larger than population or is negative')
+        pool = list(population)
+        for i in range(k):
+            j = i + self.randbelow(len(pool) - i)
+            pool[i], pool[j] = pool[j], pool[i]
+        return pool[:k]
+
+    def sample_indices(self, n, k):
+        """k distinct indices from range(n) in random order, without copying a population"""
+        if not 0 <= k <= n:
+            raise ValueError('Sample larger than population or is negative')
+        chosen = []
+        seen = set()
+        while len(chosen) < k:
+            index = self.randbelow(n)
+            if index not in seen:
+                seen.add(index)
+                chosen.append(index)
+        return chosen
+
+    def insert_randomly(self, chars, extras):
+        """
+        Insert each extra character at a uniformly random position in chars
+        Equivalent to shuffling extras into chars when chars are i.i.d. uniform,
+        but costs one draw per extra instead of one per character
+        """
+        size = len(chars)
+        positions = self.randbelow_many(range(size + 1, size + len(extras) + 1))
+        for position, extra in zip(positions, extras):
+            chars.insert(position, extra)
+        return chars
+
+
+def _after_fork():
+    for instance in list(_instances):
+        instance._reset()
+
+
+if hasattr(os, 'register_at_fork'):  # POSIX
+    os.register_at_fork(after_in_child=_after_fork)
+
+# Shared per-process generator
+system_random = SecureRandom()
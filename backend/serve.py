@@ -0,0 +1,43 @@
+import argparse
+import os
+import tempfile
+
+import uvicorn
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the ASGI password API (asgi.py) under uvicorn')
+    parser.add_argument('--host', default=os.environ.get('HOST') or '127.0.0.1')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT') or 8000))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_CONCURRENCY') or os.cpu_count() or 1),
+                        help='server processes, each with its own event loop (default: CPU count)')
+    parser.add_argument('--executor', choices=['thread', 'process'],
+                        help='where strength checks run (default: STRENGTH_EXECUTOR or thread)')
+    parser.add_argument('--strength-workers', type=int, help='executor size per server process')
+    parser.add_argument('--rate-limit-state',
+                        help='file the workers share rate limit buckets through (default: RATE_LIMIT_STATE, '
+                             'or one on /dev/shm per port when there are several workers)')
+    parser.add_argument('--backlog', type=int, default=4096, help='pending connection queue size')
+    parser.add_argument('--log-level', default='warning')
+    args = parser.parse_args(argv)
+
+    # Worker processes build the app from the environment (asgi.create_app)
+    if args.executor:
+        os.environ['STRENGTH_EXECUTOR'] = args.executor
+    if args.strength_workers:
+        os.environ['STRENGTH_WORKERS'] = str(args.strength_workers)
+    if args.rate_limit_state:
+        os.environ['RATE_LIMIT_STATE'] = args.rate_limit_state
+    elif args.workers > 1 and not os.environ.get('RATE_LIMIT_STATE'):
+        # Without shared state each worker would allow the full rate
+        shared_dir = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+        os.environ['RATE_LIMIT_STATE'] = os.path.join(shared_dir, f'password-api-{args.port}.ratelimit')
+
+    print(f"🔐 Password Security Checker API (ASGI, {args.workers} worker(s))")
+    print(f"📍 Server running on http://{args.host}:{args.port}")
+    uvicorn.run('asgi:app', host=args.host, port=args.port, workers=args.workers,
+                backlog=args.backlog, log_level=args.log_level, app_dir=os.path.dirname(os.path.abspath(__file__)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+"""
+Build step and serving side for the frontend's static files
+
+    python static_assets.py                        # frontend/ -> frontend/dist/
+    python static_assets.py SOURCE_DIR OUTPUT_DIR
+
+The build gives every asset a content fingerprint (css/style.<hash>.css),
+rewrites index.html and CSS url() references to those names, and writes
+each text file precompressed beside it (.gz, and .br when the brotli
+package is installed). Fingerprinted files never change, so they are
+served with a year-long immutable Cache-Control; index.html keeps its name
+and is revalidated by ETag. Nothing is compressed per request
+"""
+import argparse
+import hashlib
+import json
+import mimetypes
+import posixpath
+import re
+import shutil
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+from compression import MAX_LEVELS, available_encodings, compress, negotiate
+
+MANIFEST = 'manifest.json'
+FINGERPRINT_LENGTH = 12
+
+# Pages users request by name keep it; everything else is fingerprinted
+ENTRY_POINTS = frozenset({'index.html'})
+TEXT_SUFFIXES = frozenset({'.html', '.css', '.js', '.svg', '.json', '.txt', '.map'})
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+
+REFERENCE_RE = re.compile(r'''(\b(?:href|src)=["']|url\(\s*["']?)([^"')\s]+)''')
+
+StaticResponse = namedtuple('StaticResponse', ['status', 'headers', 'body'])
+
+
+def _fingerprint(data):
+    return hashlib.sha256(data).hexdigest()[:FINGERPRINT_LENGTH]
+
+
+def _rewrite_references(text, relative_dir, files):
+    """
+    Point href/src/url() references at fingerprinted names
+    Relative references resolve against relative_dir and root-relative
+    ones (/js/a.js) against the build root; external URLs are left alone
+    """
+    def replace(match):
+        reference = match.group(2)
+        rooted = reference.startswith('/')
+        if reference.startswith('//'):  # protocol-relative: another host
+            return match.group(0)
+        target = posixpath.normpath(reference.lstrip('/') if rooted else posixpath.join(relative_dir, reference))
+        if target not in files:
+            return match.group(0)
+        fingerprinted = files[target]
+        if rooted:
+            return match.group(1) + '/' + fingerprinted
+        return match.group(1) + posixpath.relpath(fingerprinted, relative_dir or '.')
+
+    return REFERENCE_RE.sub(replace, text)
+
+
+def _etag_matches(etag, if_none_match):
+    """Whether an If-None-Match header (weak comparison) covers etag"""
+    def opaque(tag):
+        return tag[2:] if tag.startswith('W/') else tag
+
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or opaque(etag) in (opaque(tag) for tag in tags)
+
+
+def build_assets(source_dir, output_dir):
+    """
+    Fingerprint and precompress every file under source_dir into output_dir
+    Returns the manifest ({'files': {source path: built path}, 'etags': {...}})
+    """
+    source, output = Path(source_dir).resolve(), Path(output_dir).resolve()
+    if output.exists():
+        if not (output / MANIFEST).exists():
+            raise ValueError(f'{output} exists and is not a previous build; refusing to replace it')
+        shutil.rmtree(output)
+
+    paths = sorted(path for path in source.rglob('*')
+                   if path.is_file() and output not in path.parents and not path.name.startswith('.'))
+    # Assets others reference go first, so references can be rewritten: binaries, then CSS/JS, then pages
+    paths.sort(key=lambda path: (path.suffix in TEXT_SUFFIXES) + (path.name in ENTRY_POINTS))
+
+    files = {}
+    etags = {}
+    for path in paths:
+        relative = path.relative_to(source).as_posix()
+        data = path.read_bytes()
+        if path.suffix in TEXT_SUFFIXES:
+            relative_dir = Path(relative).parent.as_posix()
+            data = _rewrite_references(data.decode('utf-8'), '' if relative_dir == '.' else relative_dir,
+                                       files).encode('utf-8')
+
+        fingerprint = _fingerprint(data)
+        built = relative if path.name in ENTRY_POINTS else \
+            Path(relative).with_name(f'{path.stem}.{fingerprint}{path.suffix}').as_posix()
+        files[relative] = built
+        etags[built] = fingerprint
+
+        target = output / built
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        if path.suffix in TEXT_SUFFIXES:
+            for coding in available_encodings():
+                compressed = compress(data, coding, MAX_LEVELS[coding])
+                if len(compressed) < len(data):
+                    target.with_name(target.name + SUFFIXES[coding]).write_bytes(compressed)
+
+    manifest = {'files': files, 'etags': etags}
+    (output / MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding='utf-8')
+    return manifest
+
+
+class StaticAssets:
+    """
+    Serves a build_assets output directory
+    Files are read on first request and kept in memory (a frontend build
+    is small), together with their precompressed variants
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        manifest = json.loads((self.directory / MANIFEST).read_text(encoding='utf-8'))
+        self.files = manifest['files']
+        self.etags = manifest['etags']
+        self._entry_points = {built for source, built in self.files.items() if built == source}
+        self._loaded = {}  # built path -> {coding or None: bytes}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def find(cls, directory):
+        """StaticAssets for directory, or None if it has no build"""
+        if directory and (Path(directory) / MANIFEST).exists():
+            return cls(directory)
+        return None
+
+    def _variants(self, path):
+        variants = self._loaded.get(path)
+        if variants is None:
+            target = self.directory / path
+            variants = {None: target.read_bytes()}
+            for coding, suffix in SUFFIXES.items():
+                compressed = target.with_name(target.name + suffix)
+                if compressed.exists():
+                    variants[coding] = compressed.read_bytes()
+            with self._lock:
+                self._loaded[path] = variants
+        return variants
+
+    def respond(self, path, accept_encoding='', if_none_match=None):
+        """
+        StaticResponse for a request path, or None if the build doesn't have it
+        Source names (css/style.css) still work, but only fingerprinted
+        names are cacheable for good
+        """
+        path = path.lstrip('/')
+        if path in self.etags:
+            immutable = path not in self._entry_points
+        elif path in self.files:
+            path, immutable = self.files[path], False
+        else:
+            return None
+
+        variants = self._variants(path)
+        coding = negotiate(accept_encoding, [coding for coding in variants if coding is not None])
+        # Weak: the identity, gzip and br bodies differ byte for byte but
+        # share the tag, which names the content
+        etag = f'W/"{self.etags[path]}"'
+        headers = {
+            'Cache-Control': IMMUTABLE if immutable else REVALIDATE,
+            'ETag': etag
+        }
+        if len(variants) > 1:
+            headers['Vary'] = 'Accept-Encoding'
+
+        if if_none_match and _etag_matches(etag, if_none_match):
+            return StaticResponse(304, headers, b'')
+
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+            content_type += '; charset=utf-8'
+        headers['Content-Type'] = content_type
+        if coding is not None:
+            headers['Content-Encoding'] = coding
+        return StaticResponse(200, headers, variants[coding])
+
+
+def main(argv=None):
+    frontend = Path(__file__).resolve().parents[1] / 'frontend'
+    parser = argparse.ArgumentParser(description='Fingerprint and precompress the frontend for deployment')
+    parser.add_argument('source', nargs='?', default=str(frontend), help='static files (default: frontend/)')
+    parser.add_argument('output', nargs='?', default=str(frontend / 'dist'), help='build directory (default: frontend/dist/)')
+    args = parser.parse_args(argv)
+
+    manifest = build_assets(args.source, args.output)
+    print(f"✓ Built {len(manifest['files'])} files into {args.output} "
+          f"(precompressed: {', '.join(available_encodings())})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+"""
+Rule table for the built-in strength scoring, shared with the browser
+
+PasswordChecker, policy.py and pattern_scanner.py take their word lists,
+thresholds and feedback text from here, and the frontend's local engine
+(frontend/js/strength-engine.js) reads the same table as generated
+JavaScript, so as-you-type scoring needs no request:
+
+    python strength_rules.py            # writes frontend/js/strength-rules.js
+    python strength_rules.py --check    # exit 1 if that file is stale
+
+tests/test_strength_parity.py fails until the file is regenerated after
+a change here
+"""
+import math
+import os
+import sys
+from itertools import combinations
+
+# Built-in common passwords (exact, case-insensitive matches)
+COMMON_PASSWORDS = (
+    'password', '123456', '12345678', 'qwerty', 'abc123',
+    'monkey', '1234567', 'letmein', 'trustno1', 'dragon',
+    'baseball', 'iloveyou', 'master', 'sunshine', 'ashley',
+    'bailey', 'passw0rd', 'shadow', '123123', '654321',
+    'superman', 'qazwsx', 'michael', 'football'
+)
+
+# Substrings that cost a point (case-insensitive)
+COMMON_PATTERNS = ('123', 'abc', 'qwerty', 'asdf', 'zxcv', 'password', 'pass', 'admin', 'user', 'login')
+KEYBOARD_PATTERNS = ('qwertyuiop', 'asdfghjkl', 'zxcvbnm', '1qaz2wsx', 'qweasd', 'zaqwsx')
+
+SPECIAL_CHARS = '!@#$%^&*()_+-=[]{};:\'",.<>?/\\|`~'
+
+# Three consecutive characters of one of these (either direction) are a sequence
+SEQUENCES = ('abcdefghijklmnopqrstuvwxyz', '0123456789')
+
+# Length points: 0 below MIN_LENGTH, 1 below GOOD_LENGTH, 2 below EXCELLENT_LENGTH, else 3
+MIN_LENGTH = 8
+GOOD_LENGTH = 12
+EXCELLENT_LENGTH = 16
+
+# Length (0-3) + character diversity (0-4)
+MAX_SCORE = 7
+EXCELLENT_SCORE = 6
+GOOD_SCORE = 4
+
+PENALTIES = {
+    'common': 2,
+    'pattern': 1,
+    'keyboard': 1,
+    'repetition': 1,
+    'sequence': 1,
+    'banned': 2
+}
+
+# Diversity classes, in feedback order
+CLASS_DESCRIPTIONS = {
+    'lower': 'lowercase letters (a-z)',
+    'upper': 'uppercase letters (A-Z)',
+    'digit': 'numbers (0-9)',
+    'special': 'special characters (!@#$%...)'
+}
+
+# Entropy: length x log2(sum of the pools present)
+POOL_SIZES = {'lower': 26, 'upper': 26, 'digit': 10, 'non_alnum': 32}
+
+# Crack time at GUESSES_PER_SECOND, average case (half the space):
+# (below this many seconds, seconds per unit, unit), then years
+GUESSES_PER_SECOND = 10_000_000_000
+CRACK_TIME_UNITS = (
+    (60, 1, 'seconds'),
+    (3600, 60, 'minutes'),
+    (86400, 3600, 'hours'),
+    (2592000, 86400, 'days'),
+    (31536000, 2592000, 'months')
+)
+YEAR_SECONDS = 31536000
+MAX_YEARS = 1_000_000
+
+# (percentage below, level); the last level covers the rest
+STRENGTH_LEVELS = ((30, 'Very Weak'), (55, 'Weak'), (80, 'Medium'), (None, 'Strong'))
+
+FEEDBACK = {
+    'empty': 'Please enter a password',
+    'too_short': '❌ Too short (minimum {min_length} characters)',
+    'consider_length': '⚠️ Consider using {good_length}+ characters',
+    'good_length': '✓ Good length',
+    'excellent_length': '✓ Excellent length',
+    'add_class': '➕ Add {description}',
+    'common': '❌ This is a commonly used password',
+    'pattern': '⚠️ Contains common patterns (123, abc, etc.)',
+    'keyboard': '⚠️ Contains keyboard patterns (qwerty, asdf, etc.)',
+    'repetition': '⚠️ Contains repetitive characters',
+    'sequence': '⚠️ Contains sequential characters',
+    'excellent': '✓ Excellent password strength!',
+    'good': '✓ Good password strength'
+}
+
+
+def _pool_bits():
+    # log2 of every possible pool, computed once here so both engines
+    # multiply by the same float (and round entropy the same way)
+    sizes = list(POOL_SIZES.values())
+    totals = {sum(chosen) for count in range(1, len(sizes) + 1) for chosen in combinations(sizes, count)}
+    return {total: math.log2(total) for total in sorted(totals)}
+
+
+POOL_BITS = _pool_bits()
+
+JS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'frontend', 'js', 'strength-rules.js')
+
+
+def rule_table():
+    """Everything above as one JSON-serializable dict"""
+    return {
+        'common_passwords': list(COMMON_PASSWORDS),
+        'common_patterns': list(COMMON_PATTERNS),
+        'keyboard_patterns': list(KEYBOARD_PATTERNS),
+        'special_chars': SPECIAL_CHARS,
+        'sequences': list(SEQUENCES),
+        'min_length': MIN_LENGTH,
+        'good_length': GOOD_LENGTH,
+        'excellent_length': EXCELLENT_LENGTH,
+        'max_score': MAX_SCORE,
+        'excellent_score': EXCELLENT_SCORE,
+        'good_score': GOOD_SCORE,
+        'penalties': PENALTIES,
+        'class_descriptions': CLASS_DESCRIPTIONS,
+        'pool_sizes': POOL_SIZES,
+        'pool_bits': {str(total): bits for total, bits in POOL_BITS.items()},
+        'guesses_per_second': GUESSES_PER_SECOND,
+        'crack_time_units': [list(unit) for unit in CRACK_TIME_UNITS],
+        'year_seconds': YEAR_SECONDS,
+        'max_years': MAX_YEARS,
+        'strength_levels': [list(level) for level in STRENGTH_LEVELS],
+        'feedback': FEEDBACK
+    }
+
+
+def render_js():
+    """Source of frontend/js/strength-rules.js"""
+    import json
+    table = json.dumps(rule_table(), indent=4, ensure_ascii=False)
+    return ('// Generated by backend/strength_rules.py from the Python scoring rules; do not edit.\n'
+            '// Regenerate with: python backend/strength_rules.py\n'
+            f'const STRENGTH_RULES = {table};\n'
+            "if (typeof module !== 'undefined') {\n"
+            '    module.exports = STRENGTH_RULES;\n'
+            '}\n')
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Generate the browser copy of the strength rule table')
+    parser.add_argument('output', nargs='?', default=JS_PATH, help='default: frontend/js/strength-rules.js')
+    parser.add_argument('--check', action='store_true', help='only check that output is up to date')
+    args = parser.parse_args(argv)
+
+    source = render_js()
+    if args.check:
+        current = None
+        if os.path.exists(args.output):
+            with open(args.output, encoding='utf-8') as existing:
+                current = existing.read()
+        if current != source:
+            print(f'✗ {args.output} is stale; run: python strength_rules.py', file=sys.stderr)
+            return 1
+        print(f'✓ {args.output} is up to date')
+        return 0
+    with open(args.output, 'w', encoding='utf-8', newline='\n') as output:
+        output.write(source)
+    print(f'✓ Wrote {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,247 @@
+import argparse
+import heapq
+import mmap
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+
+# File layout:
+#   header   MAGIC, version, word count, data size
+#   offsets  (count + 1) little-endian uint64 offsets into data, sorted by word
+#   ranks    count little-endian uint32 ranks (1 = most common)
+#   data     UTF-8 words, concatenated in sorted order
+MAGIC = b'PWWORDS1'
+VERSION = 1
+HEADER = struct.Struct('<8sIQQ')
+OFFSET = struct.Struct('<Q')
+RANK = struct.Struct('<I')
+
+# Words deduplicated and sorted in memory at a time while building (about
+# 100 MB); a longer list is written as sorted runs of this many to
+# temporary files and merged, so a rockyou-sized list is never held whole
+RUN_SIZE = 250_000
+RUN_RECORD = struct.Struct('<II')  # encoded length, rank; the word follows
+# Offsets and ranks buffered before each write while building
+WRITE_CHUNK = 65536
+
+
+def read_wordlist(lines, limit=None):
+    """
+    Yield lowercased words from a frequency-ordered wordlist (rank = line number)
+    Undecodable and blank lines are skipped but still count towards rank
+    """
+    for rank, line in enumerate(lines, 1):
+        if limit is not None and rank > limit:
+            break
+        if isinstance(line, bytes):
+            try:
+                line = line.decode('utf-8')
+            except UnicodeDecodeError:
+                continue
+        word = line.rstrip('\r\n').lower()
+        if word:
+            yield word, rank
+
+
+def build_wordlist(words, output_path, run_size=RUN_SIZE, temp_dir=None):
+    """
+    Write (word, rank) pairs into a sorted, mmap-able wordlist file
+    Duplicates keep their best (lowest) rank. Words are sorted run_size at
+    a time and the runs merged through temporary files in temp_dir, so
+    memory stays flat however long the list is. Returns the number of words
+    """
+    with tempfile.TemporaryDirectory(prefix='wordlist-', dir=temp_dir) as directory:
+        runs = []
+        try:
+            for run in _sorted_runs(words, run_size):
+                runs.append(_write_run(run, directory, len(runs)))
+            merged = heapq.merge(*(_read_run(run) for run in runs))
+            return _write_index(_best_ranks(merged), output_path, directory)
+        finally:
+            for run in runs:
+                run.close()
+
+
+def _sorted_runs(words, run_size):
+    """Yield sorted (encoded word, best rank) lists of at most run_size words"""
+    best_ranks = {}
+    for word, rank in words:
+        encoded = word.encode('utf-8')
+        if encoded not in best_ranks or rank < best_ranks[encoded]:
+            best_ranks[encoded] = rank
+            if len(best_ranks) >= run_size:
+                yield sorted(best_ranks.items())
+                best_ranks = {}
+    if best_ranks:
+        yield sorted(best_ranks.items())
+
+
+def _write_run(run, directory, number):
+    """Sorted run in a temporary file, rewound for reading"""
+    spilled = open(f'{directory}/run-{number}', 'w+b')
+    for word, rank in run:
+        spilled.write(RUN_RECORD.pack(len(word), rank))
+        spilled.write(word)
+    spilled.seek(0)
+    return spilled
+
+
+def _read_run(spilled):
+    """Yield the (encoded word, rank) records of a run file"""
+    while True:
+        header = spilled.read(RUN_RECORD.size)
+        if not header:
+            return
+        length, rank = RUN_RECORD.unpack(header)
+        yield spilled.read(length), rank
+
+
+def _best_ranks(records):
+    """First (best-ranked) record of each word in (word, rank)-sorted records"""
+    previous = None
+    for word, rank in records:
+        if word != previous:
+            previous = word
+            yield word, rank
+
+
+def _write_index(records, output_path, directory):
+    """
+    Write sorted, unique (encoded word, rank) records as a wordlist file
+    Offsets, ranks and data go to their own temporary files first, since
+    the header and sections ahead of the data need the final count
+    """
+    count = 0
+    total = 0
+    offsets = array('Q', [0])
+    ranks = array('I')
+
+    def flush(section, values):
+        if sys.byteorder != 'little':
+            values.byteswap()
+        section.write(values.tobytes())
+        del values[:]
+
+    with open(f'{directory}/offsets', 'w+b') as offsets_file, \
+            open(f'{directory}/ranks', 'w+b') as ranks_file, \
+            open(f'{directory}/data', 'w+b') as data_file:
+        for word, rank in records:
+            data_file.write(word)
+            total += len(word)
+            count += 1
+            offsets.append(total)
+            ranks.append(rank)
+            if len(ranks) >= WRITE_CHUNK:
+                flush(offsets_file, offsets)
+                flush(ranks_file, ranks)
+        flush(offsets_file, offsets)
+        flush(ranks_file, ranks)
+
+        with open(output_path, 'wb') as output:
+            output.write(HEADER.pack(MAGIC, VERSION, count, total))
+            for section in (offsets_file, ranks_file, data_file):
+                section.seek(0)
+                shutil.copyfileobj(section, output)
+
+    return count
+
+
+def build_wordlist_from_file(wordlist_path, output_path, limit=None, temp_dir=None):
+    """Import a newline-delimited wordlist (e.g. rockyou.txt) into a wordlist file"""
+    with open(wordlist_path, 'rb') as wordlist:
+        return build_wordlist(read_wordlist(wordlist, limit), output_path, temp_dir=temp_dir)
+
+
+class WordlistIndex:
+    """
+    Memory-mapped common-password list
+    Lookups binary-search the sorted offsets in place: O(log n) with
+    nothing but the pages touched held in memory
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f'{self.path} is not a wordlist file')
+
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f'{self.path} is not a wordlist file')
+
+        magic, version, self.word_count, data_size = HEADER.unpack_from(self._map, 0)
+        self._offsets_at = HEADER.size
+        self._ranks_at = self._offsets_at + (self.word_count + 1) * OFFSET.size
+        self._data_at = self._ranks_at + self.word_count * RANK.size
+
+        if magic != MAGIC or version != VERSION or len(self._map) < self._data_at + data_size:
+            self.close()
+            raise ValueError(f'{self.path} is not a wordlist file')
+
+    def __len__(self):
+        return self.word_count
+
+    def __contains__(self, word):
+        return self.rank(word) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the memory map and file handle"""
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def _word_at(self, number):
+        start, end = struct.unpack_from('<QQ', self._map, self._offsets_at + number * OFFSET.size)
+        return self._map[self._data_at + start:self._data_at + end]
+
+    def _lower_bound(self, target):
+        """Number of the first word not below target (bytes)"""
+        low, high = 0, self.word_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._word_at(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def rank(self, word):
+        """Rank of a (lowercased) word, 1 = most common, or None if absent"""
+        target = word.encode('utf-8', 'surrogatepass')
+        number = self._lower_bound(target)
+        if number < self.word_count and self._word_at(number) == target:
+            return RANK.unpack_from(self._map, self._ranks_at + number * RANK.size)[0]
+        return None
+
+    def has_prefix(self, prefix):
+        """Whether any word starts with prefix (lowercased)"""
+        target = prefix.encode('utf-8', 'surrogatepass')
+        number = self._lower_bound(target)
+        return number < self.word_count and self._word_at(number).startswith(target)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build a common-password index from a frequency-ordered wordlist')
+    parser.add_argument('wordlist', help='newline-delimited wordlist, most common first (e.g. rockyou.txt)')
+    parser.add_argument('output', help='index file to write')
+    parser.add_argument('--limit', type=int, help='only import the first N lines')
+    parser.add_argument('--temp-dir', help='where sorted runs are merged from (default: system temp)')
+    args = parser.parse_args(argv)
+
+    total = build_wordlist_from_file(args.wordlist, args.output, args.limit, args.temp_dir)
+    print(f"✓ Indexed {total:,} words into {args.output}")
+
+
+if __name__ == '__main__':
+    main()
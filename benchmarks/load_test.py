@@ -0,0 +1,190 @@
+"""
+Load test for /api/check-breach against a local range API
+
+    python benchmarks/load_test.py                              # ASGI server, 1-256 clients
+    python benchmarks/load_test.py --server flask --latency 80 --jitter 40
+    python benchmarks/load_test.py --target http://127.0.0.1:8000 --concurrency 16,64
+
+Unless --target is given, the harness starts range_server.py (serving
+--hit-rate of the generated passwords as breached) and the API server
+pointed at it through BREACH_API_URL, then ramps up concurrent clients and
+reports throughput and tail latency at each level. The range cache is off
+unless --cache is passed, so every request reaches the range server
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiohttp
+
+from run_benchmarks import BACKEND_DIR, _git_commit, make_corpus, summarize
+
+
+def _free_port():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def _wait_for_port(port, process, timeout=30):
+    """Block until something accepts connections on port, or fail if process exits"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{process.args[1]} exited with status {process.returncode}')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'{process.args[1]} did not start listening on port {port}')
+
+
+def _spawn(arguments, port, env=None):
+    process = subprocess.Popen([sys.executable] + arguments, cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_for_port(port, process)
+    except RuntimeError:
+        process.kill()
+        raise
+    return process
+
+
+async def run_level(url, passwords, concurrency, duration):
+    """Hammer url with concurrency clients for duration seconds"""
+    timings = []
+    errors = {}
+    next_password = iter(range(sys.maxsize))
+
+    def record_error(kind):
+        errors[kind] = errors.get(kind, 0) + 1
+
+    async def client(session, deadline):
+        clock = time.perf_counter
+        while clock() < deadline:
+            password = passwords[next(next_password) % len(passwords)]
+            started = clock()
+            try:
+                async with session.post(url, json={'password': password}) as response:
+                    body = await response.json(content_type=None)
+                    status = response.status
+            except aiohttp.ClientError as e:
+                record_error(type(e).__name__)
+                continue
+            timings.append(clock() - started)
+            if status != 200:
+                record_error(f'http_{status}')
+            elif not body['data'].get('checked'):
+                record_error('unchecked')
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(client(session, deadline) for _ in range(concurrency)))
+        total = time.perf_counter() - started
+
+    if not timings:
+        return {'calls': 0, 'errors': errors}
+    stats = summarize(timings, total)
+    stats['errors'] = errors
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test /api/check-breach at rising concurrency')
+    parser.add_argument('--target', help='base URL of a running API (skips starting servers)')
+    parser.add_argument('--server', choices=['asgi', 'flask'], default='asgi', help='API server to start')
+    parser.add_argument('--workers', type=int, default=1, help='ASGI server processes')
+    parser.add_argument('--concurrency', default='1,4,16,64,256', help='comma-separated client counts')
+    parser.add_argument('--duration', type=float, default=5, help='seconds per concurrency level')
+    parser.add_argument('-n', '--size', type=int, default=20000, help='distinct passwords sent')
+    parser.add_argument('--hit-rate', type=float, default=0.5, help='fraction of passwords served as breached')
+    parser.add_argument('--latency', type=float, default=30, help='range server delay per response in ms')
+    parser.add_argument('--jitter', type=float, default=20, help='extra random range server delay in ms')
+    parser.add_argument('--error-rate', type=float, default=0, help='fraction of range requests that fail')
+    parser.add_argument('--padding', action='store_true', help='pad range responses to 800-1000 rows')
+    parser.add_argument('--cache', action='store_true', help='keep the API range cache on')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('-o', '--output', default='load_output.json', help='JSON results file')
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.concurrency.split(',')]
+    passwords = make_corpus(args.size, args.seed)
+    processes = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            target = args.target
+            if target is None:
+                breached_path = os.path.join(directory, 'breached.txt')
+                with open(breached_path, 'w', encoding='utf-8') as breached:
+                    breached.writelines(f'{password}\n' for password in passwords[:int(len(passwords) * args.hit_rate)])
+
+                range_port = _free_port()
+                processes.append(_spawn([
+                    'range_server.py', '--passwords', breached_path, '--port', str(range_port),
+                    '--latency', str(args.latency), '--jitter', str(args.jitter),
+                    '--error-rate', str(args.error_rate), '--seed', str(args.seed)
+                ] + (['--padding'] if args.padding else []), range_port))
+
+                env = dict(os.environ, BREACH_API_URL=f'http://127.0.0.1:{range_port}/range/')
+                for name in ('BREACH_INDEX_PATH', 'BREACH_FILTER_PATH', 'BREACH_CACHE_DIR'):
+                    env.pop(name, None)
+                if not args.cache:
+                    env['BREACH_CACHE_SIZE'] = '0'
+
+                api_port = _free_port()
+                if args.server == 'asgi':
+                    command = ['serve.py', '--port', str(api_port), '--workers', str(args.workers)]
+                else:
+                    command = ['-m', 'flask', '--app', 'app', 'run', '--port', str(api_port),
+                               '--with-threads', '--no-reload', '--no-debugger']
+                processes.append(_spawn(command, api_port, env))
+                target = f'http://127.0.0.1:{api_port}'
+
+            url = target.rstrip('/') + '/api/check-breach'
+            print(f"Load testing {url} for {args.duration:g}s per level")
+            results = {}
+            for concurrency in levels:
+                stats = asyncio.run(run_level(url, passwords, concurrency, args.duration))
+                results[f'concurrency={concurrency}'] = stats
+                if stats['calls']:
+                    print(f"  {concurrency:>5} clients  {stats['throughput_per_s']:>9,.0f} req/s  "
+                          f"p50 {stats['p50_us'] / 1000:>8.2f} ms  p90 {stats['p90_us'] / 1000:>8.2f} ms  "
+                          f"p99 {stats['p99_us'] / 1000:>8.2f} ms  errors {sum(stats['errors'].values())}")
+                else:
+                    print(f"  {concurrency:>5} clients  no successful requests  errors {stats['errors']}")
+        finally:
+            for process in processes:
+                process.terminate()
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+    report = {
+        'commit': _git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {name: value for name, value in vars(args).items() if name != 'output'},
+        'results': {'check_breach': results}
+    }
+    with open(args.output, 'w', encoding='utf-8') as output:
+        json.dump(report, output, indent=2)
+    print(f"\n✓ Results saved to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+Benchmarks for the checker, breach lookup and generator hot paths, and
+for cold start (import and first call in a fresh interpreter)
+
+    python benchmarks/run_benchmarks.py -o bench.json
+    python benchmarks/run_benchmarks.py -o new.json --compare bench.json
+    python benchmarks/run_benchmarks.py --suite startup
+
+Corpora are generated from a fixed seed, so runs on different commits
+measure the same inputs
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = str(Path(__file__).resolve().parents[1] / 'backend')
+sys.path.insert(0, BACKEND_DIR)
+
+from breach_checker import BreachChecker
+from breach_index import LocalBreachIndex, build_index
+from password_checker import PasswordChecker
+from password_generator import PasswordGenerator
+from range_server import RangeServer, dataset_from_passwords
+
+CHARSETS = {
+    'lower': string.ascii_lowercase,
+    'alnum': string.ascii_letters + string.digits,
+    'full': string.ascii_letters + string.digits + '!@#$%^&*()-_=+[]{};:,.<>?',
+    'unicode': string.ascii_letters + 'äöüßéèñçΣσЖж中文日本'
+}
+LENGTHS = [8, 12, 16, 32, 64]
+WORDS = ['password', 'qwerty', 'dragon', 'summer', 'admin', 'letmein', 'monkey']
+
+
+def make_corpus(size, seed=1234):
+    """Synthetic passwords across charsets and lengths, plus patterned ones"""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        if i % 4 == 0:
+            # Human-style: word + year + symbol
+            corpus.append(rng.choice(WORDS).capitalize() + str(rng.randint(1950, 2025)) + rng.choice('!@#$'))
+        else:
+            charset = CHARSETS[rng.choice(list(CHARSETS))]
+            corpus.append(''.join(rng.choice(charset) for _ in range(rng.choice(LENGTHS))))
+    return corpus
+
+
+def measure(function, inputs, repeat=1):
+    """Per-call latency percentiles (microseconds) and throughput (calls/s)"""
+    timings = []
+    clock = time.perf_counter
+    started = clock()
+    for _ in range(repeat):
+        for item in inputs:
+            call_started = clock()
+            function(item)
+            timings.append(clock() - call_started)
+    total = clock() - started
+    return summarize(timings, total)
+
+
+def summarize(timings, total):
+    """Percentiles (microseconds) and throughput for per-call timings in seconds"""
+    timings = sorted(timings)
+
+    def percentile(fraction):
+        return round(timings[min(len(timings) - 1, int(len(timings) * fraction))] * 1e6, 3)
+
+    return {
+        'calls': len(timings),
+        'p50_us': percentile(0.50),
+        'p90_us': percentile(0.90),
+        'p99_us': percentile(0.99),
+        'max_us': round(timings[-1] * 1e6, 3),
+        'throughput_per_s': round(len(timings) / total, 1)
+    }
+
+
+def bench_checker(corpus):
+    checker = PasswordChecker()
+    results = {
+        'check_strength': measure(checker.check_strength, corpus),
+        'check_strength_guesses': measure(lambda p: checker.check_strength(p, estimator='guesses'), corpus[:2000]),
+        'check_strength_batch': measure(checker.check_strength_batch, [corpus[i:i + 1000] for i in range(0, len(corpus), 1000)])
+    }
+    results['check_strength_batch']['per_password_p50_us'] = round(results['check_strength_batch']['p50_us'] / 1000, 3)
+
+    for name in ('_is_common_password', '_has_common_patterns', '_has_keyboard_patterns',
+                 '_has_repetitions', '_has_sequential_chars', '_check_diversity', '_calculate_entropy'):
+        results[name] = measure(getattr(checker, name), corpus)
+    results['scanner.scan'] = measure(checker._scanner.scan, corpus)
+
+    for length in LENGTHS:
+        subset = [password for password in corpus if len(password) == length]
+        if subset:
+            results[f'check_strength[len={length}]'] = measure(checker.check_strength, subset)
+    return results
+
+
+def bench_breach(corpus):
+    # Half the lookups hit, half miss
+    breached = corpus[::2]
+    results = {}
+
+    with RangeServer(dataset_from_passwords(breached)) as stub:
+        cold = BreachChecker(cache_size=0, api_url=stub.url)
+        results['check_breach[stub, no cache]'] = measure(cold.check_breach, corpus[:500])
+
+        cached = BreachChecker(api_url=stub.url)
+        results['check_breach[stub, cached]'] = measure(cached.check_breach, corpus[:500], repeat=3)
+
+    with tempfile.TemporaryDirectory() as directory:
+        index_path = os.path.join(directory, 'bench.idx')
+        records = sorted(
+            (hashlib.sha1(password.encode('utf-8')).digest(), i + 1)
+            for i, password in enumerate(dict.fromkeys(breached))
+        )
+        build_index(records, index_path)
+        with LocalBreachIndex(index_path) as index:
+            local = BreachChecker(local_index=index)
+            results['check_breach[local index]'] = measure(local.check_breach, corpus)
+    return results
+
+
+def bench_generator(size):
+    generator = PasswordGenerator()
+    lengths = [LENGTHS[i % len(LENGTHS)] for i in range(size)]
+    return {
+        'generate': measure(lambda length: generator.generate(length=length), lengths),
+        'generate[exclude_ambiguous]': measure(lambda length: generator.generate(length=length, exclude_ambiguous=True), lengths),
+        'generate_passphrase': measure(lambda count: generator.generate_passphrase(word_count=count), [4, 5, 6] * (size // 3))
+    }
+
+
+# Cold start scenarios: (import statement, first call), each run in a fresh interpreter
+STARTUP_SCENARIOS = {
+    'library': (
+        'import password_checker',
+        "password_checker.PasswordChecker().check_strength('Tr0ub4dor&3')"
+    ),
+    'library[package]': (
+        'import backend',
+        "backend.PasswordChecker().check_strength('Tr0ub4dor&3')"
+    ),
+    'server': (
+        'import app',
+        "app.app.test_client().post('/api/check-strength', json={'password': 'Tr0ub4dor&3'})"
+    )
+}
+
+_STARTUP_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+{statement}
+imported = time.perf_counter()
+{first_call}
+finished = time.perf_counter()
+print(json.dumps({{'import': imported - started, 'first_call': finished - imported}}))
+"""
+
+
+def bench_startup(runs):
+    """
+    Import and first-call latency of the library-only and server paths
+    Runs never share an interpreter, so every one pays the full cold start
+    ('process' adds interpreter startup, as a serverless instance would)
+    """
+    # Keep deployment settings (wordlists, index files) out of the measurement
+    env = {name: value for name, value in os.environ.items()
+           if not name.endswith(('_PATH', '_WORDLISTS', '_CACHE_DIR'))}
+    env['PYTHONPATH'] = os.pathsep.join([BACKEND_DIR, str(Path(BACKEND_DIR).parent)])
+
+    results = {}
+    for name, (statement, first_call) in STARTUP_SCENARIOS.items():
+        script = _STARTUP_SCRIPT.format(statement=statement, first_call=first_call)
+        timings = {'import': [], 'first_call': [], 'process': []}
+        for _ in range(runs):
+            started = time.perf_counter()
+            output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                                    env=env, check=True).stdout
+            timings['process'].append(time.perf_counter() - started)
+            for phase, seconds in json.loads(output.splitlines()[-1]).items():
+                timings[phase].append(seconds)
+        for phase, phase_timings in timings.items():
+            results[f'{name}:{phase}'] = summarize(phase_timings, sum(phase_timings))
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline, threshold):
+    """Print p50 changes against a previous run; returns the regressions"""
+    regressions = []
+    for suite, benchmarks in current['results'].items():
+        for name, stats in benchmarks.items():
+            previous = baseline.get('results', {}).get(suite, {}).get(name)
+            if not previous or not previous.get('p50_us'):
+                continue
+            change = stats['p50_us'] / previous['p50_us'] - 1
+            marker = '⚠️' if change > threshold else ' '
+            print(f"{marker} {suite}/{name}: {previous['p50_us']:.2f} → {stats['p50_us']:.2f} µs ({change:+.0%})")
+            if change > threshold:
+                regressions.append(f'{suite}/{name}')
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the password checker hot paths')
+    parser.add_argument('-o', '--output', default='bench_output.json', help='JSON results file')
+    parser.add_argument('-n', '--size', type=int, default=20000, help='corpus size')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--suite', action='append', choices=['checker', 'breach', 'generator', 'startup'],
+                        help='run only these suites (repeatable)')
+    parser.add_argument('--compare', help='previous results JSON to compare against')
+    parser.add_argument('--startup-runs', type=int, default=10, help='fresh interpreters per startup scenario')
+    parser.add_argument('--threshold', type=float, default=0.10, help='p50 slowdown that counts as a regression')
+    args = parser.parse_args(argv)
+
+    suites = args.suite or ['checker', 'breach', 'generator']
+    corpus = make_corpus(args.size, args.seed)
+
+    results = {}
+    if 'checker' in suites:
+        results['checker'] = bench_checker(corpus)
+    if 'breach' in suites:
+        results['breach'] = bench_breach(corpus)
+    if 'generator' in suites:
+        results['generator'] = bench_generator(min(args.size, 5000))
+    if 'startup' in suites:
+        results['startup'] = bench_startup(args.startup_runs)
+
+    report = {
+        'commit': _git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus_size': args.size,
+        'seed': args.seed,
+        'results': results
+    }
+
+    with open(args.output, 'w', encoding='utf-8') as output:
+        json.dump(report, output, indent=2)
+
+    for suite, benchmarks in results.items():
+        print(f"\n{suite}")
+        for name, stats in benchmarks.items():
+            print(f"  {name:40} p50 {stats['p50_us']:>9.2f} µs  p99 {stats['p99_us']:>9.2f} µs  "
+                  f"{stats['throughput_per_s']:>12,.0f}/s")
+    print(f"\n✓ Results saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as previous:
+            regressions = compare(report, json.load(previous), args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) above {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,6 +3,13 @@ const API_BASE_URL = 'http://localhost:5000/api';
 
 // ===== STATE =====
 let currentPassword = '';
+let strengthWorker = null;      // scores as-you-type text off the main thread
+let strengthRequest = 0;        // id of the newest text sent to the worker
+let strengthRequestText = '';   // and the text itself
+
+// Same rules as the server's check_strength (strength-rules.js is generated
+// from the Python module); used directly when there is no worker
+const checkStrengthLocally = createStrengthChecker(STRENGTH_RULES);
 
 // ===== DOM ELEMENTS =====
 const elements = {
@@ -69,22 +76,26 @@ elements.togglePassword.addEventListener('click', () => {
     elements.togglePassword.textContent = type === 'password' ? '👁️' : '🙈';
 });
 
-// Real-time password checking
-elements.passwordInput.addEventListener('input', debounce(() => {
+// Real-time password checking, scored locally on every keystroke
+elements.passwordInput.addEventListener('input', () => {
     const password = elements.passwordInput.value;
     if (password) {
-        checkPasswordStrength(password);
+        scorePasswordStrength(password);
     } else {
         elements.strengthSection.style.display = 'none';
         elements.breachSection.style.display = 'none';
     }
-}, 500));
+});
 
-// Check Password Button
+// Check Password Button (strength locally, breach status from the server)
 elements.checkButton.addEventListener('click', () => {
     const password = elements.passwordInput.value;
     if (password) {
-        checkPasswordStrength(password);
+        // Scored on this thread so a late worker reply can't clear the breach result
+        strengthRequest += 1;
+        displayStrengthResults(checkStrengthLocally(password));
+        currentPassword = password;
+        checkPasswordBreach(password);
     } else {
         alert('Please enter a password to check');
     }
@@ -163,29 +174,54 @@ function switchTab(tabName) {
 }
 
 /**
- * Check password strength
+ * Start the strength worker from the engine script the page loaded (its
+ * fingerprinted URL in a build); null where workers can't run, e.g. file://
  */
-async function checkPasswordStrength(password) {
+function startStrengthWorker() {
+    const engine = document.getElementById('strengthEngine');
+    if (!('Worker' in window) || !engine) {
+        return null;
+    }
+    
+    let worker;
     try {
-        const response = await fetch(`${API_BASE_URL}/check-strength`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({ password })
-        });
-        
-        const result = await response.json();
-        
-        if (result.success) {
-            displayStrengthResults(result.data);
-            currentPassword = password;
-        } else {
-            console.error('Error:', result.error);
-        }
+        worker = new Worker(engine.src);
     } catch (error) {
-        console.error('Network error:', error);
-        alert('Error connecting to server. Make sure the backend is running.');
+        return null;
+    }
+    
+    worker.addEventListener('message', (event) => {
+        // Replies can trail the input; only show the newest
+        if (event.data.id === strengthRequest) {
+            displayStrengthResults(event.data.result);
+            currentPassword = strengthRequestText;
+        }
+    });
+    
+    worker.addEventListener('error', () => {
+        // Failed to load: score on this thread from now on
+        worker.terminate();
+        strengthWorker = null;
+        if (elements.passwordInput.value) {
+            scorePasswordStrength(elements.passwordInput.value);
+        }
+    });
+    
+    worker.postMessage({ rules: STRENGTH_RULES });
+    return worker;
+}
+
+/**
+ * Score password strength without a server round trip
+ */
+function scorePasswordStrength(password) {
+    if (strengthWorker) {
+        strengthRequest += 1;
+        strengthRequestText = password;
+        strengthWorker.postMessage({ id: strengthRequest, password });
+    } else {
+        displayStrengthResults(checkStrengthLocally(password));
+        currentPassword = password;
     }
 }
 
@@ -386,21 +422,7 @@ function copyToClipboard(text) {
     });
 }
 
-/**
- * Debounce function for performance
- */
-function debounce(func, wait) {
-    let timeout;
-    return function executedFunction(...args) {
-        const later = () => {
-            clearTimeout(timeout);
-            func(...args);
-        };
-        clearTimeout(timeout);
-        timeout = setTimeout(later, wait);
-    };
-}
-
 // ===== INITIALIZATION =====
+strengthWorker = startStrengthWorker();
 console.log('🔐 Password Security Checker initialized');
 console.log('📡 API URL:', API_BASE_URL);
\ No newline at end of file
@@ -0,0 +1,259 @@
+// ===== LOCAL STRENGTH SCORING =====
+// A port of PasswordChecker.check_strength (backend/password_checker.py) for
+// the default policy and 'entropy' estimator, driven by the generated rule
+// table in strength-rules.js. Loaded on the page it defines
+// createStrengthChecker(); started as a Web Worker it scores {id, password}
+// messages off the main thread once it has been sent {rules}.
+// tests/test_strength_parity.py runs it under Node against the Python module.
+
+(function (root) {
+    'use strict';
+
+    const DECIMAL_RE = /^\p{Nd}$/u;
+
+    /**
+     * Character classes of one code point (pattern_scanner._classify)
+     */
+    function classify(char, specialChars) {
+        const classes = { lower: false, upper: false, digit: false, special: false, nonAlnum: false };
+        if (char >= 'a' && char <= 'z') {
+            classes.lower = true;
+        } else if (char >= 'A' && char <= 'Z') {
+            classes.upper = true;
+        } else if (char >= '0' && char <= '9') {
+            classes.digit = true;
+        } else {
+            classes.nonAlnum = true;
+            classes.digit = DECIMAL_RE.test(char);
+        }
+        classes.special = specialChars.has(char);
+        return classes;
+    }
+
+    /**
+     * Everything the scoring reads from a password (PatternScanner.scan)
+     */
+    function scan(chars, rules, specialChars, sequenceOf) {
+        const classes = { lower: false, upper: false, digit: false, special: false, nonAlnum: false };
+        let lowered = '';
+        let hasRepetition = false;
+        let previous = null;
+        let runLength = 0;
+
+        for (const char of chars) {
+            const charClasses = classify(char, specialChars);
+            for (const name in classes) {
+                classes[name] = classes[name] || charClasses[name];
+            }
+
+            // Same character 3+ times in a row (regex '.' never matches a newline)
+            if (char === previous && char !== '\n') {
+                runLength += 1;
+                if (runLength >= 3) {
+                    hasRepetition = true;
+                }
+            } else {
+                previous = char;
+                runLength = 1;
+            }
+
+            // Lowered one character at a time, like the Python scanner
+            lowered += char.toLowerCase();
+        }
+
+        // Sequences: three consecutive ordinals within one of rules.sequences
+        let hasSequence = false;
+        let previousLow = null;
+        let step = 0;
+        for (const low of lowered) {
+            const kind = sequenceOf.get(low);
+            if (kind !== undefined && previousLow !== null && sequenceOf.get(previousLow) === kind) {
+                const delta = low.codePointAt(0) - previousLow.codePointAt(0);
+                if (delta === 1 || delta === -1) {
+                    if (delta === step) {
+                        hasSequence = true;
+                    }
+                    step = delta;
+                } else {
+                    step = 0;
+                }
+            } else {
+                step = 0;
+            }
+            previousLow = low;
+        }
+
+        return {
+            classes,
+            hasCommonPattern: rules.common_patterns.some(token => lowered.includes(token)),
+            hasKeyboardPattern: rules.keyboard_patterns.some(token => lowered.includes(token)),
+            hasRepetition,
+            hasSequence
+        };
+    }
+
+    function format(template, values) {
+        return template.replace(/\{(\w+)\}/g, (match, name) => String(values[name]));
+    }
+
+    /**
+     * Round like Python's round(value, 2)
+     */
+    function round2(value) {
+        return Number(value.toFixed(2));
+    }
+
+    /**
+     * A checkStrength(password) function for a rule table
+     */
+    function createStrengthChecker(rules) {
+        const specialChars = new Set(Array.from(rules.special_chars));
+        const sequenceOf = new Map();
+        rules.sequences.forEach((sequence, index) => {
+            for (const char of sequence) {
+                sequenceOf.set(char, index);
+            }
+        });
+        const commonPasswords = new Set(rules.common_passwords);
+        const feedbackText = rules.feedback;
+
+        function scoreLength(length) {
+            if (length < rules.min_length) {
+                return [0, format(feedbackText.too_short, rules)];
+            } else if (length < rules.good_length) {
+                return [1, format(feedbackText.consider_length, rules)];
+            } else if (length < rules.excellent_length) {
+                return [2, feedbackText.good_length];
+            }
+            return [3, feedbackText.excellent_length];
+        }
+
+        function entropyOf(length, classes) {
+            let poolSize = 0;
+            if (classes.lower) poolSize += rules.pool_sizes.lower;
+            if (classes.upper) poolSize += rules.pool_sizes.upper;
+            if (classes.digit) poolSize += rules.pool_sizes.digit;
+            if (classes.nonAlnum) poolSize += rules.pool_sizes.non_alnum;
+            return poolSize === 0 ? 0 : length * rules.pool_bits[poolSize];
+        }
+
+        function crackTime(entropy) {
+            const seconds = 2 ** entropy / (2 * rules.guesses_per_second);
+            if (seconds < 1) {
+                return 'Instant';
+            }
+            for (const [below, unitSeconds, unit] of rules.crack_time_units) {
+                if (seconds < below) {
+                    return `${Math.trunc(seconds / unitSeconds)} ${unit}`;
+                }
+            }
+            const years = seconds / rules.year_seconds;
+            if (years >= rules.max_years + 1) {
+                return 'Millions of years';
+            }
+            return `${Math.trunc(years)} years`;
+        }
+
+        function strengthLevel(percentage) {
+            for (const [below, level] of rules.strength_levels) {
+                if (below === null || percentage < below) {
+                    return level;
+                }
+            }
+        }
+
+        return function checkStrength(password) {
+            if (!password) {
+                return {
+                    score: 0,
+                    strength: 'Empty',
+                    percentage: 0,
+                    feedback: [feedbackText.empty],
+                    entropy: 0,
+                    crack_time: 'Instant'
+                };
+            }
+
+            const chars = Array.from(password);  // code points, as Python counts them
+            const features = scan(chars, rules, specialChars, sequenceOf);
+            const penalties = rules.penalties;
+            const maxScore = rules.max_score;
+            const feedback = [];
+
+            // 1. Length (0-3 points)
+            const [lengthScore, lengthFeedback] = scoreLength(chars.length);
+            let score = lengthScore;
+            feedback.push(lengthFeedback);
+
+            // 2. Character diversity (0-4 points)
+            for (const name of Object.keys(rules.class_descriptions)) {
+                if (features.classes[name]) {
+                    score += 1;
+                } else {
+                    feedback.push(format(feedbackText.add_class, { description: rules.class_descriptions[name] }));
+                }
+            }
+
+            // 3-7. Common password, patterns, keyboard patterns, repetition, sequences
+            if (commonPasswords.has(password.toLowerCase())) {
+                score -= penalties.common;
+                feedback.push(feedbackText.common);
+            }
+            if (features.hasCommonPattern) {
+                score -= penalties.pattern;
+                feedback.push(feedbackText.pattern);
+            }
+            if (features.hasKeyboardPattern) {
+                score -= penalties.keyboard;
+                feedback.push(feedbackText.keyboard);
+            }
+            if (features.hasRepetition) {
+                score -= penalties.repetition;
+                feedback.push(feedbackText.repetition);
+            }
+            if (features.hasSequence) {
+                score -= penalties.sequence;
+                feedback.push(feedbackText.sequence);
+            }
+
+            score = Math.max(0, Math.min(score, maxScore));
+            const entropy = entropyOf(chars.length, features.classes);
+            const percentage = Math.trunc((score / maxScore) * 100);
+
+            if (score >= rules.excellent_score) {
+                feedback.unshift(feedbackText.excellent);
+            } else if (score >= rules.good_score) {
+                feedback.unshift(feedbackText.good);
+            }
+
+            return {
+                score,
+                max_score: maxScore,
+                strength: strengthLevel(percentage),
+                percentage,
+                feedback,
+                entropy: round2(entropy),
+                crack_time: crackTime(entropy),
+                length: chars.length
+            };
+        };
+    }
+
+    const isWorker = typeof WorkerGlobalScope !== 'undefined' && root instanceof WorkerGlobalScope;
+
+    if (isWorker) {
+        let checkStrength = null;
+        root.addEventListener('message', (event) => {
+            const message = event.data;
+            if (message.rules) {
+                checkStrength = createStrengthChecker(message.rules);
+            } else if (checkStrength) {
+                root.postMessage({ id: message.id, result: checkStrength(message.password) });
+            }
+        });
+    } else if (typeof module !== 'undefined') {
+        module.exports = { createStrengthChecker };
+    } else {
+        root.createStrengthChecker = createStrengthChecker;
+    }
+})(typeof self !== 'undefined' ? self : this);
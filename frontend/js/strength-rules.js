@@ -0,0 +1,160 @@
+// Generated by backend/strength_rules.py from the Python scoring rules; do not edit.
+// Regenerate with: python backend/strength_rules.py
+const STRENGTH_RULES = {
+    "common_passwords": [
+        "password",
+        "123456",
+        "12345678",
+        "qwerty",
+        "abc123",
+        "monkey",
+        "1234567",
+        "letmein",
+        "trustno1",
+        "dragon",
+        "baseball",
+        "iloveyou",
+        "master",
+        "sunshine",
+        "ashley",
+        "bailey",
+        "passw0rd",
+        "shadow",
+        "123123",
+        "654321",
+        "superman",
+        "qazwsx",
+        "michael",
+        "football"
+    ],
+    "common_patterns": [
+        "123",
+        "abc",
+        "qwerty",
+        "asdf",
+        "zxcv",
+        "password",
+        "pass",
+        "admin",
+        "user",
+        "login"
+    ],
+    "keyboard_patterns": [
+        "qwertyuiop",
+        "asdfghjkl",
+        "zxcvbnm",
+        "1qaz2wsx",
+        "qweasd",
+        "zaqwsx"
+    ],
+    "special_chars": "!@#$%^&*()_+-=[]{};:'\",.<>?/\\|`~",
+    "sequences": [
+        "abcdefghijklmnopqrstuvwxyz",
+        "0123456789"
+    ],
+    "min_length": 8,
+    "good_length": 12,
+    "excellent_length": 16,
+    "max_score": 7,
+    "excellent_score": 6,
+    "good_score": 4,
+    "penalties": {
+        "common": 2,
+        "pattern": 1,
+        "keyboard": 1,
+        "repetition": 1,
+        "sequence": 1,
+        "banned": 2
+    },
+    "class_descriptions": {
+        "lower": "lowercase letters (a-z)",
+        "upper": "uppercase letters (A-Z)",
+        "digit": "numbers (0-9)",
+        "special": "special characters (!@#$%...)"
+    },
+    "pool_sizes": {
+        "lower": 26,
+        "upper": 26,
+        "digit": 10,
+        "non_alnum": 32
+    },
+    "pool_bits": {
+        "10": 3.321928094887362,
+        "26": 4.700439718141092,
+        "32": 5.0,
+        "36": 5.169925001442312,
+        "42": 5.392317422778761,
+        "52": 5.700439718141092,
+        "58": 5.857980995127572,
+        "62": 5.954196310386875,
+        "68": 6.087462841250339,
+        "84": 6.392317422778761,
+        "94": 6.554588851677638
+    },
+    "guesses_per_second": 10000000000,
+    "crack_time_units": [
+        [
+            60,
+            1,
+            "seconds"
+        ],
+        [
+            3600,
+            60,
+            "minutes"
+        ],
+        [
+            86400,
+            3600,
+            "hours"
+        ],
+        [
+            2592000,
+            86400,
+            "days"
+        ],
+        [
+            31536000,
+            2592000,
+            "months"
+        ]
+    ],
+    "year_seconds": 31536000,
+    "max_years": 1000000,
+    "strength_levels": [
+        [
+            30,
+            "Very Weak"
+        ],
+        [
+            55,
+            "Weak"
+        ],
+        [
+            80,
+            "Medium"
+        ],
+        [
+            null,
+            "Strong"
+        ]
+    ],
+    "feedback": {
+        "empty": "Please enter a password",
+        "too_short": "❌ Too short (minimum {min_length} characters)",
+        "consider_length": "⚠️ Consider using {good_length}+ characters",
+        "good_length": "✓ Good length",
+        "excellent_length": "✓ Excellent length",
+        "add_class": "➕ Add {description}",
+        "common": "❌ This is a commonly used password",
+        "pattern": "⚠️ Contains common patterns (123, abc, etc.)",
+        "keyboard": "⚠️ Contains keyboard patterns (qwerty, asdf, etc.)",
+        "repetition": "⚠️ Contains repetitive characters",
+        "sequence": "⚠️ Contains sequential characters",
+        "excellent": "✓ Excellent password strength!",
+        "good": "✓ Good password strength"
+    }
+};
+if (typeof module !== 'undefined') {
+    module.exports = STRENGTH_RULES;
+}
@@ -0,0 +1,204 @@
+import sys
+sys.path.append('../backend')
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from async_breach_client import AsyncBreachClient
+from asgi import PasswordAPI
+from password_checker import PasswordChecker
+
+
+class SlowRangeServer:
+    """Range API stand-in that answers every prefix with an empty range after a delay"""
+
+    def __init__(self, delay):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                time.sleep(delay)
+                self.send_response(200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            request_queue_size = 1024
+
+        self.server = Server(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/range/'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+async def call(app, method, path, body=b''):
+    """Run one request through the ASGI app; returns (status, decoded JSON or None)"""
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app({'type': 'http', 'method': method, 'path': path}, receive, send)
+    payload = sent[1]['body']
+    return sent[0]['status'], json.loads(payload) if payload else None
+
+
+def test_routes_match_flask_schema():
+    checker = PasswordChecker()
+
+    async def run():
+        app = PasswordAPI(password_checker=checker, breach_client=AsyncBreachClient())
+        try:
+            status, body = await call(app, 'POST', '/api/check-strength', b'{"password": "Tr0ub4dor&3"}')
+            assert status == 200
+            assert body == {'success': True, 'data': checker.check_strength('Tr0ub4dor&3')}
+
+            status, body = await call(app, 'POST', '/api/generate-passphrase', b'{"word_count": 3, "count": 2}')
+            assert status == 200 and body['success'] and len(body['passphrases']) == 2
+
+            status, body = await call(app, 'POST', '/api/check-breach', b'{"password": ""}')
+            assert body == {'success': True, 'data': {'checked': False, 'error': 'No password provided'}}
+
+            status, body = await call(app, 'POST', '/api/analyze', b'{"password": ""}')
+            assert body['data']['strength'] == checker.check_strength('')
+            assert body['data']['complete'] is True
+
+            sent = []
+
+            async def send(message):
+                sent.append(message)
+
+            await app({'type': 'http', 'method': 'GET', 'path': '/metrics'}, None, send)
+            assert b'route="/api/check-strength",method="POST",status="200"' in sent[1]['body']
+
+            assert (await call(app, 'POST', '/api/check-strength', b'not json'))[0] == 400
+            assert (await call(app, 'GET', '/api/check-strength'))[0] == 405
+            assert (await call(app, 'POST', '/api/nothing', b'{}'))[0] == 404
+            assert (await call(app, 'OPTIONS', '/api/check-breach')) == (204, None)
+        finally:
+            await app.close()
+
+    asyncio.run(run())
+    print("✓ ASGI routes return the Flask response schemas")
+
+
+def test_batch_and_stream_routes():
+    checker = PasswordChecker()
+    passwords = ['Tr0ub4dor&3', 'password', 'correcthorsebatterystaple']
+
+    async def run():
+        app = PasswordAPI(password_checker=checker, breach_client=AsyncBreachClient())
+        try:
+            # JSON batch, as a bare array
+            sent = []
+
+            async def send(message):
+                sent.append(message)
+
+            async def receive_json():
+                return {'type': 'http.request', 'body': json.dumps(passwords).encode()}
+
+            scope = {'type': 'http', 'method': 'POST', 'path': '/api/check-strength/batch',
+                     'headers': [(b'content-type', b'application/json')]}
+            await app(scope, receive_json, send)
+            assert sent[0]['status'] == 200
+            assert json.loads(sent[1]['body']) == {
+                'success': True, 'count': 3, 'data': checker.check_strength_batch(passwords)
+            }
+
+            # NDJSON, split mid-line across chunks, with an undecodable line
+            chunks = iter([b'Tr0ub4dor&3\npass', b'word\n\xff\xfe\r\n', b'correcthorsebatterystaple'])
+            sent.clear()
+
+            async def receive_ndjson():
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return {'type': 'http.disconnect'}
+                return {'type': 'http.request', 'body': chunk, 'more_body': not chunk.startswith(b'correct')}
+
+            scope = dict(scope, headers=[(b'content-type', b'text/plain')])
+            await app(scope, receive_ndjson, send)
+            assert sent[0]['status'] == 200
+            rows = [json.loads(line) for line in b''.join(m.get('body', b'') for m in sent[1:]).splitlines()]
+            assert rows[0] == checker.check_strength('Tr0ub4dor&3')
+            assert rows[1] == checker.check_strength('password')
+            assert rows[2]['success'] is False and 'utf-8' in rows[2]['error']
+            assert rows[3] == checker.check_strength('correcthorsebatterystaple')
+            assert sent[-1].get('more_body', False) is False
+
+            # WebSocket on the stream path is accepted and answers each message
+            messages = iter([
+                {'type': 'websocket.connect'},
+                {'type': 'websocket.receive', 'text': '{"password": "Tr0ub"}'},
+                {'type': 'websocket.receive', 'text': '{"append": "4dor&3"}'},
+                {'type': 'websocket.receive', 'text': '{"nothing": 1}'},
+                {'type': 'websocket.disconnect', 'code': 1000}
+            ])
+            sent.clear()
+
+            async def receive_ws():
+                return next(messages)
+
+            await app({'type': 'websocket', 'path': '/api/check-strength/stream'}, receive_ws, send)
+            assert sent[0]['type'] == 'websocket.accept'
+            replies = [json.loads(m['text']) for m in sent[1:]]
+            assert replies[0] == {'success': True, 'data': checker.check_strength('Tr0ub')}
+            assert replies[1] == {'success': True, 'data': checker.check_strength('Tr0ub4dor&3')}
+            assert replies[2]['success'] is False
+
+            # WebSocket to any other path is closed before it is accepted
+            messages = iter([{'type': 'websocket.connect'}])
+            sent.clear()
+            await app({'type': 'websocket', 'path': '/api/check-strength'}, receive_ws, send)
+            assert [m['type'] for m in sent] == ['websocket.close']
+        finally:
+            await app.close()
+
+    asyncio.run(run())
+    print("✓ ASGI serves the batch route and the stream WebSocket")
+
+
+def test_breach_checks_run_concurrently():
+    stub = SlowRangeServer(delay=0.2)
+
+    async def run():
+        client = AsyncBreachClient(cache_size=0, max_concurrency=200)
+        client.api_url = stub.url
+        app = PasswordAPI(breach_client=client)
+        try:
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(
+                call(app, 'POST', '/api/check-breach', json.dumps({'password': f'password{i}'}).encode())
+                for i in range(200)
+            ))
+            return time.perf_counter() - started, responses
+        finally:
+            await app.close()
+
+    try:
+        elapsed, responses = asyncio.run(run())
+    finally:
+        stub.close()
+
+    assert all(body['data']['breached'] is False for _, body in responses)
+    # 200 lookups at 0.2s each would take 40s one after another
+    assert elapsed < 5
+    print("✓ Breach checks are awaited concurrently")
+
+
+if __name__ == '__main__':
+    test_routes_match_flask_schema()
+    test_batch_and_stream_routes()
+    test_breach_checks_run_concurrently()
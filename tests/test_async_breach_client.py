@@ -0,0 +1,127 @@
+import sys
+sys.path.append('../backend')
+
+import asyncio
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from async_breach_client import AsyncBreachClient, PooledBreachClient
+
+PASSWORD_HASH = hashlib.sha1(b'password').hexdigest().upper()
+
+
+class StubRangeServer:
+    """Local stand-in for the range API with scripted failures"""
+    
+    def __init__(self, failures=0, failure_status=503, delay=0.0, retry_after='0'):
+        self.failures = failures
+        self.failure_status = failure_status
+        self.delay = delay
+        self.retry_after = retry_after
+        self.requests = []
+        
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append(self.path)
+                time.sleep(stub.delay)
+                if stub.failures > 0:
+                    stub.failures -= 1
+                    self.send_response(stub.failure_status)
+                    self.send_header('Retry-After', stub.retry_after)
+                    self.end_headers()
+                    return
+                
+                body = f'{PASSWORD_HASH[5:]}:9545824\r\n'.encode('ascii')
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/range/'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+    
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_coalesces_concurrent_prefix_lookups():
+    stub = StubRangeServer(delay=0.1)
+    
+    async def run():
+        async with AsyncBreachClient(cache_size=0) as client:
+            client.api_url = stub.url
+            results = await client.check_breaches_async(['password'] * 10)
+            return client, results
+    
+    try:
+        client, results = asyncio.run(run())
+    finally:
+        stub.close()
+    
+    assert all(result['count'] == 9545824 for result in results)
+    assert len(stub.requests) == 1
+    assert client.coalesced == 9
+    print("✓ Concurrent lookups for one prefix share a request")
+
+
+def test_retries_then_gives_up():
+    stub = StubRangeServer(failures=2, failure_status=429)
+    try:
+        with PooledBreachClient(cache_size=0, backoff=0) as pooled:
+            pooled.client.api_url = stub.url
+            result = pooled.check_breach('password')
+            assert result['breached'] is True
+            assert pooled.client.retries == 2
+            
+            stub.failures, stub.failure_status = 10, 500
+            result = pooled.check_breach('password')
+            assert result == {'checked': False, 'error': 'API Error: 500'}
+    finally:
+        stub.close()
+    print("✓ 429/5xx responses are retried with backoff")
+
+
+def test_backoff_frees_the_slot_and_is_capped():
+    stub = StubRangeServer(failures=1, retry_after='1')
+    finished = []
+    
+    async def lookup(client, password):
+        await client.check_breach_async(password)
+        finished.append(password)
+    
+    async def run():
+        async with AsyncBreachClient(cache_size=0, max_concurrency=1) as client:
+            client.api_url = stub.url
+            first = asyncio.ensure_future(lookup(client, 'password'))
+            await asyncio.sleep(0.2)  # 'password' got its 503 and is backing off
+            await lookup(client, 'hunter2')
+            await first
+            return client
+    
+    try:
+        client = asyncio.run(run())
+    finally:
+        stub.close()
+    
+    # The only slot was free for another prefix during the Retry-After wait
+    assert finished == ['hunter2', 'password'] and client.retries == 1
+    assert client._retry_delay(0, '86400') == client.timeout
+    assert client._retry_delay(0, '-5') == 0.0
+    for value in ('nan', 'inf', '-inf', 'Wed, 21 Oct 2026 07:28:00 GMT'):
+        assert 0 < client._retry_delay(0, value) <= client.backoff * 1.5
+    print("✓ Backoff releases its slot and Retry-After is capped at the timeout")
+
+
+if __name__ == '__main__':
+    test_coalesces_concurrent_prefix_lookups()
+    test_retries_then_gives_up()
+    test_backoff_frees_the_slot_and_is_capped()
@@ -0,0 +1,44 @@
+import sys
+sys.path.append('../backend')
+
+import csv
+import json
+import os
+import tempfile
+
+import audit
+from password_checker import PasswordChecker
+
+
+def test_audit_cli():
+    passwords = ['password', 'Tr0pic@l-Storm!2024', '', 'abc123', 'letmein'] * 7
+    checker = PasswordChecker()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, 'passwords.txt')
+        with open(input_path, 'w', encoding='utf-8') as input_file:
+            input_file.write('\n'.join(passwords) + '\n')
+        
+        # Test 1: JSONL output keeps input order across workers and chunks
+        jsonl_path = os.path.join(directory, 'audit.jsonl')
+        audit.main([input_path, '-o', jsonl_path, '-w', '2', '--chunk-size', '3', '--quiet'])
+        with open(jsonl_path, encoding='utf-8') as output:
+            rows = [json.loads(line) for line in output]
+        assert [row['line'] for row in rows] == list(range(1, len(passwords) + 1))
+        assert [row['score'] for row in rows] == [checker.check_strength(p)['score'] for p in passwords]
+        assert 'password' not in rows[0]
+        print("✓ Test 1 passed: Ordered JSONL audit")
+        
+        # Test 2: Unordered CSV output still covers every line once
+        csv_path = os.path.join(directory, 'audit.csv')
+        audit.main([input_path, '-o', csv_path, '-f', 'csv', '-w', '2', '--chunk-size', '4',
+                    '--unordered', '--include-password', '--quiet'])
+        with open(csv_path, newline='', encoding='utf-8') as output:
+            rows = list(csv.DictReader(output))
+        assert sorted(int(row['line']) for row in rows) == list(range(1, len(passwords) + 1))
+        assert {row['password'] for row in rows} == set(passwords)
+        print("✓ Test 2 passed: Unordered CSV audit")
+
+
+if __name__ == '__main__':
+    test_audit_cli()
@@ -0,0 +1,48 @@
+import sys
+sys.path.append('../backend')
+
+import hashlib
+import os
+import tempfile
+
+from breach_checker import BreachChecker
+from breach_filter import BreachFilter, build_filter
+
+
+def _digest(password):
+    return hashlib.sha1(password.encode('utf-8')).digest()
+
+
+def test_breach_filter():
+    breached = [f'password{i}' for i in range(2000)]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'breach.bloom')
+        
+        # Test 1: Build filter
+        added = build_filter((_digest(p) for p in breached), path, len(breached), 0.01)
+        assert added == len(breached)
+        print("✓ Test 1 passed: Filter built")
+        
+        with BreachFilter(path) as breach_filter:
+            # Test 2: No false negatives
+            assert all(breach_filter.might_contain(_digest(p)) for p in breached)
+            print("✓ Test 2 passed: No false negatives")
+            
+            # Test 3: False-positive rate near the target
+            false_positives = sum(breach_filter.might_contain(_digest(f'unique-{i}')) for i in range(10000))
+            assert false_positives < 300
+            print("✓ Test 3 passed: False-positive rate")
+        
+        # Test 4: Filter misses short-circuit check_breach (no network)
+        checker = BreachChecker(breach_filter=path)
+        checker.api_url = 'http://127.0.0.1:9/range/'
+        result = checker.check_breach('Tr0pic@l-Storm!2024')
+        assert result['checked'] is True
+        assert result['breached'] is False
+        checker.breach_filter.close()
+        print("✓ Test 4 passed: Filter miss skips the exact lookup")
+
+
+if __name__ == '__main__':
+    test_breach_filter()
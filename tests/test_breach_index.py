@@ -0,0 +1,63 @@
+import sys
+sys.path.append('../backend')
+
+import hashlib
+import os
+import tempfile
+
+from breach_checker import BreachChecker
+from breach_index import LocalBreachIndex, build_index, parse_dump_lines
+
+
+def _sha1(password):
+    return hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
+
+
+def _make_dump(counts):
+    """Dump lines in HIBP's ordered-by-hash format"""
+    return sorted(f"{_sha1(password)}:{count}" for password, count in counts.items())
+
+
+def test_local_breach_index():
+    counts = {'password': 9545824, '123456': 37359195, 'letmein': 4500, 'hunter2': 17}
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'breach.idx')
+        
+        # Test 1: Build index from dump lines
+        total = build_index(parse_dump_lines(_make_dump(counts)), path)
+        assert total == len(counts)
+        print("✓ Test 1 passed: Index built")
+        
+        # Test 2: Exact lookups
+        with LocalBreachIndex(path) as index:
+            assert len(index) == len(counts)
+            for password, count in counts.items():
+                assert index.lookup(_sha1(password)) == count
+            assert index.lookup(_sha1('Tr0pic@l-Storm!2024')) == 0
+        print("✓ Test 2 passed: Index lookups")
+        
+        # Test 3: BreachChecker offline mode keeps the result shape
+        checker = BreachChecker(local_index=path)
+        result = checker.check_breach('password')
+        assert result['breached'] is True
+        assert result['count'] == 9545824
+        assert result['severity'] == 'critical'
+        
+        result = checker.check_breach('Tr0pic@l-Storm!2024')
+        assert result['breached'] is False
+        assert result['severity'] == 'safe'
+        checker.local_index.close()
+        print("✓ Test 3 passed: Offline breach check")
+        
+        # Test 4: Unsorted input is rejected
+        try:
+            build_index(parse_dump_lines(reversed(_make_dump(counts))), path)
+            assert False, 'unsorted dump should fail'
+        except ValueError:
+            pass
+        print("✓ Test 4 passed: Unsorted dump rejected")
+
+
+if __name__ == '__main__':
+    test_local_breach_index()
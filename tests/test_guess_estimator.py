@@ -0,0 +1,78 @@
+import sys
+sys.path.append('../backend')
+
+import time
+
+from guess_estimator import GuessEstimator
+from password_checker import PasswordChecker
+
+
+def _patterns(estimate):
+    return [match['pattern'] for match in estimate['sequence']]
+
+
+def test_guess_estimator():
+    estimator = GuessEstimator()
+    
+    # Test 1: Each matcher finds its pattern
+    assert _patterns(estimator.estimate('qwertyuiop')) == ['dictionary']
+    assert _patterns(estimator.estimate('zxcvbn')) == ['spatial']
+    assert _patterns(estimator.estimate('aaaaaa')) == ['repeat']
+    assert _patterns(estimator.estimate('abcdef')) == ['sequence']
+    assert _patterns(estimator.estimate('17/05/1991')) == ['date']
+    assert estimator.estimate('P@ssw0rd')['sequence'][0]['l33t'] is True
+    assert estimator.estimate('drowssap')['sequence'][0]['reversed'] is True
+    print("✓ Test 1 passed: Pattern matchers")
+    
+    # Test 2: Decomposition covers the whole password
+    estimate = estimator.estimate('Password2024!')
+    assert ''.join(match['token'] for match in estimate['sequence']) == 'Password2024!'
+    print("✓ Test 2 passed: Match sequence covers the password")
+    
+    # Test 3: Patterned passwords need far fewer guesses than random ones
+    assert estimator.estimate('Password2024!')['guesses'] < estimator.estimate('x8#Kq!2vLz9@')['guesses'] / 1000
+    print("✓ Test 3 passed: Guess ordering")
+    
+    # Test 4: Very long passwords are estimated from a bounded prefix
+    for password in ('qwertyuiop' * 40, 'x8#Kq!2vLz9@' * 50, 'Tr0ub4dor&3' * 100):
+        estimate = estimator.estimate(password)
+        assert ''.join(match['token'] for match in estimate['sequence']) == password[:100]
+        assert estimate['guesses_log2'] > 0
+    print("✓ Test 4 passed: Long passwords")
+    
+    # Test 5: Repeats and long runs stay cheap to search (each took 80-300 ms
+    # when every position of a run was a split point)
+    for password in ('ab' * 50, '1' * 100, 'qwer' * 25):
+        started = time.perf_counter()
+        estimate = estimator.estimate(password)
+        assert time.perf_counter() - started < 0.05
+        assert _patterns(estimate) == ['repeat']
+    # ...without losing matches that cross into a run ('dd')
+    assert _patterns(estimator.estimate('passworddragon')) == ['dictionary', 'dictionary']
+    print("✓ Test 5 passed: Repeat runs are collapsed")
+
+
+def test_guesses_estimator_mode():
+    checker = PasswordChecker()
+    entropy_result = checker.check_strength('Password2024!')
+    guesses_result = checker.check_strength('Password2024!', estimator='guesses')
+    
+    # Only entropy/crack time change; score and feedback are shared
+    assert guesses_result['score'] == entropy_result['score']
+    assert guesses_result['feedback'] == entropy_result['feedback']
+    assert guesses_result['entropy'] < entropy_result['entropy']
+    assert guesses_result['match_sequence'][0] == {'pattern': 'dictionary', 'token': 'Password'}
+    assert 'guesses' not in entropy_result
+    
+    long_result = checker.check_strength('qwertyuiop' * 40, estimator='guesses')
+    assert long_result['length'] == 400 and long_result['crack_time']
+    
+    # Services analyse a shorter prefix (STRENGTH_GUESS_LENGTH)
+    short = PasswordChecker(guess_length=32).check_strength('x8#Kq!2vLz9@' * 5, estimator='guesses')
+    assert ''.join(match['token'] for match in short['match_sequence']) == ('x8#Kq!2vLz9@' * 5)[:32]
+    print("✓ Guesses estimator mode")
+
+
+if __name__ == '__main__':
+    test_guess_estimator()
+    test_guesses_estimator_mode()
@@ -0,0 +1,122 @@
+import sys
+sys.path.append('../backend')
+
+import hashlib
+import json
+import os
+import random
+import tempfile
+
+import hash_audit
+from breach_checker import BreachChecker
+from breach_index import LocalBreachIndex, build_index
+from range_server import RangeServer, dataset_from_hashes
+
+NTLM_PASSWORD = '8846F7EAEE8FB117AD06BDD830B7586C'  # NT hash of 'password'
+
+
+def sha1(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest().upper()
+
+
+def test_lookup_digests_matches_single_lookups():
+    rng = random.Random(5)
+    digests = sorted({rng.randbytes(20) for _ in range(2000)})
+    records = [(digest, i + 1) for i, digest in enumerate(digests)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'test.idx')
+        build_index(records, path)
+        with LocalBreachIndex(path) as index:
+            for digest, _ in records[:50]:
+                # Hits, misses and duplicates sharing the bucket of a known digest
+                bucket = [digest, digest, digest[:3] + bytes(17), digest[:3] + b'\xff' * 17]
+                bucket += [known for known, _ in records if known[:3] == digest[:3]]
+                bucket.sort()
+                assert index.lookup_digests(bucket) == [index.lookup_digest(item) for item in bucket]
+    print("✓ Sorted batch lookups match single lookups")
+
+
+def test_sha1_audit_against_local_index():
+    breached = ['password', 'letmein', 'dragon']
+    records = sorted((bytes.fromhex(sha1(p)), 100 + i) for i, p in enumerate(breached))
+    lines = [
+        sha1('password'),
+        f"alice:{sha1('letmein').lower()}",
+        '# comment',
+        '',
+        f"bob:{sha1('not breached')}",
+        'carol:nothex',
+        sha1('password')
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        index_path = os.path.join(directory, 'test.idx')
+        build_index(records, index_path)
+        input_path = os.path.join(directory, 'hashes.txt')
+        with open(input_path, 'w', encoding='utf-8') as hashes:
+            hashes.write('\n'.join(lines) + '\n')
+
+        output_path = os.path.join(directory, 'out.jsonl')
+        hash_audit.main([input_path, '--breach-index', index_path, '-o', output_path, '--window', '2', '--quiet'])
+        with open(output_path, encoding='utf-8') as output:
+            rows = [json.loads(line) for line in output]
+
+    assert [row['line'] for row in rows] == [1, 2, 5, 6, 7]
+    assert rows[0] == {'line': 1, 'hash': sha1('password'), 'breached': True, 'count': 100}
+    assert rows[1]['label'] == 'alice' and rows[1]['count'] == 101
+    assert rows[2]['breached'] is False and rows[2]['count'] == 0
+    assert rows[3] == {'line': 6, 'label': 'carol', 'error': 'Not a SHA-1 hash'}
+    assert rows[4]['count'] == 100
+    print("✓ SHA-1 hashes are audited against the local index")
+
+
+def test_ntlm_audit_fetches_each_prefix_once():
+    rng = random.Random(9)
+    other = [f'{rng.getrandbits(128):032X}' for _ in range(20)]
+    dataset = dataset_from_hashes([(NTLM_PASSWORD, 52000)] + [(value, 1) for value in other[:10]])
+
+    # pwdump lines; several accounts share the same hash
+    records = []
+    for i, value in enumerate([NTLM_PASSWORD] * 3 + other):
+        parsed = hash_audit.parse_hash_line(f'user{i}:{1000 + i}:AAD3B435B51404EEAAD3B435B51404EE:{value}:::', 'ntlm')
+        records.append((i + 1,) + parsed)
+
+    with RangeServer(lambda prefix: [], ntlm_dataset=dataset) as server:
+        checker = BreachChecker(cache_size=0, api_url=server.url)
+        audit = hash_audit.HashAudit(hash_audit.range_lookup(checker, 'ntlm'), 'ntlm', max_in_flight=4)
+        rows = list(audit.run(records))
+
+        distinct_prefixes = len({value[:5] for _, _, value in records})
+        assert server.requests == audit.ranges == distinct_prefixes
+
+    assert [row['label'] for row in rows[:3]] == ['user0', 'user1', 'user2']
+    assert all(row['count'] == 52000 for row in rows[:3])
+    assert [row['breached'] for row in rows[3:]] == [True] * 10 + [False] * 10
+    assert audit.breached == 13 and audit.errors == 0
+    print("✓ NTLM hashes are audited with one range request per prefix")
+
+    # Inputs longer than a window are bucketed on disk: still one request per
+    # prefix across the whole input (hashes repeat far apart), rows in order
+    spread = records + [(len(records) + i + 1,) + record[1:] for i, record in enumerate(records)]
+    with RangeServer(lambda prefix: [], ntlm_dataset=dataset) as server:
+        checker = BreachChecker(cache_size=0, api_url=server.url)
+        audit = hash_audit.HashAudit(hash_audit.range_lookup(checker, 'ntlm'), 'ntlm', window=5, max_in_flight=4)
+        spilled_rows = list(audit.run(spread + [(99, 'eve', None)]))
+        assert server.requests == audit.ranges == distinct_prefixes
+
+    assert spilled_rows[:-1] == rows + [dict(row, line=row['line'] + len(records)) for row in rows]
+    assert spilled_rows[-1] == {'line': 99, 'label': 'eve', 'error': 'Not a NTLM hash'}
+    print("✓ Long inputs are bucketed by prefix and merged back into input order")
+
+    with RangeServer(lambda prefix: [], ntlm_dataset=dataset, error_rate=1) as server:
+        checker = BreachChecker(cache_size=0, api_url=server.url)
+        rows = list(hash_audit.HashAudit(hash_audit.range_lookup(checker, 'ntlm'), 'ntlm').run(records[:2]))
+    assert [row['error'] for row in rows] == ['API Error: 503', 'API Error: 503']
+    print("✓ Failed range lookups are reported per hash")
+
+
+if __name__ == '__main__':
+    test_lookup_digests_matches_single_lookups()
+    test_sha1_audit_against_local_index()
+    test_ntlm_audit_fetches_each_prefix_once()
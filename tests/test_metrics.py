@@ -0,0 +1,76 @@
+import sys
+sys.path.append('../backend')
+
+import threading
+
+from metrics import Counter, Histogram, Registry, STRENGTH_STAGE_SECONDS, cache_collector
+from password_checker import PasswordChecker
+from profiler import SamplingProfiler
+from range_cache import RangeCache
+
+
+def test_registry_renders_prometheus_text():
+    registry = Registry()
+    requests = Counter('requests', 'Requests served', ['route'], registry=registry)
+    latency = Histogram('latency_seconds', 'Latency', ['route'], buckets=(0.1, 1.0), registry=registry)
+
+    requests.inc('/a')
+    requests.inc('/a', amount=2)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, '/a')
+
+    cache = RangeCache(max_entries=4)
+    cache.get('00000')
+    registry.register_collector('caches', cache_collector({'range': cache, 'disabled': None}))
+
+    lines = registry.render().splitlines()
+    assert '# TYPE requests_total counter' in lines
+    assert 'requests_total{route="/a"} 3' in lines
+    # Buckets are cumulative and include values equal to the bound
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/a"} 4' in lines
+    assert 'cache_misses_total{cache="range"} 1' in lines
+    assert not any('disabled' in line for line in lines)
+    print("✓ Metrics render in Prometheus text format")
+
+
+def test_stage_timings_are_sampled():
+    checker = PasswordChecker(stage_sample_every=4)
+    before = STRENGTH_STAGE_SECONDS.count('scan')
+    for i in range(8):
+        checker.check_strength(f'Password{i}!')
+    assert STRENGTH_STAGE_SECONDS.count('scan') - before == 2
+    assert STRENGTH_STAGE_SECONDS.count('common_password') > 0
+    assert STRENGTH_STAGE_SECONDS.count('entropy') > 0
+
+    # Sampling doesn't change results
+    assert checker.check_strength('Password1!') == PasswordChecker().check_strength('Password1!')
+    print("✓ check_strength stages are timed for a sample of calls")
+
+
+def test_profiler_captures_busy_thread():
+    stop = threading.Event()
+
+    def busy_loop():
+        while not stop.is_set():
+            sum(range(1000))
+
+    worker = threading.Thread(target=busy_loop)
+    worker.start()
+    try:
+        profiler = SamplingProfiler(interval=0.001)
+        text = profiler.collapsed(0.2)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert any('test_metrics.py:busy_loop' in line for line in text.splitlines())
+    print("✓ Sampling profiler reports collapsed stacks")
+
+
+if __name__ == '__main__':
+    test_registry_renders_prometheus_text()
+    test_stage_timings_are_sampled()
+    test_profiler_captures_busy_thread()
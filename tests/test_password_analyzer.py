@@ -0,0 +1,103 @@
+import sys
+sys.path.append('../backend')
+
+import asyncio
+import hashlib
+import time
+
+from breach_checker import BreachChecker
+from password_analyzer import PasswordAnalyzer
+from password_checker import PasswordChecker
+
+
+class SlowBreachChecker(BreachChecker):
+    """Breach checker that answers from a fixed count after a delay"""
+
+    def __init__(self, delay):
+        super().__init__(cache_size=0)
+        self.delay = delay
+        self.digests = []
+
+    def check_breach_digest(self, sha1_digest):
+        self.digests.append(sha1_digest)
+        time.sleep(self.delay)
+        return self._build_result(42)
+
+    async def check_breach_digest_async(self, sha1_digest):
+        self.digests.append(sha1_digest)
+        await asyncio.sleep(self.delay)
+        return self._build_result(42)
+
+
+def test_analyze_merges_both_stages():
+    checker = PasswordChecker()
+    breach = SlowBreachChecker(delay=0.05)
+    analyzer = PasswordAnalyzer(checker, breach)
+
+    result = analyzer.analyze('hunter2')
+    assert result['strength'] == checker.check_strength('hunter2')
+    assert result['breach']['count'] == 42
+    assert result['complete'] is True
+    assert breach.digests == [hashlib.sha1(b'hunter2').digest()]
+    assert set(result['timings_ms']) == {'hash', 'strength', 'breach', 'total'}
+    print("✓ Strength and breach results are merged with timings")
+
+    result = analyzer.analyze('')
+    assert result['breach'] == {'checked': False, 'error': 'No password provided'}
+    print("✓ Empty password skips the lookup")
+    analyzer.close()
+
+
+def test_breach_budget_returns_strength_early():
+    checker = PasswordChecker()
+    analyzer = PasswordAnalyzer(checker, SlowBreachChecker(delay=1.0), breach_budget=0.05)
+
+    started = time.perf_counter()
+    result = analyzer.analyze('hunter2')
+    assert time.perf_counter() - started < 0.5
+    assert result['complete'] is False
+    assert result['breach']['pending'] is True
+    assert result['timings_ms']['breach'] is None
+    assert result['strength'] == checker.check_strength('hunter2')
+    print("✓ A slow breach lookup doesn't hold up the strength result")
+
+    async def run():
+        return await analyzer.analyze_async('hunter2'), await analyzer.analyze_async('hunter2', breach_budget=5)
+
+    early, full = asyncio.run(run())
+    assert early['complete'] is False and full['complete'] is True
+    assert full['breach']['count'] == 42
+    print("✓ Async analyze honours the budget")
+    analyzer.close()
+
+
+def test_pending_lookups_are_bounded():
+    checker = PasswordChecker()
+    breach = SlowBreachChecker(delay=0.3)
+    analyzer = PasswordAnalyzer(checker, breach, breach_budget=0.01, max_pending=3)
+
+    # The same password again shares its pending lookup
+    for _ in range(5):
+        assert analyzer.analyze('hunter2')['complete'] is False
+    assert len(breach.digests) == 1
+
+    # Distinct passwords queue up to max_pending lookups, then none
+    for i in range(10):
+        assert analyzer.analyze(f'hunter{i + 3}')['breach']['pending'] is True
+    assert len(analyzer._pending) == 3
+    time.sleep(0.5)
+    assert len(breach.digests) == 3
+
+    # Finished lookups leave the queue
+    while analyzer._pending:
+        time.sleep(0.05)
+    result = analyzer.analyze('hunter2', breach_budget=5)
+    assert result['complete'] is True and len(breach.digests) == 4
+    print("✓ Slow breach lookups can't pile up past max_pending")
+    analyzer.close()
+
+
+if __name__ == '__main__':
+    test_analyze_merges_both_stages()
+    test_breach_budget_returns_strength_early()
+    test_pending_lookups_are_bounded()
@@ -1,7 +1,9 @@
+import random
 import sys
 sys.path.append('../backend')
 
 from password_checker import PasswordChecker
+from pattern_scanner import COMMON_PATTERN, KEYBOARD_PATTERN, MAX_INCREMENTAL_LENGTH, PatternScanner
 
 def test_password_strength():
     checker = PasswordChecker()
@@ -33,5 +35,125 @@ def test_password_strength():
     
     print("\n✅ All tests passed!")
 
+def test_check_strength_batch():
+    checker = PasswordChecker()
+    passwords = ["password", "Tr0pic@l-Storm!2024", "", "password"]
+    
+    # Batch results match single calls, in order
+    results = checker.check_strength_batch(passwords)
+    assert results == [checker.check_strength(p) for p in passwords]
+    print("✓ Batch results match single checks")
+    
+    # Repeated passwords get independent result dicts
+    results[0]['feedback'].append('mutated')
+    assert results[3]['feedback'] == checker.check_strength("password")['feedback']
+    print("✓ Batch results are independent copies")
+    
+    # Passwords that share scan features share a scored result, not a dict
+    rng = random.Random(2)
+    generated = [''.join(rng.choice('aA1!xyzqwe') for _ in range(rng.randint(1, 14))) for _ in range(3000)]
+    assert checker.check_strength_batch(generated) == [checker.check_strength(p) for p in generated]
+    
+    # Lazy mode returns a generator
+    lazy_results = checker.check_strength_batch(iter(passwords), lazy=True)
+    assert next(lazy_results)['strength'] in ['Very Weak', 'Weak']
+    print("✓ Lazy batch mode")
+
+def test_scanner_matches_detectors():
+    checker = PasswordChecker()
+    passwords = [
+        "password", "Tr0pic@l-Storm!2024", "abc", "CBA987", "1qaz2wsx",
+        "aaa", "a\n\n\nb", "QwErTyUiOp", "Σσ٣€", "pass word", "zyx-098"
+    ]
+    
+    for password in passwords:
+        scan = checker._scanner.scan(password)
+        assert bool(scan.token_flags & COMMON_PATTERN) == checker._has_common_patterns(password)
+        assert bool(scan.token_flags & KEYBOARD_PATTERN) == checker._has_keyboard_patterns(password)
+        assert scan.has_repetition == checker._has_repetitions(password)
+        assert scan.has_sequence == checker._has_sequential_chars(password)
+        assert checker._score_diversity(scan.char_classes) == checker._check_diversity(password)
+        assert checker._entropy_from_classes(len(password), scan.char_classes) == checker._calculate_entropy(password)
+    print("✓ Scanner matches individual detectors")
+    
+    # Whole-string passes find the same features as the per-character walk
+    scanner = PatternScanner(checker.common_patterns, checker.keyboard_patterns, ('acme', ''))
+    rng = random.Random(1)
+    alphabet = 'abcxyzABCXYZ0189!@ -\n\tacmeqwerty\u0130\u03a3\u03c3\u212a\u0663\u0664\u0665\u00e9\U0001f600'
+    for _ in range(20000):
+        password = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 24)))
+        assert scanner.scan(password) == scanner._scan_walk(password), password
+    print("✓ Whole-string scan matches the character walk")
+
+def test_result_cache():
+    cold = PasswordChecker()
+    cached = PasswordChecker(cache_size=2)
+    
+    # Cached results equal cold ones, including the guesses estimator
+    for password in ["password", "password", "Tr0pic@l-Storm!2024"]:
+        assert cached.check_strength(password) == cold.check_strength(password)
+    assert cached.check_strength("P@ss", estimator='guesses') == cold.check_strength("P@ss", estimator='guesses')
+    assert cached.result_cache.stats()['hits'] == 1
+    print("✓ Cached results match cold results")
+    
+    # Mutating a returned result doesn't leak into the cache
+    cached.check_strength("abc")['feedback'].clear()
+    assert cached.check_strength("abc")['feedback'] == cold.check_strength("abc")['feedback']
+    print("✓ Cached results are copies")
+    
+    # Keys never contain the plaintext and the size bound holds
+    assert all(b"abc" not in key for key in cached.result_cache._entries)
+    assert len(cached.result_cache) <= 2
+    print("✓ Cache is bounded and keyed by HMAC")
+    
+    # Values don't hold the plaintext either, even the guesses match sequence
+    password = 'Xk9#mQ2vLp'
+    cached.check_strength(password, estimator='guesses')
+    assert cached.check_strength(password, estimator='guesses') == cold.check_strength(password, estimator='guesses')
+    assert all(password not in repr(entry) for entry in cached.result_cache._entries.values())
+    assert all('Xk9' not in repr(entry) for entry in cached.result_cache._entries.values())
+    print("✓ Cached results don't contain the password")
+
+def test_incremental_analyzer():
+    checker = PasswordChecker()
+    analyzer = checker.analyzer()
+    rng = random.Random(7)
+    alphabet = "abcxyzqwertyASDF0123456789!@#pass \nÄß"
+    
+    # Typing, backspacing and pasting over the text all match a cold check
+    password = ""
+    for _ in range(2000):
+        action = rng.random()
+        if action < 0.6:
+            password += rng.choice(alphabet)
+        elif action < 0.85:
+            password = password[:-rng.randint(1, 3)]
+        else:
+            cut = rng.randint(0, len(password))
+            password = password[:cut] + "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 5)))
+        assert analyzer.update(password) == checker.check_strength(password)
+    print("✓ Incremental analyzer matches check_strength across edits")
+    
+    analyzer = checker.analyzer()
+    analyzer.append("qwerty")
+    assert analyzer.delete(2) == checker.check_strength("qwer")
+    assert analyzer.delete(10) == checker.check_strength("")
+    print("✓ Append and delete update the scan state")
+    
+    # State is kept for at most MAX_INCREMENTAL_LENGTH characters
+    analyzer.update("x" * MAX_INCREMENTAL_LENGTH)
+    try:
+        analyzer.append("y")
+        assert False, 'text past the limit should be rejected'
+    except ValueError as e:
+        assert 'too long' in str(e)
+    assert analyzer.password == "x" * MAX_INCREMENTAL_LENGTH
+    assert analyzer.delete(1) == checker.check_strength("x" * (MAX_INCREMENTAL_LENGTH - 1))
+    print("✓ Incremental text length is capped")
+
 if __name__ == '__main__':
-    test_password_strength()
\ No newline at end of file
+    test_password_strength()
+    test_check_strength_batch()
+    test_scanner_matches_detectors()
+    test_result_cache()
+    test_incremental_analyzer()
\ No newline at end of file
@@ -0,0 +1,135 @@
+import sys
+sys.path.append('../backend')
+
+from collections import Counter
+
+import math
+import os
+import tempfile
+
+from passphrase_wordlist import PassphraseWordlist, write_packed
+from password_generator import PasswordGenerator
+from secure_random import SecureRandom
+
+
+def test_generate():
+    generator = PasswordGenerator()
+    
+    # Test 1: Single password keeps the original response shape
+    result = generator.generate(length=16)
+    assert result['success'] and len(result['password']) == 16
+    print("✓ Test 1 passed: Single password")
+    
+    # Test 2: Bulk generation keeps the per-class guarantee
+    result = generator.generate(length=4, exclude_ambiguous=True, count=2000)
+    assert len(result['passwords']) == 2000
+    for password in result['passwords']:
+        assert any(c.islower() for c in password)
+        assert any(c.isupper() for c in password)
+        assert any(c.isdigit() for c in password)
+        assert any(c in generator.special for c in password)
+        assert not set(password) & set('loIO01')
+    print("✓ Test 2 passed: Bulk generation with class guarantee")
+    
+    # Test 3: Invalid counts and lengths are rejected (before anything is drawn)
+    assert generator.generate(count=0)['success'] is False
+    assert generator.generate_passphrase(count=10**6)['success'] is False
+    for length in (3, 1025, '16', 16.0, True, None):
+        assert generator.generate(length=length)['success'] is False
+    assert generator.generate(length=1024)['success'] is True
+    result = generator.generate(length=20000, count=10000)
+    assert result == {'success': False, 'error': 'Password length must be between 4 and 1,024 characters'}
+    result = generator.generate(length=1000, count=1001)
+    assert result == {'success': False, 'error': 'length x count must be at most 1,000,000 characters'}
+    assert generator.generate_passphrase(word_count='4')['success'] is False
+    print("✓ Test 3 passed: Count and length validation")
+    
+    # Test 4: Bulk passphrases
+    result = generator.generate_passphrase(word_count=3, count=50)
+    assert len(result['passphrases']) == 50
+    assert all(len(p.split('-')) == 4 for p in result['passphrases'])
+    print("✓ Test 4 passed: Bulk passphrases")
+
+
+def test_secure_random_is_unbiased():
+    rng = SecureRandom()
+    
+    # 26 doesn't divide 256, so naive modulo would favour a-d
+    counts = Counter(rng.choice_string('abcdefghijklmnopqrstuvwxyz', 260000))
+    assert set(counts) == set('abcdefghijklmnopqrstuvwxyz')
+    assert max(counts.values()) < 10600 and min(counts.values()) > 9400
+    
+    assert sorted(rng.sample(range(10), 10)) == list(range(10))
+    assert all(0 <= rng.randbelow(7) < 7 for _ in range(1000))
+    print("✓ Buffered sampling is uniform")
+
+
+def test_forked_children_get_fresh_bytes():
+    if not hasattr(os, 'fork'):
+        print("- os.fork unavailable; skipped the fork check")
+        return
+    
+    generator = PasswordGenerator()
+    generator.generate(length=16)  # fill the shared buffer before forking
+    
+    outputs = []
+    for _ in range(2):
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_end)
+            os.write(write_end, generator.generate(length=32)['password'].encode())
+            os._exit(0)
+        os.close(write_end)
+        with os.fdopen(read_end, 'rb') as output:
+            outputs.append(output.read().decode())
+        os.waitpid(pid, 0)
+    outputs.append(generator.generate(length=32)['password'])
+    
+    assert len(set(outputs)) == 3, outputs
+    print("✓ Forked children don't repeat their parent's random bytes")
+
+
+def test_passphrase_wordlists():
+    words = [f'word{i:04d}' for i in range(7776)]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, 'eff.txt')
+        with open(text_path, 'w', encoding='utf-8') as text_file:
+            text_file.writelines(f'{i}\t{word}\n' for i, word in enumerate(words))
+        packed_path = os.path.join(directory, 'eff.packed')
+        write_packed(words, packed_path)
+        
+        # Test 1: Text (EFF format) and packed files load the same list
+        text_list = PassphraseWordlist.from_file(text_path)
+        packed_list = PassphraseWordlist.from_file(packed_path)
+        assert len(text_list) == len(packed_list) == 7776
+        assert text_list[1234] == packed_list[1234] == 'word1234'
+        print("✓ Test 1 passed: Text and packed wordlists")
+        
+        # Test 2: Named lists are used for generation and report entropy
+        generator = PasswordGenerator(wordlists={'eff': packed_path})
+        result = generator.generate_passphrase(word_count=6, add_number=False, capitalize=False, wordlist='eff')
+        assert all(word in words for word in result['passphrase'].split('-'))
+        assert len(set(result['passphrase'].split('-'))) == 6
+        expected = sum(math.log2(7776 - i) for i in range(6))
+        assert result['entropy'] == round(expected, 2)
+        print("✓ Test 2 passed: Passphrase from a large list")
+        
+        # Large lists still cap the words per passphrase
+        assert generator.generate_passphrase(word_count=20, wordlist='eff')['success'] is True
+        result = generator.generate_passphrase(word_count=21, count=10000, wordlist='eff')
+        assert result == {'success': False, 'error': 'word_count must be between 1 and 20 for this wordlist'}
+    
+    # Test 3: Unknown list and oversized word counts are errors
+    generator = PasswordGenerator()
+    assert generator.generate_passphrase(wordlist='missing')['success'] is False
+    assert generator.generate_passphrase(word_count=43)['success'] is False
+    print("✓ Test 3 passed: Wordlist validation")
+
+
+if __name__ == '__main__':
+    test_generate()
+    test_secure_random_is_unbiased()
+    test_forked_children_get_fresh_bytes()
+    test_passphrase_wordlists()
@@ -0,0 +1,119 @@
+import sys
+sys.path.append('../backend')
+
+import json
+import os
+import tempfile
+
+from password_checker import PasswordChecker
+from policy import PasswordPolicy, PolicyError, load_policies
+
+POLICIES = {
+    'acme': {
+        'min_length': 10,
+        'required_classes': ['upper', 'digit'],
+        'banned_words': ['acme', 'rocket'],
+        'rules': [{'pattern': r'(?i)19\d\d|20\d\d', 'message': 'Contains a year', 'penalty': 1, 'reject': True}]
+    },
+    'nist': {'mode': 'nist', 'min_length': 15, 'max_length': 64, 'banned_words': ['acme']},
+    'lenient': {'penalties': {'common': 0, 'pattern': 0}}
+}
+
+
+def test_default_matches_builtin_scoring():
+    checker = PasswordChecker(policies={'default': {}})
+    for password in ['password', 'Tr0ub4dor&3', 'qwerty123', 'aaaBBB111!!!', 'x']:
+        result = checker.check_strength(password, policy='default')
+        assert result.pop('policy') == 'default'
+        result.pop('compliant')
+        result.pop('violations')
+        assert result == checker.check_strength(password)
+    print("✓ A default policy scores exactly like the built-in rules")
+
+
+def test_policy_rules_and_compliance():
+    checker = PasswordChecker(policies=POLICIES)
+
+    result = checker.check_strength('Acmecorp2024!', policy='acme')
+    assert result['compliant'] is False
+    assert 'Must not contain banned words' in result['violations']
+    assert 'Contains a year' in result['violations']
+    assert result['score'] < checker.check_strength('Acmecorp2024!')['score']
+
+    result = checker.check_strength('lowercaseonly', policy='acme')
+    assert 'Must contain uppercase letters (A-Z)' in result['violations']
+    assert 'Must contain numbers (0-9)' in result['violations']
+
+    assert checker.check_strength('Purple-Tiger-Orbit-7', policy='acme')['compliant'] is True
+    print("✓ Banned words, required classes and custom rules are enforced")
+
+    # NIST mode: length and blocklist matter, composition doesn't
+    assert checker.check_strength('correct horse battery staple', policy='nist')['compliant'] is True
+    assert checker.check_strength('Sh0rt!pass', policy='nist')['violations'] == ['Must be at least 15 characters']
+    assert checker.check_strength('password', policy='nist')['compliant'] is False
+    assert checker.check_strength('x' * 65, policy='nist')['compliant'] is False
+    print("✓ NIST mode checks length and blocklists, not composition")
+
+    assert checker.check_strength('password123', policy='lenient')['score'] > checker.check_strength('password123')['score']
+    print("✓ Penalties can be overridden per policy")
+
+    # Backreferences keep pointing at their own rule's groups
+    checker = PasswordChecker(policies={'pairs': {'rules': [
+        {'pattern': r'(x)\1', 'message': 'Doubled x', 'reject': True},
+        {'pattern': r'(\d)\1', 'message': 'Doubled digit', 'reject': True},
+        {'pattern': r'(?i)zz', 'message': 'Contains zz'}
+    ]}})
+    result = checker.check_strength('Abcdefgh!77', policy='pairs')
+    assert result['violations'] == ['Doubled digit'] and result['compliant'] is False
+    assert checker.check_strength('Abcdefgh!78zz', policy='pairs')['violations'] == []
+    print("✓ Rules with backreferences match on their own groups")
+
+
+def test_policies_are_compiled_once_and_validated():
+    checker = PasswordChecker(policies=POLICIES)
+    assert checker.policies.get('acme') is checker.policies.get('acme')
+    # Policies with the same token lists share one scanner
+    assert checker.policies.get('lenient').scanner is checker._scanner
+
+    try:
+        checker.check_strength('password', policy='missing')
+        assert False, 'unknown policy should fail'
+    except ValueError as e:
+        assert 'Unknown policy' in str(e)
+    
+    bad_configs = (
+        {'required_classes': ['emoji']}, {'min_length': 20, 'good_length': 12}, {'minimum': 8},
+        {'min_length': '8'}, {'banned_words': 'acme'}, {'required_classes': 'upper'},
+        {'penalties': {'common': '2'}}, {'rules': ['(?i)acme']}, {'rules': [{'pattern': 'x', 'penalty': '2'}]},
+        {'rules': [{'pattern': '('}]}, {'rules': [{'message': 'no pattern'}]}, {'rules': [{'pattern': 'x', 'weight': 1}]}
+    )
+    for config in bad_configs:
+        try:
+            PasswordPolicy.from_dict('bad', config)
+            assert False, f'{config} should fail'
+        except PolicyError as e:
+            assert "Invalid policy 'bad'" in str(e)
+    print("✓ Policies are cached by ID and validated")
+
+    # Bad policies fail when loaded, not on every check that names them
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'policies.json')
+        with open(path, 'w', encoding='utf-8') as output:
+            json.dump({'ok': {'min_length': 10}, 'bad': {'rules': [{'pattern': 'x', 'penalty': '2'}]}}, output)
+        try:
+            load_policies(path)
+            assert False, 'a bad policy file should fail to load'
+        except PolicyError as e:
+            assert "Invalid policy 'bad'" in str(e)
+    try:
+        PasswordChecker(policies={'missing-file': {'banned_words_file': '/nonexistent/banned.txt'}})
+        assert False, 'an unreadable banned-words file should fail at registration'
+    except PolicyError as e:
+        assert 'missing-file' in str(e)
+    print("✓ Policy files are validated and compiled when loaded")
+
+
+if __name__ == '__main__':
+    test_default_matches_builtin_scoring()
+    test_policy_rules_and_compliance()
+    test_policies_are_compiled_once_and_validated()
@@ -0,0 +1,104 @@
+import sys
+sys.path.append('../backend')
+
+import hashlib
+import os
+import tempfile
+import time
+
+from breach_checker import BreachChecker
+from range_cache import RangeCache, parse_range
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    status_code = 200
+    
+    def __init__(self, text):
+        self.text = text
+
+
+def test_range_cache():
+    clock = FakeClock()
+    cache = RangeCache(max_entries=2, ttl=60, clock=clock)
+    
+    # Test 1: Miss then hit
+    assert cache.get('AAAAA') is None
+    cache.put('AAAAA', {'SUFFIX': 3})
+    assert cache.get('AAAAA') == {'SUFFIX': 3}
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+    print("✓ Test 1 passed: Miss then hit")
+    
+    # Test 2: LRU eviction
+    cache.put('BBBBB', {})
+    cache.get('AAAAA')
+    cache.put('CCCCC', {})
+    assert cache.get('BBBBB') is None
+    assert cache.get('AAAAA') is not None
+    assert cache.stats()['evictions'] == 1
+    print("✓ Test 2 passed: LRU eviction")
+    
+    # Test 3: TTL expiry
+    clock.now += 61
+    assert cache.get('AAAAA') is None
+    print("✓ Test 3 passed: TTL expiry")
+    
+    # Test 4: Disk tier survives a cold memory tier
+    with tempfile.TemporaryDirectory() as directory:
+        RangeCache(cache_dir=directory).put('DDDDD', {'ABC': 7})
+        cold = RangeCache(cache_dir=directory)
+        assert cold.get('DDDDD') == {'ABC': 7}
+        assert cold.stats()['disk_hits'] == 1
+        
+        # Expired files are deleted on read
+        path = os.path.join(directory, 'DDDDD.txt')
+        os.utime(path, (time.time() - 90000, time.time() - 90000))
+        assert RangeCache(cache_dir=directory).get('DDDDD') is None and not os.path.exists(path)
+    print("✓ Test 4 passed: Disk tier")
+    
+    # Test 4b: The disk tier is bounded, keeping the newest entries
+    with tempfile.TemporaryDirectory() as directory:
+        bounded = RangeCache(max_entries=1, cache_dir=directory, max_disk_entries=10)
+        prefixes = [f'{i:05X}' for i in range(25)]
+        for prefix in prefixes:
+            bounded.put(prefix, {'ABC': 1})
+        on_disk = sorted(name[:-4] for name in os.listdir(directory))
+        assert len(on_disk) <= 10 and on_disk == prefixes[-len(on_disk):]
+        assert bounded.stats()['disk_evictions'] == 25 - len(on_disk)
+        assert RangeCache(cache_dir=directory).get(prefixes[-1]) == {'ABC': 1}
+    print("✓ Test 4b passed: Disk tier eviction")
+    
+    # Test 5: Response parsing skips malformed lines
+    assert parse_range('ABC:1\r\nDEF:0\r\nbad\r\n') == {'ABC': 1, 'DEF': 0}
+    print("✓ Test 5 passed: Range parsing")
+
+
+def test_check_breach_uses_cache():
+    sha1_hash = hashlib.sha1(b'password').hexdigest().upper()
+    calls = []
+    
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        return FakeResponse(f'{sha1_hash[5:]}:9545824\r\n0000000000000000000000000000000000A:2\r\n')
+    
+    checker = BreachChecker()
+    checker.session.get = fake_get
+    first = checker.check_breach('password')
+    second = checker.check_breach('password')
+    
+    assert first == second
+    assert first['count'] == 9545824
+    assert len(calls) == 1
+    print("✓ Repeat prefix lookups skip the network")
+
+
+if __name__ == '__main__':
+    test_range_cache()
+    test_check_breach_uses_cache()
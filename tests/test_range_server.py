@@ -0,0 +1,61 @@
+import sys
+sys.path.append('../backend')
+
+import urllib.error
+import urllib.request
+
+from breach_checker import BreachChecker
+from range_cache import parse_range
+from range_server import RangeServer, dataset_from_passwords, synthetic_dataset
+
+
+def fetch(url):
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, response.read().decode('ascii')
+    except urllib.error.HTTPError as e:
+        return e.code, ''
+
+
+def test_breach_checker_against_local_server():
+    with RangeServer(dataset_from_passwords(['password', 'hunter2'])) as server:
+        checker = BreachChecker(cache_size=0, api_url=server.url)
+        assert checker.check_breach('password')['breached'] is True
+        assert checker.check_breach('hunter2')['count'] > 0
+        assert checker.check_breach('not-in-the-dataset')['breached'] is False
+        assert server.requests == 3
+    print("✓ BreachChecker queries a configurable range API")
+
+
+def test_injected_errors_and_padding():
+    with RangeServer(synthetic_dataset(0), error_rate=1, error_status=429) as server:
+        result = BreachChecker(cache_size=0, api_url=server.url).check_breach('password')
+        assert result == {'checked': False, 'error': 'API Error: 429'}
+        assert server.errors == 1
+
+    with RangeServer(dataset_from_passwords(['password']), padding=True, seed=1) as server:
+        status, body = fetch(server.url + '5BAA6')
+        suffixes = parse_range(body)
+        assert status == 200 and 800 <= len(suffixes) <= 1000
+        assert suffixes['1E4C9B93F3F0682250B6CF8331B7EE68FD8'] > 0
+        assert sum(1 for count in suffixes.values() if count) == 1
+
+        assert fetch(server.url + 'XYZ12')[0] == 404
+        assert fetch(server.url.replace('/range/', '/other/') + '5BAA6')[0] == 404
+    print("✓ Error responses and padding can be injected")
+
+
+def test_synthetic_dataset_is_seeded():
+    dataset = synthetic_dataset(100, seed=7)
+    records = dataset('ABCDE')
+    assert records == dataset('ABCDE') == synthetic_dataset(100, seed=7)('ABCDE')
+    assert records != synthetic_dataset(100, seed=8)('ABCDE')
+    assert 75 <= len(records) <= 125
+    assert all(len(suffix) == 35 for suffix, _ in records)
+    print("✓ Synthetic ranges are reproducible from the seed")
+
+
+if __name__ == '__main__':
+    test_breach_checker_against_local_server()
+    test_injected_errors_and_padding()
+    test_synthetic_dataset_is_seeded()
@@ -0,0 +1,184 @@
+import sys
+sys.path.append('../backend')
+
+import asyncio
+import os
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import Histogram, Registry
+from rate_limit import (
+    AdmissionController, LatencyWindow, Limit, RateLimiter, SharedTokenBuckets, TokenBuckets,
+    client_address, parse_limit
+)
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_buckets_refill_and_share_across_instances():
+    assert parse_limit('10') == Limit(10.0, 10.0)
+    assert parse_limit('0.5:20') == Limit(0.5, 20.0)
+    assert parse_limit('0') is None and parse_limit(None) is None
+    try:
+        parse_limit('5:0')
+        assert False, 'burst below 1 should be rejected'
+    except ValueError:
+        pass
+
+    limit = Limit(rate=2, burst=3)
+    with tempfile.TemporaryDirectory() as directory:
+        clock = FakeClock()
+        path = os.path.join(directory, 'buckets')
+        shared = SharedTokenBuckets(path, slots=64, clock=clock)
+        for buckets in (TokenBuckets(clock=clock), shared):
+            assert [buckets.take('a', limit) for _ in range(3)] == [0.0, 0.0, 0.0]
+            assert buckets.take('a', limit) == 0.5
+            assert buckets.take('b', limit) == 0.0  # other keys have their own bucket
+            clock.now += 0.5
+            assert buckets.take('a', limit) == 0.0
+            assert buckets.take('a', limit) == 0.5
+            buckets.refund('a', limit)
+            assert buckets.take('a', limit) == 0.0
+
+        # A second mapping of the same file sees the same buckets
+        other = SharedTokenBuckets(path, slots=64, clock=clock)
+        assert other.take('a', limit) == 0.5
+        clock.now -= 100  # clock went backwards: start over with a full bucket
+        assert other.take('a', limit) == 0.0
+        other.close()
+        shared.close()
+    print("✓ Token buckets refill at their rate and report how long to wait")
+
+
+def test_shared_buckets_hold_across_processes():
+    script = (
+        'import sys\n'
+        f'sys.path.insert(0, {BACKEND!r})\n'
+        'from rate_limit import Limit, SharedTokenBuckets\n'
+        'buckets = SharedTokenBuckets(sys.argv[1], slots=64)\n'
+        'print(sum(buckets.take("total", Limit(0.001, 100)) == 0.0 for _ in range(60)))\n'
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'buckets')
+        processes = [subprocess.Popen([sys.executable, '-c', script, path], stdout=subprocess.PIPE, text=True)
+                     for _ in range(4)]
+        admitted = [int(process.communicate()[0]) for process in processes]
+    # 4 processes asked for 240 tokens between them; exactly the burst was granted
+    assert sum(admitted) == 100, admitted
+    print("✓ Shared buckets enforce one limit across worker processes")
+
+
+def test_admission_controller_sheds_load():
+    clock = FakeClock()
+    limiter = RateLimiter(TokenBuckets(clock=clock), per_client=Limit(1, 2), total=Limit(1, 3),
+                          upstream=Limit(1, 1))
+    admission = AdmissionController(limiter)
+    assert admission.admit('10.0.0.1') is None
+    assert admission.admit('10.0.0.1', upstream=True) is None
+    assert admission.admit('10.0.0.1').reason == 'client'
+    # Client 2 only gets the last global token; its own stays unspent
+    assert admission.admit('10.0.0.2', upstream=True).reason == 'upstream'
+    assert admission.admit('10.0.0.2') is None
+    assert admission.admit('10.0.0.3').reason == 'total'
+    assert admission.in_flight == 3
+
+    admission = AdmissionController(max_in_flight=2)
+    assert admission.admit('a') is None and admission.admit('a') is None
+    assert admission.admit('a') == ('in_flight', 1.0)
+    admission.release()
+    assert admission.admit('a') is None
+    # WebSocket upgrades are only rate limited; an open socket isn't in flight
+    assert admission.admit('a', count_in_flight=False) is None
+    assert admission.in_flight == 2
+
+    # Concurrent admits never take more than max_in_flight slots
+    admission = AdmissionController(max_in_flight=5)
+    barrier = threading.Barrier(40)
+
+    def admit():
+        barrier.wait()
+        return admission.admit('a')
+
+    with ThreadPoolExecutor(max_workers=40) as pool:
+        rejections = list(pool.map(lambda _: admit(), range(40)))
+    assert rejections.count(None) == 5 and admission.in_flight == 5
+
+    # Upstream routes are shed while the last window's mean latency is over the limit
+    histogram = Histogram('upstream_seconds', 'Upstream latency', ['status'], registry=Registry())
+    window = LatencyWindow(histogram, window=5, min_samples=3, clock=clock)
+    admission = AdmissionController(upstream_latency=0.5, latency_window=window)
+    for _ in range(3):
+        histogram.observe(2.0, '200')
+    assert admission.admit('a', upstream=True) is None  # first window still open
+    clock.now += 5
+    rejection = admission.admit('a', upstream=True)
+    assert rejection.reason == 'upstream_latency' and rejection.retry_after == 5
+    assert admission.admit('a') is None
+    clock.now += 5  # a window without enough samples lets traffic probe again
+    assert admission.admit('a', upstream=True) is None
+
+    assert client_address('10.0.0.9', '1.2.3.4, 192.168.1.1', trusted_proxies=1) == '192.168.1.1'
+    assert client_address('10.0.0.9', '1.2.3.4, 192.168.1.1', trusted_proxies=2) == '1.2.3.4'
+    assert client_address('10.0.0.9', '1.2.3.4') == '10.0.0.9'
+    print("✓ Admission control sheds on in-flight requests, upstream latency and rate limits")
+
+
+def test_apps_answer_429_with_retry_after():
+    import app
+    from asgi import PasswordAPI
+
+    previous = app.admission
+    app.admission = AdmissionController(RateLimiter(TokenBuckets(), per_client=Limit(0.01, 1)))
+    try:
+        # Spend the test client's token here, so no checker gets built
+        assert app.admission.admit('127.0.0.1') is None
+        app.admission.release()
+        client = app.app.test_client()
+        response = client.post('/api/check-strength', json={'password': 'abc'})
+        assert response.status_code == 429 and int(response.headers['Retry-After']) >= 99
+        assert response.get_json()['success'] is False
+        assert client.get('/metrics').status_code == 200  # only /api/ routes are limited
+        assert app.admission.in_flight == 0
+    finally:
+        app.admission = previous
+
+    async def run():
+        api = PasswordAPI(admission=AdmissionController(RateLimiter(TokenBuckets(), per_client=Limit(0.01, 1))))
+        sent = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'{"password": "abc"}', 'more_body': False}
+
+        async def send(message):
+            sent.append(message)
+
+        try:
+            for _ in range(2):
+                await api({'type': 'http', 'method': 'POST', 'path': '/api/check-strength',
+                           'client': ('10.0.0.1', 5000), 'headers': []}, receive, send)
+        finally:
+            await api.close()
+        return sent, api.admission.in_flight
+
+    sent, in_flight = asyncio.run(run())
+    assert [message['status'] for message in sent if message['type'] == 'http.response.start'] == [200, 429]
+    assert (b'retry-after', b'100') in sent[2]['headers']
+    assert in_flight == 0
+    print("✓ Flask and ASGI apps answer 429 with Retry-After")
+
+
+if __name__ == '__main__':
+    test_token_buckets_refill_and_share_across_instances()
+    test_shared_buckets_hold_across_processes()
+    test_admission_controller_sheds_load()
+    test_apps_answer_429_with_retry_after()
@@ -0,0 +1,57 @@
+import sys
+sys.path.append('../backend')
+
+import os
+import subprocess
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+
+
+def loaded_modules(code):
+    """Names of the given modules that are imported after running code in a fresh interpreter"""
+    script = code + "\nimport sys; print(' '.join(sorted(m for m in WATCHED if m in sys.modules)))"
+    watched = "WATCHED = ('requests', 'aiohttp', 'asyncio', 'flask', 'guess_estimator', 'wordlist_index', 'breach_index')\n"
+    output = subprocess.run([sys.executable, '-c', watched + script], capture_output=True, text=True,
+                            cwd=BACKEND_DIR, check=True).stdout
+    return set(output.split())
+
+
+def test_library_path_skips_heavy_imports():
+    loaded = loaded_modules("from password_checker import PasswordChecker; PasswordChecker().check_strength('Tr0ub4dor&3')")
+    assert not loaded, loaded
+    print("✓ check_strength loads no HTTP client, framework or index modules")
+
+    loaded = loaded_modules("from password_checker import PasswordChecker; PasswordChecker().check_strength('x', estimator='guesses')")
+    assert loaded == {'guess_estimator'}, loaded
+
+    loaded = loaded_modules("from breach_checker import BreachChecker; BreachChecker()")
+    assert 'requests' not in loaded, loaded
+    print("✓ Estimators and the HTTP client load on first use")
+
+
+def test_package_exports_load_on_access():
+    code = "sys.path.insert(0, '..'); import backend; assert 'PasswordChecker' in dir(backend); backend.PasswordChecker"
+    assert not loaded_modules('import sys; ' + code)
+    assert 'requests' in loaded_modules('import sys; ' + code + "; backend.BreachChecker().session")
+    print("✓ The backend package imports its modules lazily")
+
+
+def test_server_builds_components_on_first_request():
+    loaded = loaded_modules("import app")
+    assert 'flask' in loaded and 'requests' not in loaded, loaded
+
+    import app
+    assert not app.password_checker.loaded
+    client = app.app.test_client()
+    assert client.get('/metrics').status_code == 200
+    assert not app.password_checker.loaded
+    response = client.post('/api/check-strength', json={'password': 'Tr0ub4dor&3'})
+    assert response.status_code == 200
+    assert app.password_checker.loaded and not app.breach_checker.loaded
+    print("✓ The server builds checkers on the first request that needs them")
+
+
+if __name__ == '__main__':
+    test_library_path_skips_heavy_imports()
+    test_package_exports_load_on_access()
+    test_server_builds_components_on_first_request()
@@ -0,0 +1,131 @@
+import sys
+sys.path.append('../backend')
+
+import gzip
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from compression import compress_body, negotiate
+from static_assets import IMMUTABLE, REVALIDATE, StaticAssets, build_assets
+
+FRONTEND = Path(__file__).resolve().parents[1] / 'frontend'
+
+
+def test_accept_encoding_negotiation():
+    assert negotiate('gzip, deflate, br', ('br', 'gzip')) == 'br'
+    assert negotiate('gzip;q=1.0, br;q=0.5', ('br', 'gzip')) == 'gzip'
+    assert negotiate('br;q=0, *', ('br', 'gzip')) == 'gzip'
+    assert negotiate('identity', ('br', 'gzip')) is None
+    assert negotiate('', ('gzip',)) is None
+
+    small, coding = compress_body(b'{"ok": true}', 'gzip')
+    assert coding is None and small == b'{"ok": true}'
+    body = b'{"data": [' + b'{"score": 3, "strength": "Medium"},' * 200 + b'{}]}'
+    compressed, coding = compress_body(body, 'gzip')
+    assert coding == 'gzip' and gzip.decompress(compressed) == body and len(compressed) < len(body) // 10
+    print("✓ Compression is negotiated from Accept-Encoding above a size threshold")
+
+
+def test_build_fingerprints_and_precompresses():
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'dist')
+        manifest = build_assets(FRONTEND, output)
+        built_css = manifest['files']['css/style.css']
+        assert built_css.startswith('css/style.') and built_css != 'css/style.css'
+        assert manifest['files']['index.html'] == 'index.html'
+
+        index = (Path(output) / 'index.html').read_text(encoding='utf-8')
+        assert f'href="{built_css}"' in index and 'href="css/style.css"' not in index
+        assert f'src="{manifest["files"]["js/script.js"]}"' in index
+        assert gzip.decompress((Path(output) / (built_css + '.gz')).read_bytes()) == (Path(output) / built_css).read_bytes()
+
+        # Rebuilding is deterministic, and never replaces a directory that isn't a build
+        assert build_assets(FRONTEND, output) == manifest
+        try:
+            build_assets(FRONTEND, directory)
+            assert False, 'non-build directory should not be replaced'
+        except ValueError:
+            pass
+        print("✓ Assets are fingerprinted and precompressed at build time")
+
+        assets = StaticAssets(output)
+        response = assets.respond('/' + built_css, 'gzip, deflate')
+        assert response.status == 200 and response.headers['Content-Encoding'] == 'gzip'
+        assert response.headers['Cache-Control'] == IMMUTABLE and response.headers['Vary'] == 'Accept-Encoding'
+        assert response.headers['Content-Type'] == 'text/css; charset=utf-8'
+
+        response = assets.respond('index.html', '')
+        assert 'Content-Encoding' not in response.headers and response.headers['Cache-Control'] == REVALIDATE
+        etag = response.headers['ETag']
+        assert etag.startswith('W/"')  # shared by every coding of the file
+        assert assets.respond('index.html', 'gzip', etag).status == 304
+        assert assets.respond('index.html', 'gzip', etag[2:]).status == 304
+        assert assets.respond('index.html', 'gzip', 'W/"other"').status == 200
+        assert assets.respond('css/style.css').headers['Cache-Control'] == REVALIDATE
+        assert assets.respond('missing.js') is None
+        print("✓ Built assets are served with immutable caching and ETags")
+
+    # Parent-relative and root-relative references are fingerprinted too
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / 'site'
+        (source / 'css').mkdir(parents=True)
+        (source / 'img').mkdir()
+        (source / 'js').mkdir()
+        (source / 'img' / 'x.png').write_bytes(b'\x89PNG')
+        (source / 'js' / 'a.js').write_text('console.log(1);', encoding='utf-8')
+        (source / 'css' / 'style.css').write_text(
+            'a { background: url("../img/x.png"); } b { background: url(/img/x.png); }', encoding='utf-8')
+        (source / 'index.html').write_text(
+            '<link href="./css/style.css"><script src="/js/a.js"></script><script src="//cdn/js/a.js"></script>',
+            encoding='utf-8')
+        output = Path(directory) / 'dist'
+        files = build_assets(source, output)['files']
+
+        css = (output / files['css/style.css']).read_text(encoding='utf-8')
+        assert f'url("../{files["img/x.png"]}")' in css and f'url(/{files["img/x.png"]})' in css
+        index = (output / 'index.html').read_text(encoding='utf-8')
+        assert f'href="{files["css/style.css"]}"' in index and f'src="/{files["js/a.js"]}"' in index
+        assert 'src="//cdn/js/a.js"' in index
+    print("✓ Relative, parent and root references are rewritten")
+
+
+def test_flask_compresses_large_json():
+    import app
+    client = app.app.test_client()
+
+    response = client.post('/api/check-strength/batch', json={'passwords': ['abc123'] * 100},
+                           headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert b'"count":100' in gzip.decompress(response.data)
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+    response = client.post('/api/check-strength', json={'password': 'abc123'}, headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    response = client.post('/api/check-strength/batch', json={'passwords': ['abc123'] * 100})
+    assert 'Content-Encoding' not in response.headers
+    print("✓ Large JSON responses are compressed for clients that accept it")
+
+
+def test_flask_streams_ndjson_with_error_rows():
+    import app
+    client = app.app.test_client()
+
+    body = b'password\n\xff\xfe\r\n\nTr0ub4dor&3\r\n'
+    response = client.post('/api/check-strength/batch', data=body, content_type='text/plain',
+                           headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200 and 'Content-Encoding' not in response.headers
+    rows = [json.loads(line) for line in response.get_data().splitlines()]
+    assert rows[0] == app.password_checker.check_strength('password')
+    assert rows[1]['success'] is False and 'utf-8' in rows[1]['error']
+    assert rows[2] == app.password_checker.check_strength('Tr0ub4dor&3')
+    assert len(rows) == 3
+    print("✓ Streamed NDJSON answers bad lines with error rows, uncompressed")
+
+
+if __name__ == '__main__':
+    test_accept_encoding_negotiation()
+    test_build_fingerprints_and_precompresses()
+    test_flask_compresses_large_json()
+    test_flask_streams_ndjson_with_error_rows()
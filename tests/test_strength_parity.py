@@ -0,0 +1,74 @@
+import sys
+sys.path.append('../backend')
+
+import json
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+
+import strength_rules
+from password_checker import PasswordChecker
+
+FRONTEND_JS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend', 'js')
+
+# Scores a JSON list of passwords with the browser engine under Node
+NODE_SCRIPT = """
+const fs = require('fs');
+const path = require('path');
+const rules = require(path.join(process.argv[1], 'strength-rules.js'));
+const { createStrengthChecker } = require(path.join(process.argv[1], 'strength-engine.js'));
+const checkStrength = createStrengthChecker(rules);
+const passwords = JSON.parse(fs.readFileSync(process.argv[2], 'utf8'));
+process.stdout.write(JSON.stringify(passwords.map(checkStrength)));
+"""
+
+
+def parity_corpus():
+    """Passwords covering every rule, plus seeded random mixes (non-ASCII included)"""
+    corpus = [
+        '', 'x', 'password', 'PassWord', 'Tr0ub4dor&3', 'qwerty123', 'aaaBBB111!!!', 'correct horse battery staple',
+        'abc', 'CBA', 'xyz987', '13579', 'zaqwsx!', '1qaz2wsx', 'LetMeIn', 'a\n\n\nb', 'aaa', 'ab\nc',
+        'Ünïcödé-Pässwörd9', '٣٤٥abc', 'İstanbul2024!', 'ΣΑΣ', 'Kelvin', '😀😀😀', 'p😀ss',
+        'aA1!' * 50, 'a' * 200, 'G7#kL9$mN2@qR5', 'Summer2024', '7' * 11
+    ]
+    rng = random.Random(24)
+    alphabet = 'aAbBcCxyzXYZ0123789!@#-_ ~.qwertyasdfzxcvpassadminİΣσé٣😀\n'
+    for _ in range(3000):
+        corpus.append(''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 32))))
+    return corpus
+
+
+def test_generated_rules_are_current():
+    with open(os.path.join(FRONTEND_JS, 'strength-rules.js'), encoding='utf-8') as generated:
+        assert generated.read() == strength_rules.render_js(), 'run: python backend/strength_rules.py'
+    print("✓ frontend/js/strength-rules.js matches the Python rule table")
+
+
+def test_browser_engine_matches_python():
+    node = shutil.which('node')
+    if node is None:
+        print("- Node.js not installed; skipped the browser engine parity check")
+        return
+
+    corpus = parity_corpus()
+    with tempfile.TemporaryDirectory() as directory:
+        corpus_path = os.path.join(directory, 'corpus.json')
+        with open(corpus_path, 'w', encoding='utf-8') as output:
+            json.dump(corpus, output)
+        completed = subprocess.run([node, '-e', NODE_SCRIPT, FRONTEND_JS, corpus_path],
+                                   capture_output=True, text=True, encoding='utf-8', check=True)
+    browser_results = json.loads(completed.stdout)
+
+    checker = PasswordChecker()
+    assert len(browser_results) == len(corpus)
+    for password, browser_result in zip(corpus, browser_results):
+        expected = json.loads(json.dumps(checker.check_strength(password, estimator='entropy')))
+        assert browser_result == expected, (password, browser_result, expected)
+    print(f"✓ The browser engine scores {len(corpus)} passwords exactly like check_strength")
+
+
+if __name__ == '__main__':
+    test_generated_rules_are_current()
+    test_browser_engine_matches_python()
@@ -0,0 +1,61 @@
+import sys
+sys.path.append('../backend')
+
+import os
+import tempfile
+
+from password_checker import PasswordChecker
+from wordlist_index import WordlistIndex, build_wordlist, read_wordlist
+
+
+def test_wordlist_index():
+    lines = [b'123456\n', b'Password\n', b'\xff\xfe\n', b'iloveyou\n', b'password\n', b'hunter2\n']
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'common.idx')
+        
+        # Test 1: Build (lowercased, deduplicated, undecodable lines skipped)
+        total = build_wordlist(read_wordlist(lines), path)
+        assert total == 4
+        
+        # Sorted in runs of two words and merged: the same file
+        merged_path = os.path.join(directory, 'merged.idx')
+        assert build_wordlist(read_wordlist(lines), merged_path, run_size=2, temp_dir=directory) == 4
+        with open(path, 'rb') as built, open(merged_path, 'rb') as merged:
+            assert built.read() == merged.read()
+        assert sorted(os.listdir(directory)) == ['common.idx', 'merged.idx']
+        print("✓ Test 1 passed: Wordlist built")
+        
+        # Test 2: Ranks follow line order
+        with WordlistIndex(path) as wordlist:
+            assert wordlist.rank('123456') == 1
+            assert wordlist.rank('password') == 2
+            assert wordlist.rank('hunter2') == 6
+            assert 'iloveyou' in wordlist
+            assert wordlist.rank('Tr0pic@l-Storm!2024') is None
+            assert wordlist.has_prefix('hunt') and wordlist.has_prefix('iloveyou')
+            assert not wordlist.has_prefix('hunter2x') and not wordlist.has_prefix('zz')
+        print("✓ Test 2 passed: Rank lookups")
+        
+        # Test 3: PasswordChecker reports the matched rank
+        checker = PasswordChecker(wordlist=path)
+        result = checker.check_strength('HUNTER2')
+        assert result['common_rank'] == 6 and result['common_source'] == 'wordlist'
+        assert '❌ This is a commonly used password' in result['feedback']
+        assert checker.check_strength('Tr0pic@l-Storm!2024')['common_rank'] is None
+        
+        # A password only on the built-in list says its rank is from there
+        result = checker.check_strength('qwerty')
+        assert result['common_source'] == 'builtin'
+        assert result['common_rank'] == checker.common_passwords.index('qwerty') + 1
+        assert checker.check_strength_batch(['qwerty', 'hunter2']) == [result, checker.check_strength('hunter2')]
+        checker.wordlist.close()
+        print("✓ Test 3 passed: Checker uses the wordlist")
+    
+    # Test 4: Default checker output is unchanged
+    assert 'common_rank' not in PasswordChecker().check_strength('hunter2')
+    print("✓ Test 4 passed: Built-in list only by default")
+
+
+if __name__ == '__main__':
+    test_wordlist_index()